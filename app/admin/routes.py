@@ -7,6 +7,11 @@ from marshmallow import ValidationError
 import math
 from datetime import datetime
 import psutil
+from app.content.reciters import RECITERS_VERSION
+from app.content.search_backends import get_search_cache
+from app.settings.cache import get_settings_cache
+from app.utils.http import get_response_cache
+from app.utils.versioning import bump_version
 from . import admin_bp
 
 
@@ -174,6 +179,7 @@ def create_reciter():
         
         db.session.add(reciter)
         db.session.commit()
+        bump_version(RECITERS_VERSION)
         
         return {"message": "Reciter created successfully", "reciter": reciter.to_dict()}, 201
         
@@ -209,6 +215,7 @@ def update_reciter(reciter_id):
             reciter.is_active = data["is_active"]
         
         db.session.commit()
+        bump_version(RECITERS_VERSION)
         
         return {"message": "Reciter updated successfully", "reciter": reciter.to_dict()}, 200
         
@@ -285,6 +292,11 @@ def system_health():
                 "total": memory.total,
                 "available": memory.available,
                 "percent_used": memory.percent
+            },
+            "caches": {
+                "search": get_search_cache().stats(),
+                "responses": get_response_cache().stats(),
+                "user_settings": get_settings_cache().stats()
             }
         }, 200
         
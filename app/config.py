@@ -30,6 +30,23 @@ class BaseConfig:
     RATE_LIMIT_DEFAULT: str = "60 per minute"
     RATE_LIMIT_AUTH: str = "10 per minute"
     
+    # Search
+    SEARCH_BACKEND: str = "memory"  # memory or fulltext (FTS5 / tsvector by dialect)
+    SEARCH_FUZZY_THRESHOLD: float = 0.4  # Minimum trigram similarity for mode=fuzzy
+    SEARCH_CACHE_SIZE: int = 1024  # Cached result pages per worker (0 disables)
+    SEARCH_CACHE_TTL: int = 300  # 5 minutes
+    
+    # User settings
+    USER_SETTINGS_CACHE_SIZE: int = 4096  # Cached users per worker (0 disables)
+    USER_SETTINGS_CACHE_TTL: int = 600  # 10 minutes
+    USER_SETTINGS_STAMP_BUCKETS: int = 256  # Version stamps users are hashed into
+    
+    # Corpus
+    CORPUS_FILE: str = "quran.corpus"  # Binary corpus in the instance folder (scripts/build_corpus.py)
+    CONTENT_SNAPSHOT_FILE: str = "content_snapshot.db"  # Content tables snapshot in the instance folder (scripts/build_snapshot.py)
+    CONTENT_CACHE_MAX_AGE: int = 3600  # Cache-Control max-age of public content responses
+    RESPONSE_CACHE_SIZE: int = 512  # Precompressed content responses per worker (0 disables)
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
@@ -76,6 +93,11 @@ class ProductionConfig(BaseConfig):
     DATABASE_URL = os.environ.get("DATABASE_URL", BaseConfig.DATABASE_URL)
     SQLALCHEMY_DATABASE_URI = os.environ.get("SQLALCHEMY_DATABASE_URI", BaseConfig.SQLALCHEMY_DATABASE_URI)
     JWT_SECRET = os.environ.get("JWT_SECRET", BaseConfig.JWT_SECRET)
+    SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", BaseConfig.SEARCH_BACKEND)
+    SEARCH_CACHE_SIZE = int(os.environ.get("SEARCH_CACHE_SIZE", BaseConfig.SEARCH_CACHE_SIZE))
+    CONTENT_CACHE_MAX_AGE = int(os.environ.get("CONTENT_CACHE_MAX_AGE", BaseConfig.CONTENT_CACHE_MAX_AGE))
+    RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", BaseConfig.RESPONSE_CACHE_SIZE))
+    USER_SETTINGS_CACHE_SIZE = int(os.environ.get("USER_SETTINGS_CACHE_SIZE", BaseConfig.USER_SETTINGS_CACHE_SIZE))
     
     # Production CORS origins
     CORS_ORIGINS = os.environ.get("CORS_ORIGINS", "").split(",") if os.environ.get("CORS_ORIGINS") else BaseConfig.CORS_ORIGINS
@@ -0,0 +1,227 @@
+"""
+Read-only in-memory Quran corpus
+"""
+import os
+import threading
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from flask import current_app
+
+from app.extensions import db
+from app.models import AyahIndex
+from app.utils.json_stream import iter_records
+from app.utils.mushaf import TOTAL_AYAHS, hizb_of, juz_of, location_of, page_of, rub_of
+from app.utils.versioning import get_version
+from .corpus_file import CorpusFile, CorpusFormatError, TextView, write_corpus_file
+
+
+CORPUS_VERSION = "corpus"
+
+
+class QuranCorpus:
+    """Ayah text of the whole mushaf, indexed by (surah, ayah).
+
+    Ayahs are stored in mushaf order: their text in one tuple and their page
+    in an ``array('H')``. ``surah_starts[s - 1]`` is the position of the first
+    ayah of surah ``s``, so a lookup is two array reads. The object is never
+    mutated after construction; a new corpus replaces it when the corpus
+    version changes.
+
+    ``from_file`` builds the same object over a memory-mapped corpus file
+    (see ``corpus_file``), in which case the text and page tables are views
+    of the mapping and text is decoded on access.
+    """
+
+    __slots__ = ("version", "surah_starts", "texts", "pages")
+
+    def __init__(self, ayahs: Iterable[Tuple[int, int, str, int]], version: int = 0):
+        self.version = version
+
+        texts = []
+        self.pages = array("H")
+        counts = [0] * 114
+        for surah_id, ayah_no, text, page in sorted(ayahs):
+            if not 1 <= surah_id <= 114 or ayah_no != counts[surah_id - 1] + 1:
+                continue
+            counts[surah_id - 1] += 1
+            texts.append(text)
+            self.pages.append(page or 0)
+        self.texts = tuple(texts)
+
+        self.surah_starts = array("H", [0])
+        for count in counts:
+            self.surah_starts.append(self.surah_starts[-1] + count)
+
+    @classmethod
+    def from_file(cls, corpus_file: CorpusFile, version: int = 0) -> "QuranCorpus":
+        """Build a corpus over a memory-mapped corpus file."""
+        corpus = cls.__new__(cls)
+        corpus.version = version
+        corpus.texts = TextView(corpus_file)
+        corpus.pages = corpus_file.pages
+        corpus.surah_starts = corpus_file.surah_starts
+        return corpus
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def ordinal(self, surah_id: int, ayah_no: int) -> Optional[int]:
+        """Return the mushaf-order position of an ayah, or ``None`` if it does not exist."""
+        if not 1 <= surah_id <= 114:
+            return None
+        start = self.surah_starts[surah_id - 1]
+        if not 1 <= ayah_no <= self.surah_starts[surah_id] - start:
+            return None
+        return start + ayah_no - 1
+
+    def location(self, ordinal: int) -> Tuple[int, int]:
+        """Return the ``(surah_id, ayah_no)`` at a mushaf-order position."""
+        surah_id = bisect_right(self.surah_starts, ordinal)
+        return surah_id, ordinal - self.surah_starts[surah_id - 1] + 1
+
+    def ayah(self, surah_id: int, ayah_no: int) -> Optional[dict]:
+        """Return an ayah with its text and location, or ``None`` if it does not exist."""
+        ordinal = self.ordinal(surah_id, ayah_no)
+        if ordinal is None:
+            return None
+        return self._ayah_dict(ordinal, surah_id, ayah_no)
+
+    def iter_ayahs(self, start: int, end: int) -> Iterator[dict]:
+        """Yield the ayahs at positions ``start`` to ``end`` (inclusive) in mushaf order."""
+        surah_id, ayah_no = self.location(start)
+        for ordinal in range(start, end + 1):
+            while ordinal == self.surah_starts[surah_id]:
+                surah_id, ayah_no = surah_id + 1, 1
+            yield self._ayah_dict(ordinal, surah_id, ayah_no)
+            ayah_no += 1
+
+    def division_ayahs(self, ordinals: range) -> List[dict]:
+        """Return the ayahs of a mushaf division (see ``app.utils.mushaf``)."""
+        if len(self) == TOTAL_AYAHS:
+            # A complete corpus shares the mushaf tables' ordinals
+            return list(self.iter_ayahs(ordinals.start, ordinals.stop - 1))
+        ayahs = (self.ayah(*location_of(ordinal)) for ordinal in ordinals)
+        return [ayah for ayah in ayahs if ayah is not None]
+
+    def _ayah_dict(self, ordinal: int, surah_id: int, ayah_no: int) -> dict:
+        return {
+            "surah_id": surah_id,
+            "ayah_no": ayah_no,
+            "text_arabic": self.texts[ordinal],
+            "text_translation": None,
+            "page": self.pages[ordinal],
+            "juz": juz_of(surah_id, ayah_no),
+            "hizb": hizb_of(surah_id, ayah_no),
+            "rub": rub_of(surah_id, ayah_no),
+        }
+
+
+_corpus: Optional[QuranCorpus] = None
+_lock = threading.Lock()
+
+
+def _load_quran_json() -> Iterable[Tuple[int, int, str, int]]:
+    path = Path(current_app.root_path).parent / "quran.json"
+    return [
+        (verse["chapter"], verse["verse"], verse["text"], page_of(verse["chapter"], verse["verse"]))
+        for verse in iter_records(str(path))
+    ]
+
+
+def corpus_file_path() -> str:
+    """Return the path of the binary corpus file in the instance folder."""
+    return os.path.join(current_app.instance_path, current_app.config.get("CORPUS_FILE", "quran.corpus"))
+
+
+def _load_ayah_rows() -> List[Tuple[int, int, str, int]]:
+    return db.session.query(
+        AyahIndex.surah_id,
+        AyahIndex.ayah_no,
+        AyahIndex.text_plain,
+        AyahIndex.page,
+    ).all()
+
+
+def write_corpus(version: int, path: Optional[str] = None) -> int:
+    """Write the corpus file for corpus ``version`` from the ``ayah_index`` rows.
+
+    Returns the number of ayahs written.
+    """
+    return write_corpus_file(path or corpus_file_path(), _load_ayah_rows(), corpus_version=version)
+
+
+def refresh_corpus_file(version: int) -> bool:
+    """Rebuild the corpus file, if there is one, after the corpus changed to ``version``.
+
+    Importers call this after bumping ``CORPUS_VERSION``, so processes map
+    the new text instead of falling back to the database. Returns whether a
+    file was written.
+    """
+    if not os.path.exists(corpus_file_path()):
+        return False
+    write_corpus(version)
+    return True
+
+
+def build_corpus(version: int = 0) -> QuranCorpus:
+    """Build the corpus from the binary corpus file or the database.
+
+    The memory-mapped file (``scripts/build_corpus.py``) is preferred when it
+    was built for the current corpus version; otherwise ayahs come from the
+    ``ayah_index`` table, falling back to the bundled quran.json when they
+    were not imported.
+    """
+    path = corpus_file_path()
+    if os.path.exists(path):
+        try:
+            corpus_file = CorpusFile(path)
+        except (OSError, CorpusFormatError) as e:
+            current_app.logger.warning(f"Corpus file ignored: {str(e)}")
+        else:
+            if corpus_file.corpus_version == version:
+                corpus = QuranCorpus.from_file(corpus_file, version=version)
+                current_app.logger.info(f"Quran corpus mapped from {path}: {len(corpus)} ayahs")
+                return corpus
+            # The corpus was re-imported since the file was built
+            corpus_file.close()
+            current_app.logger.warning(
+                f"Corpus file {path} is out of date, loading from the database "
+                "(rebuild it with scripts/build_corpus.py)"
+            )
+
+    ayahs = _load_ayah_rows()
+
+    if not ayahs:
+        current_app.logger.warning("No ayahs in the database, loading the corpus from quran.json")
+        ayahs = _load_quran_json()
+
+    corpus = QuranCorpus(ayahs, version=version)
+    current_app.logger.info(f"Quran corpus loaded: {len(corpus)} ayahs")
+    return corpus
+
+
+def get_corpus() -> QuranCorpus:
+    """Get the process-wide corpus, reloading it if the corpus changed."""
+    global _corpus
+
+    version = get_version(CORPUS_VERSION)
+    corpus = _corpus
+    if corpus is not None and corpus.version == version:
+        return corpus
+
+    with _lock:
+        if _corpus is None or _corpus.version != version:
+            _corpus = build_corpus(version)
+        return _corpus
+
+
+def warm_corpus(app) -> None:
+    """Load the corpus at startup, before a preloading server forks its workers."""
+    with app.app_context():
+        try:
+            get_corpus()
+        except Exception as e:
+            app.logger.warning(f"Quran corpus warm-up skipped: {str(e)}")
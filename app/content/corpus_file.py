@@ -0,0 +1,196 @@
+"""
+Memory-mapped binary Quran corpus
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Layout (native byte order, recorded in the header):
+#
+#   header         MAGIC, format version, byte order, ayah count,
+#                  corpus version (the CORPUS_VERSION stamp the file was built for)
+#   surah_starts   uint32[115]           first ayah ordinal of each surah, then the total
+#   text_offsets   uint32[ayahs + 1]     byte offsets of each ayah into the text blob
+#   pages          uint16[ayahs]         page of each ayah (padded to 4 bytes)
+#   text blob      UTF-8 ayah texts back to back
+#
+# Ayah ordinals are positions in mushaf order. Juz and page ranges come from
+# the mushaf tables in app.utils.mushaf, so they are not stored.
+MAGIC = b"QRNC"
+FORMAT_VERSION = 3
+_HEADER = struct.Struct("<4sHHIQ")
+_BYTE_ORDERS = {"little": 1, "big": 2}
+
+
+class CorpusFormatError(ValueError):
+    """Raised for files that are not a corpus built by this version."""
+
+
+def write_corpus_file(path: str, ayahs: Iterable[Tuple[int, int, str, int]], corpus_version: int = 0) -> int:
+    """Compile ``(surah_id, ayah_no, text, page)`` rows into a corpus file.
+
+    ``corpus_version`` is recorded in the header so readers can tell a file
+    that is older than the current corpus. The file is written next to
+    ``path`` and renamed over it, so processes that still map the previous
+    file keep a consistent view. Returns the number of ayahs written.
+    """
+    rows = sorted(ayahs)
+
+    surah_counts = [0] * 114
+    text_offsets = array("I", [0])
+    pages = array("H")
+    blob = bytearray()
+
+    for surah_id, ayah_no, text, page in rows:
+        surah_counts[surah_id - 1] += 1
+        blob += text.encode("utf-8")
+        text_offsets.append(len(blob))
+        pages.append(page or 0)
+
+    surah_starts = array("I", [0])
+    for count in surah_counts:
+        surah_starts.append(surah_starts[-1] + count)
+
+    if len(pages) % 2:
+        pages.append(0)
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, _BYTE_ORDERS[sys.byteorder], len(rows), corpus_version)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for part in (header, surah_starts, text_offsets, pages):
+            f.write(part if isinstance(part, bytes) else part.tobytes())
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+    return len(rows)
+
+
+class CorpusFile:
+    """Read-only view of a corpus file through ``mmap``.
+
+    Every table is a ``memoryview`` cast over the mapping, so nothing is
+    parsed or copied at open time and all processes mapping the file share
+    one page-cache copy. Ayah text is decoded from the mapping on access.
+    """
+
+    __slots__ = (
+        "path", "_file", "_map", "ayah_count", "corpus_version",
+        "surah_starts", "text_offsets", "pages", "blob",
+    )
+
+    _VIEWS = ("surah_starts", "text_offsets", "pages", "blob")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = None
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._parse()
+        except ValueError as e:
+            self.close()
+            if isinstance(e, CorpusFormatError):
+                raise
+            raise CorpusFormatError(f"Invalid corpus file {path}: {str(e)}") from e
+        except BaseException:
+            self.close()
+            raise
+
+    def _parse(self) -> None:
+        path = self.path
+        size = len(self._map)
+        if size < _HEADER.size:
+            raise CorpusFormatError(f"Truncated corpus file: {path}")
+        magic, version, byte_order, self.ayah_count, self.corpus_version = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise CorpusFormatError(f"Unsupported corpus file: {path}")
+        if byte_order != _BYTE_ORDERS[sys.byteorder]:
+            raise CorpusFormatError(f"Corpus file built on a machine with another byte order: {path}")
+
+        sections = (
+            ("surah_starts", "I", 115),
+            ("text_offsets", "I", self.ayah_count + 1),
+            ("pages", "H", self.ayah_count + self.ayah_count % 2),
+        )
+        tables_end = _HEADER.size + sum(struct.calcsize(fmt) * count for _, fmt, count in sections)
+        if size < tables_end:
+            raise CorpusFormatError(f"Truncated corpus file: {path}")
+
+        view = memoryview(self._map)
+        offset = _HEADER.size
+        try:
+            for name, fmt, count in sections:
+                length = struct.calcsize(fmt) * count
+                setattr(self, name, view[offset:offset + length].cast(fmt))
+                offset += length
+            self.blob = view[offset:]
+        finally:
+            view.release()
+
+        if len(self.blob) != self.text_offsets[self.ayah_count]:
+            raise CorpusFormatError(f"Truncated corpus file: {path}")
+
+    def __len__(self) -> int:
+        return self.ayah_count
+
+    def raw_text(self, ordinal: int) -> memoryview:
+        """Return the UTF-8 bytes of an ayah as a zero-copy slice of the mapping."""
+        return self.blob[self.text_offsets[ordinal]:self.text_offsets[ordinal + 1]]
+
+    def text(self, ordinal: int) -> str:
+        """Return the text of an ayah."""
+        return str(self.raw_text(ordinal), "utf-8")
+
+    def ordinal(self, surah_id: int, ayah_no: int) -> Optional[int]:
+        """Return the ordinal of an ayah, or ``None`` if it does not exist."""
+        if not 1 <= surah_id <= 114:
+            return None
+        start = self.surah_starts[surah_id - 1]
+        if not 1 <= ayah_no <= self.surah_starts[surah_id] - start:
+            return None
+        return start + ayah_no - 1
+
+    def location(self, ordinal: int) -> Tuple[int, int]:
+        """Return the ``(surah_id, ayah_no)`` of an ordinal."""
+        surah_id = bisect_right(self.surah_starts, ordinal)
+        return surah_id, ordinal - self.surah_starts[surah_id - 1] + 1
+
+    def surah_range(self, surah_id: int) -> range:
+        """Return the ordinals of a surah."""
+        return range(self.surah_starts[surah_id - 1], self.surah_starts[surah_id])
+
+    def iter_ayahs(self) -> Iterator[Tuple[int, int, str, int]]:
+        """Yield ``(surah_id, ayah_no, text, page)`` for every ayah in mushaf order."""
+        for surah_id in range(1, 115):
+            for ayah_no, ordinal in enumerate(self.surah_range(surah_id), 1):
+                yield surah_id, ayah_no, self.text(ordinal), self.pages[ordinal]
+
+    def close(self) -> None:
+        """Release the mapping; views handed out must no longer be used."""
+        for name in self._VIEWS:
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+class TextView:
+    """Sequence of ayah texts decoded lazily from a ``CorpusFile``."""
+
+    __slots__ = ("corpus_file",)
+
+    def __init__(self, corpus_file: CorpusFile):
+        self.corpus_file = corpus_file
+
+    def __len__(self) -> int:
+        return len(self.corpus_file)
+
+    def __getitem__(self, ordinal: int) -> str:
+        return self.corpus_file.text(ordinal)
@@ -0,0 +1,160 @@
+"""
+Translation and tafsir datasets, normalized in a process pool
+"""
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.utils.arabic import normalize_arabic
+from app.utils.bulk_load import batched
+from app.utils.json_stream import iter_records
+from app.utils.mushaf import ordinal_of
+
+
+# Bumped whenever translation or tafsir texts change
+TRANSLATIONS_VERSION = "translations"
+
+DATASET_KINDS = ("translation", "tafsir")
+
+# Languages written in Arabic script get the Quran text normalization
+ARABIC_SCRIPT_LANGUAGES = ("ar", "fa", "ur")
+
+# Records per task sent to a worker process
+DEFAULT_CHUNK_SIZE = 500
+
+_WORD = re.compile(r"\w+")
+
+
+class DatasetSpec:
+    """A dataset file and the metadata of its ``translations`` row."""
+
+    __slots__ = ("code", "name", "language", "kind", "path")
+
+    def __init__(self, code: str, name: str, language: str, kind: str, path: str):
+        self.code = code
+        self.name = name
+        self.language = language
+        self.kind = kind
+        self.path = path
+
+    @classmethod
+    def from_dict(cls, data: dict, base_dir: str = ".") -> "DatasetSpec":
+        """Build a spec from a datasets file entry; ``path`` is relative to ``base_dir``."""
+        missing = [key for key in ("code", "name", "language", "path") if not data.get(key)]
+        if missing:
+            raise ValueError(f"Dataset entry is missing {', '.join(missing)}: {data}")
+        kind = data.get("kind", "translation")
+        if kind not in DATASET_KINDS:
+            raise ValueError(f"Invalid dataset kind '{kind}'. Must be one of: {', '.join(DATASET_KINDS)}")
+        return cls(
+            code=data["code"],
+            name=data["name"],
+            language=data["language"],
+            kind=kind,
+            path=os.path.join(base_dir, data["path"]),
+        )
+
+    def to_row(self) -> dict:
+        """Return the ``translations`` row of the dataset."""
+        return {"code": self.code, "name": self.name, "language": self.language, "kind": self.kind}
+
+    def digest(self) -> str:
+        """SHA-256 of the metadata and the raw file, compared with the import manifest."""
+        digest = hashlib.sha256(json.dumps(self.to_row(), sort_keys=True).encode("utf-8"))
+        with open(self.path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+
+def load_dataset_specs(path: str) -> List[DatasetSpec]:
+    """Read a datasets file: ``{"datasets": [{"code", "name", "language", "kind", "path"}, ...]}``."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    entries = data.get("datasets", []) if isinstance(data, dict) else data
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    specs = [DatasetSpec.from_dict(entry, base_dir) for entry in entries]
+    codes = [spec.code for spec in specs]
+    duplicates = sorted({code for code in codes if codes.count(code) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate dataset codes: {', '.join(duplicates)}")
+    return specs
+
+
+def normalize_text(text: str, language: str) -> str:
+    """Normalize translated text to space-separated search tokens.
+
+    Arabic-script text is folded like the Quran text; other languages are
+    case-folded with accents stripped. Punctuation is dropped in both cases.
+    """
+    if language in ARABIC_SCRIPT_LANGUAGES:
+        folded = normalize_arabic(text)
+    else:
+        decomposed = unicodedata.normalize("NFKD", text)
+        folded = "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+    return " ".join(_WORD.findall(folded))
+
+
+def normalize_chunk(language: str, records: List[dict]) -> Tuple[List[Dict], int]:
+    """Turn dataset records into ``translation_ayahs`` rows (runs in a worker process).
+
+    Returns the rows and the number of records skipped because they had no
+    text, did not name a valid ayah or repeated an ayah already seen in the
+    chunk (the first one wins).
+    """
+    rows = []
+    skipped = 0
+    seen = set()
+    for record in records:
+        surah_id = record.get("chapter")
+        ayah_no = record.get("verse")
+        text = (record.get("text") or "").strip()
+        if not text or not isinstance(surah_id, int) or not isinstance(ayah_no, int) or ordinal_of(surah_id, ayah_no) is None:
+            skipped += 1
+            continue
+        if (surah_id, ayah_no) in seen:
+            skipped += 1
+            continue
+        seen.add((surah_id, ayah_no))
+        rows.append({
+            "surah_id": surah_id,
+            "ayah_no": ayah_no,
+            "text": text,
+            "text_normalized": normalize_text(text, language),
+        })
+    return rows, skipped
+
+
+def normalize_datasets(
+    specs: Iterable[DatasetSpec],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[DatasetSpec, List[Dict], int]]:
+    """Normalize datasets in a process pool, yielding ``(spec, rows, skipped)`` in file order.
+
+    Files are streamed in the calling process and cut into chunks that the
+    workers normalize in parallel. At most a few chunks per worker are in
+    flight, so memory stays bounded while the caller writes the previous
+    results; yielding in order lets a single writer load each dataset in
+    one pass. A file without records yields nothing, so callers should walk
+    their own list of specs rather than group the results.
+    """
+    window = (workers or os.cpu_count() or 1) * 4
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for spec in specs:
+            for chunk in batched(iter_records(spec.path), chunk_size):
+                pending.append((spec, pool.submit(normalize_chunk, spec.language, chunk)))
+                if len(pending) >= window:
+                    done_spec, future = pending.popleft()
+                    yield (done_spec, *future.result())
+        while pending:
+            done_spec, future = pending.popleft()
+            yield (done_spec, *future.result())
@@ -0,0 +1,64 @@
+"""
+Character-trigram index for typo-tolerant Quran search
+"""
+from array import array
+from collections import Counter
+from typing import Dict, List, Tuple
+
+
+def trigrams(word: str) -> List[str]:
+    """Split a word into padded character trigrams (the pg_trgm scheme)."""
+    padded = f"  {word} "
+    return list({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+class TrigramIndex:
+    """Trigram index over the search vocabulary.
+
+    Misspelled query words are resolved to vocabulary terms by trigram
+    similarity (shared trigrams / union of trigrams), so the expensive part
+    of fuzzy matching runs over the ~15k distinct terms rather than every
+    ayah. Matching terms are then expanded through the regular posting lists.
+    """
+
+    __slots__ = ("terms", "sizes", "grams")
+
+    def __init__(self, terms: List[str]):
+        self.terms = terms
+        self.sizes = array("B")
+
+        grams: Dict[str, array] = {}
+        for term_id, term in enumerate(terms):
+            term_grams = trigrams(term)
+            self.sizes.append(min(len(term_grams), 255))
+            for gram in term_grams:
+                posting = grams.get(gram)
+                if posting is None:
+                    posting = grams[gram] = array("I")
+                posting.append(term_id)
+
+        self.grams = grams
+
+    def similar(self, word: str, threshold: float) -> List[Tuple[str, float]]:
+        """Return vocabulary terms whose similarity to ``word`` is at least ``threshold``."""
+        word_grams = trigrams(word)
+        size = len(word_grams)
+
+        # A term can only reach the threshold if it shares enough trigrams
+        min_shared = threshold * size
+        counts = Counter()
+        for gram in word_grams:
+            posting = self.grams.get(gram)
+            if posting is not None:
+                counts.update(posting)
+
+        matches = []
+        sizes = self.sizes
+        for term_id, shared in counts.items():
+            if shared < min_shared:
+                continue
+            similarity = shared / (size + sizes[term_id] - shared)
+            if similarity >= threshold:
+                matches.append((self.terms[term_id], similarity))
+
+        return matches
@@ -0,0 +1,95 @@
+"""
+Read-only in-memory reciter catalog
+"""
+import threading
+from typing import Iterable, Optional, Tuple
+
+from flask import current_app
+
+from app.models import Reciter
+from app.utils.versioning import get_version
+
+
+# Bumped whenever reciters are created, updated or re-imported
+RECITERS_VERSION = "reciters"
+
+
+class ReciterRecord:
+    """Immutable reciter details."""
+
+    __slots__ = ("id", "code", "name", "bitrate_kbps", "base_url")
+
+    def __init__(self, id: int, code: str, name: str, bitrate_kbps: int, base_url: str):
+        self.id = id
+        self.code = code
+        self.name = name
+        self.bitrate_kbps = bitrate_kbps
+        self.base_url = base_url
+
+    def to_dict(self) -> dict:
+        """Convert to the same dictionary as ``Reciter.to_dict``."""
+        return {
+            "id": self.id,
+            "code": self.code,
+            "name": self.name,
+            "bitrate_kbps": self.bitrate_kbps,
+            "base_url": self.base_url,
+        }
+
+
+class ReciterCatalog:
+    """Snapshot of the ``reciters`` table, ordered by id.
+
+    The object is never mutated after construction; a new catalog replaces
+    it when the reciters version changes.
+    """
+
+    __slots__ = ("version", "reciters", "by_id")
+
+    def __init__(self, reciters: Iterable[ReciterRecord], version: int = 0):
+        self.version = version
+        self.reciters: Tuple[ReciterRecord, ...] = tuple(sorted(reciters, key=lambda r: r.id))
+        self.by_id = {reciter.id: reciter for reciter in self.reciters}
+
+    def __len__(self) -> int:
+        return len(self.reciters)
+
+    def get(self, reciter_id) -> Optional[ReciterRecord]:
+        """Return a reciter, or ``None`` if it does not exist."""
+        return self.by_id.get(reciter_id)
+
+    def page(self, offset: int, limit: int) -> Tuple[ReciterRecord, ...]:
+        """Return ``limit`` reciters starting at ``offset``."""
+        return self.reciters[max(offset, 0):max(offset, 0) + max(limit, 0)]
+
+
+_catalog: Optional[ReciterCatalog] = None
+_lock = threading.Lock()
+
+
+def build_reciter_catalog(version: int = 0) -> ReciterCatalog:
+    """Build a fresh catalog from the ``reciters`` table."""
+    catalog = ReciterCatalog(
+        (
+            ReciterRecord(r.id, r.code, r.name, r.bitrate_kbps, r.base_url)
+            for r in Reciter.query.all()
+        ),
+        version=version,
+    )
+    current_app.logger.info(f"Reciter catalog loaded: {len(catalog)} reciters")
+    return catalog
+
+
+def get_reciter_catalog() -> ReciterCatalog:
+    """Get the process-wide reciter catalog, reloading it if reciters changed."""
+    global _catalog
+
+    version = get_version(RECITERS_VERSION)
+    catalog = _catalog
+    if catalog is not None and catalog.version == version:
+        return catalog
+
+    with _lock:
+        if _catalog is None or _catalog.version != version:
+            _catalog = build_reciter_catalog(version)
+        return _catalog
@@ -1,29 +1,66 @@
-from flask import request, jsonify, current_app, Blueprint
+from flask import request, current_app, Blueprint, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.extensions import db, limiter
-from app.models import Reciter, AyahIndex, User, UserSettings
-from app.schemas.common import PaginationSchema
-from marshmallow import ValidationError
+from app.extensions import db
+from app.models import UserSettings
+from app.settings.cache import get_cached_settings, store_settings
+from .search_query import QueryError, parse_query
+from .search_backends import search
+from .search_index import get_search_index
+from .corpus import CORPUS_VERSION, get_corpus
+from .reciters import RECITERS_VERSION, get_reciter_catalog
+from .suggest_index import MAX_SUGGESTIONS
+from app.utils.arabic import normalize_arabic
+from app.utils.http import conditional, precompressed
+from app.utils.mushaf import TOTAL_JUZ, TOTAL_PAGES, juz_range, location_of, ordinal_of, page_range
+from app.utils.surahs import ayah_error, get_surah, range_error, surah_error
+import json
 import math
+import re
 
 # Create blueprint
 content_bp = Blueprint("content", __name__)
 
+# "2:255" or "2:1..3:10"
+AYAH_RANGE = re.compile(r"^(\d+):(\d+)(?:\.\.(\d+):(\d+))?$")
+
+# Ayahs serialized per streamed chunk
+STREAM_BATCH_SIZE = 50
+
+# Longest range (Al-Baqarah) sent in one piece, so whole surahs are cached
+# precompressed; longer ranges are streamed
+MAX_BUFFERED_RANGE = 286
+
+# Most ayahs resolved by one /audio-urls request
+MAX_AUDIO_BATCH = 1000
+
+
+def audio_url(reciter, surah_id: int, ayah_no: int) -> str:
+    """Build the audio URL of an ayah for a reciter."""
+    # This is a placeholder - you'll need to implement the actual URL construction
+    # based on your audio file structure
+    return f"{reciter.base_url}/surah_{surah_id:03d}/ayah_{ayah_no:03d}.mp3"
+
 
 @content_bp.route("/reciters", methods=["GET"])
+@conditional(RECITERS_VERSION)
+@precompressed(RECITERS_VERSION, query_args=("page", "per_page"))
 def get_reciters():
     """Get list of available reciters."""
     try:
         page = request.args.get("page", 1, type=int)
         per_page = min(request.args.get("per_page", 20, type=int), 100)
         
-        query = Reciter.query
+        if page < 1 or per_page < 1:
+            return {"error": "Parameters 'page' and 'per_page' must be positive"}, 400
+        
+        # Served from the in-memory reciter catalog
+        catalog = get_reciter_catalog()
         
         # Pagination
-        total = query.count()
+        total = len(catalog)
         total_pages = math.ceil(total / per_page)
         
-        reciters = query.offset((page - 1) * per_page).limit(per_page).all()
+        reciters = catalog.page((page - 1) * per_page, per_page)
         
         return {
             "reciters": [reciter.to_dict() for reciter in reciters],
@@ -41,10 +78,11 @@ def get_reciters():
 
 
 @content_bp.route("/reciters/<int:reciter_id>", methods=["GET"])
+@conditional(RECITERS_VERSION)
 def get_reciter(reciter_id):
     """Get specific reciter details."""
     try:
-        reciter = Reciter.query.get(reciter_id)
+        reciter = get_reciter_catalog().get(reciter_id)
         
         if not reciter:
             return {"error": "Reciter not found"}, 404
@@ -57,30 +95,47 @@ def get_reciter(reciter_id):
 
 
 @content_bp.route("/search", methods=["GET"])
+@conditional(CORPUS_VERSION)
 def search_quran():
     """Search Quran text."""
     try:
         query = request.args.get("q", "").strip()
+        mode = request.args.get("mode", "exact")
         page = request.args.get("page", 1, type=int)
         per_page = min(request.args.get("per_page", 20, type=int), 100)
         
         if not query or len(query) < 2:
             return {"error": "Search query must be at least 2 characters long"}, 400
         
-        # Search in ayah index
-        search_results = AyahIndex.query.filter(
-            AyahIndex.text_plain.ilike(f"%{query}%")
-        ).order_by(AyahIndex.surah_id, AyahIndex.ayah_no)
+        if mode not in ("exact", "fuzzy"):
+            return {"error": "Invalid search mode. Must be 'exact' or 'fuzzy'"}, 400
+        
+        if page < 1 or per_page < 1:
+            return {"error": "Parameters 'page' and 'per_page' must be positive"}, 400
+        
+        # Parse and normalize the query the same way the corpus was
+        # normalized at import time, then search through the mode's backend
+        try:
+            search_query = parse_query(query)
+            if search_query is None:
+                results, total, facets = [], 0, {"surah": {}, "juz": {}}
+            else:
+                results, total, facets = search(
+                    search_query,
+                    mode,
+                    offset=(page - 1) * per_page,
+                    limit=per_page,
+                )
+        except QueryError as e:
+            return {"error": str(e)}, 400
         
         # Pagination
-        total = search_results.count()
         total_pages = math.ceil(total / per_page)
         
-        results = search_results.offset((page - 1) * per_page).limit(per_page).all()
-        
         return {
-            "results": [result.to_dict() for result in results],
+            "results": results,
             "query": query,
+            "facets": facets,
             "pagination": {
                 "page": page,
                 "per_page": per_page,
@@ -94,25 +149,48 @@ def search_quran():
         return {"error": "Internal server error"}, 500
 
 
+@content_bp.route("/search/suggest", methods=["GET"])
+@conditional(CORPUS_VERSION)
+def suggest_words():
+    """Autocomplete the last word of a search query."""
+    try:
+        query = request.args.get("q", "")
+        limit = request.args.get("limit", 10, type=int)
+
+        if limit < 1 or limit > MAX_SUGGESTIONS:
+            return {"error": f"Invalid limit. Must be between 1 and {MAX_SUGGESTIONS}"}, 400
+
+        words = normalize_arabic(query).split()
+        if not words:
+            return {"error": "Search query is required"}, 400
+
+        # Complete the word being typed; earlier words are kept as typed
+        completions = get_search_index().suggestions.complete(words[-1], limit)
+
+        return {
+            "query": query,
+            "suggestions": [
+                {"word": word, "frequency": frequency}
+                for word, frequency in completions
+            ]
+        }, 200
+
+    except Exception as e:
+        current_app.logger.error(f"Search suggest error: {str(e)}")
+        return {"error": "Internal server error"}, 500
+
+
 @content_bp.route("/surah/<int:surah_id>", methods=["GET"])
+@conditional(CORPUS_VERSION)
 def get_surah_info(surah_id):
     """Get surah information and structure."""
     try:
-        if surah_id < 1 or surah_id > 114:
-            return {"error": "Invalid surah ID. Must be between 1 and 114"}, 400
-        
-        # Get surah details (this would need to be implemented based on your data structure)
-        # For now, return basic structure
-        surah_info = {
-            "id": surah_id,
-            "name_arabic": f"Surah {surah_id}",  # This should come from your data
-            "name_english": f"Surah {surah_id}",  # This should come from your data
-            "total_ayahs": 0,  # This should come from your data
-            "revelation_type": "Meccan" if surah_id <= 87 else "Medinan",  # Basic logic
-            "juz": 0  # This should come from your data
-        }
-        
-        return {"surah": surah_info}, 200
+        error = surah_error(surah_id)
+        if error:
+            return {"error": error}, 400
+        
+        # Served from the static surah table, no database round trip
+        return {"surah": get_surah(surah_id).to_dict()}, 200
         
     except Exception as e:
         current_app.logger.error(f"Surah info retrieval error: {str(e)}")
@@ -120,25 +198,19 @@ def get_surah_info(surah_id):
 
 
 @content_bp.route("/surah/<int:surah_id>/ayah/<int:ayah_no>", methods=["GET"])
+@conditional(CORPUS_VERSION)
 def get_ayah_info(surah_id, ayah_no):
     """Get specific ayah information."""
     try:
-        if surah_id < 1 or surah_id > 114:
-            return {"error": "Invalid surah ID. Must be between 1 and 114"}, 400
+        error = ayah_error(surah_id, ayah_no)
+        if error:
+            return {"error": error}, 400
         
-        if ayah_no < 1:
-            return {"error": "Invalid ayah number. Must be greater than 0"}, 400
+        # Served from the in-memory corpus, no database round trip
+        ayah_info = get_corpus().ayah(surah_id, ayah_no)
         
-        # Get ayah details (this would need to be implemented based on your data structure)
-        ayah_info = {
-            "surah_id": surah_id,
-            "ayah_no": ayah_no,
-            "text_arabic": f"Ayah {ayah_no} from Surah {surah_id}",  # This should come from your data
-            "text_translation": f"Translation of ayah {ayah_no} from surah {surah_id}",  # This should come from your data
-            "page": 0,  # This should come from your data
-            "juz": 0,  # This should come from your data
-            "hizb": 0  # This should come from your data
-        }
+        if not ayah_info:
+            return {"error": "Ayah not found"}, 404
         
         return {"ayah": ayah_info}, 200
         
@@ -147,6 +219,105 @@ def get_ayah_info(surah_id, ayah_no):
         return {"error": "Internal server error"}, 500
 
 
+@content_bp.route("/page/<int:page>", methods=["GET"])
+@conditional(CORPUS_VERSION)
+@precompressed(CORPUS_VERSION)
+def get_page(page):
+    """Get the ayahs of a mushaf page."""
+    try:
+        if page < 1 or page > TOTAL_PAGES:
+            return {"error": f"Invalid page. Must be between 1 and {TOTAL_PAGES}"}, 400
+        
+        # Range from the mushaf boundary table, text from the corpus
+        ayahs = get_corpus().division_ayahs(page_range(page))
+        
+        return {"page": page, "ayahs": ayahs, "total": len(ayahs)}, 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Page retrieval error: {str(e)}")
+        return {"error": "Internal server error"}, 500
+
+
+@content_bp.route("/juz/<int:juz>", methods=["GET"])
+@conditional(CORPUS_VERSION)
+@precompressed(CORPUS_VERSION)
+def get_juz(juz):
+    """Get the ayahs of a juz."""
+    try:
+        if juz < 1 or juz > TOTAL_JUZ:
+            return {"error": f"Invalid juz. Must be between 1 and {TOTAL_JUZ}"}, 400
+        
+        # Range from the mushaf boundary table, text from the corpus
+        ayahs = get_corpus().division_ayahs(juz_range(juz))
+        
+        return {"juz": juz, "ayahs": ayahs, "total": len(ayahs)}, 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Juz retrieval error: {str(e)}")
+        return {"error": "Internal server error"}, 500
+
+
+@content_bp.route("/ayahs", methods=["GET"])
+@conditional(CORPUS_VERSION)
+@precompressed(CORPUS_VERSION, query_args=("range", "format"))
+def get_ayah_range():
+    """Stream a range of ayahs (from_surah:from_ayah..to_surah:to_ayah)."""
+    try:
+        match = AYAH_RANGE.match(request.args.get("range", "").strip())
+        if not match:
+            return {"error": "Invalid range. Use from_surah:from_ayah..to_surah:to_ayah"}, 400
+        
+        output_format = request.args.get("format", "ndjson")
+        if output_format not in ("ndjson", "json"):
+            return {"error": "Invalid format. Must be 'ndjson' or 'json'"}, 400
+        
+        from_surah, from_ayah = int(match.group(1)), int(match.group(2))
+        to_surah, to_ayah = (
+            (int(match.group(3)), int(match.group(4))) if match.group(3) else (from_surah, from_ayah)
+        )
+        
+        error = range_error(from_surah, from_ayah, to_surah, to_ayah)
+        if error:
+            return {"error": error}, 400
+        
+        # The corpus is immutable, so the whole stream reads one snapshot
+        corpus = get_corpus()
+        start = corpus.ordinal(from_surah, from_ayah)
+        end = corpus.ordinal(to_surah, to_ayah)
+        
+        if start is None or end is None:
+            return {"error": "Ayah not found"}, 404
+        
+        def generate():
+            batch = []
+            first = True
+            if output_format == "json":
+                yield '{"ayahs": ['
+            for ayah in corpus.iter_ayahs(start, end):
+                line = json.dumps(ayah, ensure_ascii=False)
+                if output_format == "json":
+                    batch.append(line if first else "," + line)
+                    first = False
+                else:
+                    batch.append(line + "\n")
+                if len(batch) >= STREAM_BATCH_SIZE:
+                    yield "".join(batch)
+                    batch = []
+            if batch:
+                yield "".join(batch)
+            if output_format == "json":
+                yield f'], "total": {end - start + 1}}}'
+        
+        mimetype = "application/x-ndjson" if output_format == "ndjson" else "application/json"
+        if end - start + 1 <= MAX_BUFFERED_RANGE:
+            return Response("".join(generate()), mimetype=mimetype)
+        return Response(stream_with_context(generate()), mimetype=mimetype)
+        
+    except Exception as e:
+        current_app.logger.error(f"Ayah range retrieval error: {str(e)}")
+        return {"error": "Internal server error"}, 500
+
+
 @content_bp.route("/audio-url", methods=["GET"])
 @jwt_required()
 def get_audio_url():
@@ -161,33 +332,26 @@ def get_audio_url():
         if not surah_id or not ayah_no:
             return {"error": "Surah ID and ayah number are required"}, 400
         
-        if surah_id < 1 or surah_id > 114:
-            return {"error": "Invalid surah ID. Must be between 1 and 114"}, 400
+        error = ayah_error(surah_id, ayah_no)
+        if error:
+            return {"error": error}, 400
         
-        if ayah_no < 1:
-            return {"error": "Invalid ayah number. Must be greater than 0"}, 400
-        
-        # Get user's preferred reciter if not specified
+        # Get user's preferred reciter if not specified (cached per worker)
         if not reciter_id:
-            user_settings = UserSettings.query.filter_by(user_id=current_user_id).first()
-            if user_settings and user_settings.reciter_id:
-                reciter_id = user_settings.reciter_id
+            user_settings = get_cached_settings(current_user_id)
+            if user_settings and user_settings["reciter_id"]:
+                reciter_id = user_settings["reciter_id"]
             else:
                 # Default reciter
                 reciter_id = 1
         
-        # Get reciter
-        reciter = Reciter.query.get(reciter_id)
+        # Get reciter from the in-memory catalog
+        reciter = get_reciter_catalog().get(reciter_id)
         if not reciter:
             return {"error": "Reciter not found"}, 404
         
-        # Construct audio URL
-        # This is a placeholder - you'll need to implement the actual URL construction
-        # based on your audio file structure
-        audio_url = f"{reciter.base_url}/surah_{surah_id:03d}/ayah_{ayah_no:03d}.mp3"
-        
         return {
-            "audio_url": audio_url,
+            "audio_url": audio_url(reciter, surah_id, ayah_no),
             "reciter": reciter.to_dict(),
             "surah_id": surah_id,
             "ayah_no": ayah_no
@@ -198,18 +362,104 @@ def get_audio_url():
         return {"error": "Internal server error"}, 500
 
 
+@content_bp.route("/audio-urls", methods=["POST"])
+@jwt_required()
+def get_audio_urls():
+    """Resolve audio URLs for a list of ayahs and ranges in one request."""
+    try:
+        current_user_id = get_jwt_identity()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return {"error": "Request body must be a JSON object"}, 400
+        
+        ayahs = data.get("ayahs")
+        if not isinstance(ayahs, list) or not ayahs:
+            return {"error": "Field 'ayahs' must be a non-empty list"}, 400
+        
+        reciter_id = data.get("reciter_id")
+        # bool is a subclass of int, so true/false must be rejected explicitly
+        if reciter_id is not None and (not isinstance(reciter_id, int) or isinstance(reciter_id, bool)):
+            return {"error": "Field 'reciter_id' must be an integer"}, 400
+        
+        variant_ids = data.get("variants", [])
+        if not isinstance(variant_ids, list) or not all(
+            isinstance(i, int) and not isinstance(i, bool) for i in variant_ids
+        ):
+            return {"error": "Field 'variants' must be a list of reciter IDs"}, 400
+        
+        # Expand "2:255" and "2:1..2:5" entries in mushaf order, before any query
+        locations = []
+        for entry in ayahs:
+            match = AYAH_RANGE.match(str(entry).strip())
+            if not match:
+                return {"error": f"Invalid ayah or range: {entry}"}, 400
+            from_surah, from_ayah = int(match.group(1)), int(match.group(2))
+            to_surah, to_ayah = (
+                (int(match.group(3)), int(match.group(4))) if match.group(3) else (from_surah, from_ayah)
+            )
+            error = range_error(from_surah, from_ayah, to_surah, to_ayah)
+            if error:
+                return {"error": error}, 400
+            start, end = ordinal_of(from_surah, from_ayah), ordinal_of(to_surah, to_ayah)
+            if len(locations) + end - start + 1 > MAX_AUDIO_BATCH:
+                return {"error": f"Too many ayahs. At most {MAX_AUDIO_BATCH} per request"}, 400
+            locations.extend(location_of(ordinal) for ordinal in range(start, end + 1))
+        
+        # Get user's preferred reciter if not specified (cached per worker)
+        if not reciter_id:
+            user_settings = get_cached_settings(current_user_id)
+            if user_settings and user_settings["reciter_id"]:
+                reciter_id = user_settings["reciter_id"]
+            else:
+                # Default reciter
+                reciter_id = 1
+        
+        # Main reciter and bitrate variants from the in-memory catalog
+        catalog = get_reciter_catalog()
+        reciter = catalog.get(reciter_id)
+        if not reciter:
+            return {"error": "Reciter not found"}, 404
+        variants = [
+            catalog.get(i) for i in dict.fromkeys(variant_ids) if i != reciter_id and catalog.get(i)
+        ]
+        
+        items = []
+        for surah_id, ayah_no in locations:
+            item = {
+                "surah_id": surah_id,
+                "ayah_no": ayah_no,
+                "audio_url": audio_url(reciter, surah_id, ayah_no),
+            }
+            if variants:
+                item["variants"] = {
+                    str(variant.id): audio_url(variant, surah_id, ayah_no) for variant in variants
+                }
+            items.append(item)
+        
+        return {
+            "reciter": reciter.to_dict(),
+            "variants": [variant.to_dict() for variant in variants],
+            "items": items,
+            "total": len(items)
+        }, 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Audio URL batch error: {str(e)}")
+        return {"error": "Internal server error"}, 500
+
+
 @content_bp.route("/user-settings", methods=["GET"])
 @jwt_required()
 def get_user_settings():
     """Get current user's content preferences."""
     try:
         current_user_id = get_jwt_identity()
-        settings = UserSettings.query.filter_by(user_id=current_user_id).first()
+        settings = get_cached_settings(current_user_id)
         
         if not settings:
             return {"error": "User settings not found"}, 404
         
-        return {"settings": settings.to_dict()}, 200
+        return {"settings": settings}, 200
         
     except Exception as e:
         current_app.logger.error(f"User settings retrieval error: {str(e)}")
@@ -232,7 +482,7 @@ def update_user_settings():
         # Update allowed fields
         if "reciter_id" in data:
             # Verify reciter exists
-            reciter = Reciter.query.get(data["reciter_id"])
+            reciter = get_reciter_catalog().get(data["reciter_id"])
             if not reciter:
                 return {"error": "Invalid reciter ID"}, 400
             settings.reciter_id = data["reciter_id"]
@@ -253,6 +503,7 @@ def update_user_settings():
             settings.font_scale = scale
         
         db.session.commit()
+        store_settings(current_user_id, settings)
         
         return {
             "message": "Settings updated successfully",
@@ -0,0 +1,444 @@
+"""
+Pluggable search backends for /content/search
+"""
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import text
+
+from app.extensions import db
+from app.utils.cache import LRUCache
+from app.utils.mushaf import juz_bounds, juz_of
+from app.utils.surahs import SURAHS
+from app.utils.versioning import get_version
+from .corpus import CORPUS_VERSION
+from .search_index import get_search_index, iter_bitset, to_bitset
+from .search_query import And, Filter, Not, Or, Phrase, QueryError, Term, canonical, split_filters
+
+
+# Prefix of every database object owned by the full-text backends; Alembic
+# autogenerate skips these (see migrations/env.py)
+FULLTEXT_OBJECT_PREFIX = "ayah_fts"
+
+
+class SearchBackend:
+    """Base class for search backends.
+
+    ``search`` receives a query tree from ``parse_query`` (already
+    normalized) and returns one page of ``AyahIndex.to_dict``-shaped results,
+    the total number of matches and per-surah/per-juz match counts. Each
+    result carries ``highlights``: ``[start, end)`` character ranges of the
+    matched words in ``text_plain``, looked up in the search index.
+    """
+
+    name = "base"
+
+    def search(self, query, offset: int, limit: int) -> Tuple[List[dict], int, dict]:
+        raise NotImplementedError
+
+    def sync(self, surah_ids: Optional[Iterable[int]] = None) -> None:
+        """Rebuild backend-side index structures after the corpus changed.
+
+        ``surah_ids`` limits the work to the surahs an incremental import
+        touched; ``None`` rebuilds everything.
+        """
+
+
+def count_facets(keys: Iterable[Tuple[int, int]]) -> dict:
+    """Count ``(surah_id, ayah_no)`` matches per surah and per juz."""
+    surahs = Counter()
+    juz = Counter()
+    for surah_id, ayah_no in keys:
+        surahs[surah_id] += 1
+        juz[juz_of(surah_id, ayah_no)] += 1
+    return {"surah": dict(sorted(surahs.items())), "juz": dict(sorted(juz.items()))}
+
+
+class SQLBackend(SearchBackend):
+    """Shared filter handling for the database full-text backends.
+
+    Filters at the top level of the query become SQL predicates on
+    ``ayah_index a``; filters nested inside OR/NOT are only supported by the
+    in-memory backend.
+    """
+
+    def split_query(self, query):
+        text_node, filters = split_filters(query)
+        if text_node is not None and self._has_filter(text_node):
+            raise QueryError("Filters inside OR/NOT groups are not supported by this search backend")
+        return text_node, filters
+
+    def _has_filter(self, node) -> bool:
+        if isinstance(node, Filter):
+            return True
+        if isinstance(node, (And, Or)):
+            return any(self._has_filter(clause) for clause in node.clauses)
+        if isinstance(node, Not):
+            return self._has_filter(node.clause)
+        return False
+
+    @staticmethod
+    def filter_conditions(filters: List[Filter]) -> Tuple[List[str], dict]:
+        """Compile filters to SQL conditions and their bind parameters."""
+        conditions = []
+        params = {}
+        for i, node in enumerate(filters):
+            if node.field == "type":
+                # Surah ids come from the static table, not a join on surahs
+                surah_ids = ", ".join(
+                    str(surah.id) for surah in SURAHS if surah.revelation_type.lower() == node.value
+                )
+                conditions.append(f"a.surah_id IN ({surah_ids})")
+                continue
+
+            low, high = node.value
+            if node.field in ("surah", "page"):
+                column = "a.surah_id" if node.field == "surah" else "a.page"
+                conditions.append(f"{column} BETWEEN :f{i}_low AND :f{i}_high")
+                params.update({f"f{i}_low": low, f"f{i}_high": high})
+            elif node.field == "juz":
+                # Juz boundaries fall mid-surah, so compare (surah, ayah) pairs
+                (start_surah, start_ayah), _ = juz_bounds(low)
+                _, end = juz_bounds(high)
+                condition = f"(a.surah_id, a.ayah_no) >= (:f{i}_s, :f{i}_a)"
+                params.update({f"f{i}_s": start_surah, f"f{i}_a": start_ayah})
+                if end is not None:
+                    condition += f" AND (a.surah_id, a.ayah_no) < (:f{i}_es, :f{i}_ea)"
+                    params.update({f"f{i}_es": end[0], f"f{i}_ea": end[1]})
+                conditions.append(condition)
+        return conditions, params
+
+    def run(self, source: str, conditions: List[str], params: dict, order: str,
+            offset: int, limit: int, terms: List[str]) -> Tuple[List[dict], int, dict]:
+        """Fetch the keys of every match for the total and facets, then one ranked page."""
+        where = " AND ".join(conditions) or "1 = 1"
+
+        keys = db.session.execute(
+            text(f"SELECT a.surah_id, a.ayah_no FROM {source} WHERE {where}"),
+            params,
+        ).all()
+
+        rows = db.session.execute(
+            text(
+                f"SELECT a.surah_id, a.ayah_no, a.text_plain, a.page FROM {source} "
+                f"WHERE {where} ORDER BY {order}a.surah_id, a.ayah_no "
+                "LIMIT :limit OFFSET :offset"
+            ),
+            {**params, "limit": limit, "offset": offset},
+        ).mappings().all()
+
+        index = get_search_index()
+        results = []
+        for row in rows:
+            result = dict(row)
+            ordinal = index.ordinal(result["surah_id"], result["ayah_no"])
+            result["highlights"] = index.highlights(ordinal, terms) if ordinal is not None else []
+            results.append(result)
+
+        return results, len(keys), count_facets(keys)
+
+
+class MemoryBackend(SearchBackend):
+    """Search the in-process inverted index."""
+
+    name = "memory"
+
+    def search(self, query, offset: int, limit: int) -> Tuple[List[dict], int, dict]:
+        index = get_search_index()
+        bits = index.evaluate(query)
+        terms = query.terms()
+
+        results = []
+        for ordinal in islice(iter_bitset(bits), offset, offset + limit):
+            result = index.to_dict(ordinal)
+            result["highlights"] = index.highlights(ordinal, terms)
+            results.append(result)
+
+        return results, bits.bit_count(), index.facets(bits)
+
+
+class FuzzyBackend(SearchBackend):
+    """Typo-tolerant search through the in-process trigram index."""
+
+    name = "fuzzy"
+
+    def search(self, query, offset: int, limit: int) -> Tuple[List[dict], int, dict]:
+        # Phrases and operators are loosened to their positive words; only
+        # top-level filters are applied exactly
+        index = get_search_index()
+        threshold = current_app.config.get("SEARCH_FUZZY_THRESHOLD", 0.4)
+        text_node, filters = split_filters(query)
+
+        mask = index.all_bits
+        for node in filters:
+            mask &= index.filter_bitset(node)
+
+        if text_node is not None:
+            words = text_node.terms()
+            expansions = index.fuzzy_terms(" ".join(words), threshold)
+            matches = index.fuzzy_search(" ".join(words), threshold, expansions)
+            terms = [term for expansion in expansions for term, _ in expansion]
+            if filters:
+                matches = [(ordinal, score) for ordinal, score in matches if mask >> ordinal & 1]
+        else:
+            # Nothing to match loosely: a filter-only query returns what the
+            # filters select, in mushaf order, like the exact backends
+            matches = [(ordinal, 1.0) for ordinal in iter_bitset(mask)]
+            terms = []
+
+        results = []
+        for ordinal, score in matches[offset:offset + limit]:
+            result = index.to_dict(ordinal)
+            result["score"] = round(score, 3)
+            result["highlights"] = index.highlights(ordinal, terms)
+            results.append(result)
+
+        bits = to_bitset((ordinal for ordinal, _ in matches), len(index))
+        return results, len(matches), index.facets(bits)
+
+
+class SQLiteFTSBackend(SQLBackend):
+    """Search an FTS5 virtual table ranked with bm25."""
+
+    name = "fts5"
+    table = FULLTEXT_OBJECT_PREFIX
+    create_sql = (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+        "text_normalized, surah_id UNINDEXED, ayah_no UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 0')"
+    )
+
+    def __init__(self):
+        self._ready = False
+
+    @staticmethod
+    def _quote(word: str) -> str:
+        # Quote every word so user input is never parsed as FTS5 syntax
+        return '"{}"'.format(word.replace('"', '""'))
+
+    def _match_expression(self, node) -> str:
+        """Compile a query tree to an FTS5 MATCH expression."""
+        if isinstance(node, Term):
+            return self._quote(node.word)
+        if isinstance(node, Phrase):
+            if node.slop is None:
+                return self._quote(" ".join(node.words))
+            # NEAR counts the words between the first and the last match
+            distance = max(node.slop - (len(node.words) - 1), 0)
+            return "NEAR({}, {})".format(" ".join(self._quote(w) for w in node.words), distance)
+        if isinstance(node, And):
+            # FTS5 NOT is binary ("a NOT b"), so negations hang off the positive clauses
+            positive = [c for c in node.clauses if not isinstance(c, Not)]
+            negative = [c.clause for c in node.clauses if isinstance(c, Not)]
+            if not positive:
+                raise QueryError("NOT needs at least one positive search term")
+            expression = " AND ".join(f"({self._match_expression(c)})" for c in positive)
+            for clause in negative:
+                expression = f"({expression}) NOT ({self._match_expression(clause)})"
+            return expression
+        if isinstance(node, Or):
+            return " OR ".join(f"({self._match_expression(clause)})" for clause in node.clauses)
+        if isinstance(node, Not):
+            raise QueryError("NOT needs at least one positive search term")
+
+        raise TypeError(f"Unsupported query node: {type(node).__name__}")
+
+    def _table_exists(self) -> bool:
+        return db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": self.table},
+        ).first() is not None
+
+    def _ensure_table(self) -> None:
+        if self._ready:
+            return
+
+        if not self._table_exists():
+            self.sync()
+        self._ready = True
+
+    def sync(self, surah_ids: Optional[Iterable[int]] = None) -> None:
+        if surah_ids is not None and self._table_exists():
+            ids = ", ".join(str(int(surah_id)) for surah_id in surah_ids)
+            if not ids:
+                return
+            where = f" WHERE surah_id IN ({ids})"
+        else:
+            where = ""
+
+        db.session.execute(text(self.create_sql))
+        db.session.execute(text(f"DELETE FROM {self.table}{where}"))
+        db.session.execute(text(
+            f"INSERT INTO {self.table} (text_normalized, surah_id, ayah_no) "
+            f"SELECT text_normalized, surah_id, ayah_no FROM ayah_index{where}"
+        ))
+        db.session.execute(text(f"INSERT INTO {self.table} ({self.table}) VALUES ('optimize')"))
+        db.session.commit()
+        self._ready = True
+
+    def search(self, query, offset: int, limit: int) -> Tuple[List[dict], int, dict]:
+        text_node, filters = self.split_query(query)
+        conditions, params = self.filter_conditions(filters)
+
+        if text_node is None:
+            return self.run("ayah_index a", conditions, params, "", offset, limit, [])
+
+        params["q"] = self._match_expression(text_node)
+        self._ensure_table()
+
+        source = (
+            f"{self.table} f "
+            "JOIN ayah_index a ON a.surah_id = f.surah_id AND a.ayah_no = f.ayah_no"
+        )
+        conditions.insert(0, f"f.{self.table} MATCH :q")
+        order = f"bm25({self.table}), "
+        return self.run(source, conditions, params, order, offset, limit, text_node.terms())
+
+
+class PostgresFTSBackend(SQLBackend):
+    """Search a GIN-indexed tsvector expression ranked with ts_rank."""
+
+    name = "tsvector"
+    index_name = f"{FULLTEXT_OBJECT_PREFIX}_tsv"
+    vector = "to_tsvector('simple', text_normalized)"
+
+    def sync(self, surah_ids: Optional[Iterable[int]] = None) -> None:
+        # The GIN index follows row changes by itself; only create it and refresh statistics
+        db.session.execute(text(
+            f"CREATE INDEX IF NOT EXISTS {self.index_name} "
+            f"ON ayah_index USING GIN ({self.vector})"
+        ))
+        db.session.execute(text("ANALYZE ayah_index"))
+        db.session.commit()
+
+    @staticmethod
+    def _quote(word: str) -> str:
+        return "'{}'".format(word.replace("\\", "\\\\").replace("'", "\\'"))
+
+    def _tsquery(self, node) -> str:
+        """Compile a query tree to a ``to_tsquery`` expression."""
+        if isinstance(node, Term):
+            return self._quote(node.word)
+        if isinstance(node, Phrase):
+            words = [self._quote(w) for w in node.words]
+            if node.slop is None:
+                return " <-> ".join(words)
+            if len(words) == 2:
+                # Two words within N of each other in either order
+                first, second = words
+                return " | ".join(
+                    f"{a} <{distance}> {b}"
+                    for distance in range(1, max(node.slop, 1) + 1)
+                    for a, b in ((first, second), (second, first))
+                )
+            # tsquery has no "within N" for longer phrases; require the words only
+            return " & ".join(words)
+        if isinstance(node, And):
+            return " & ".join(f"({self._tsquery(clause)})" for clause in node.clauses)
+        if isinstance(node, Or):
+            return " | ".join(f"({self._tsquery(clause)})" for clause in node.clauses)
+        if isinstance(node, Not):
+            return f"!({self._tsquery(node.clause)})"
+
+        raise TypeError(f"Unsupported query node: {type(node).__name__}")
+
+    def search(self, query, offset: int, limit: int) -> Tuple[List[dict], int, dict]:
+        text_node, filters = self.split_query(query)
+        conditions, params = self.filter_conditions(filters)
+
+        if text_node is None:
+            return self.run("ayah_index a", conditions, params, "", offset, limit, [])
+
+        params["q"] = self._tsquery(text_node)
+        vector = "to_tsvector('simple', a.text_normalized)"
+        conditions.insert(0, f"{vector} @@ to_tsquery('simple', :q)")
+        order = f"ts_rank({vector}, to_tsquery('simple', :q)) DESC, "
+        return self.run("ayah_index a", conditions, params, order, offset, limit, text_node.terms())
+
+
+_FULLTEXT_BACKENDS = {
+    "sqlite": SQLiteFTSBackend,
+    "postgresql": PostgresFTSBackend,
+}
+
+_backends: Dict[str, SearchBackend] = {}
+
+
+def get_fulltext_backend() -> SearchBackend:
+    """Get the full-text backend matching the database dialect."""
+    engine = db.engine
+    key = str(engine.url)
+    backend = _backends.get(key)
+    if backend is None:
+        backend_class = _FULLTEXT_BACKENDS.get(engine.dialect.name)
+        if backend_class is None:
+            raise ValueError(f"No full-text search backend for dialect '{engine.dialect.name}'")
+        backend = _backends[key] = backend_class()
+    return backend
+
+
+def get_search_backend(mode: str = "exact") -> SearchBackend:
+    """Get the backend for a search mode.
+
+    Exact searches use the backend selected by the ``SEARCH_BACKEND``
+    setting; fuzzy searches always use the in-process trigram index.
+    """
+    if mode == "fuzzy":
+        return _backends.setdefault("fuzzy", FuzzyBackend())
+
+    name = current_app.config.get("SEARCH_BACKEND", "memory")
+
+    if name == "fulltext":
+        return get_fulltext_backend()
+    if name == "memory":
+        return _backends.setdefault("memory", MemoryBackend())
+
+    raise ValueError(f"Unknown search backend '{name}'")
+
+
+def sync_fulltext_index(surah_ids: Optional[Iterable[int]] = None) -> None:
+    """Bring the full-text index of the current database up to date after an import.
+
+    Pass the ``surah_ids`` an incremental import changed to reindex only those.
+    """
+    try:
+        backend = get_fulltext_backend()
+    except ValueError as e:
+        current_app.logger.warning(f"Full-text index not synced: {str(e)}")
+        return
+
+    backend.sync(surah_ids)
+
+
+_search_cache: Optional[LRUCache] = None
+
+
+def get_search_cache() -> LRUCache:
+    """Get the process-local cache of search result pages."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = LRUCache(
+            maxsize=current_app.config.get("SEARCH_CACHE_SIZE", 1024),
+            ttl=current_app.config.get("SEARCH_CACHE_TTL", 300),
+        )
+    return _search_cache
+
+
+def search(query, mode: str, offset: int, limit: int) -> Tuple[List[dict], int, dict]:
+    """Search through the mode's backend, serving repeated queries from the cache.
+
+    Entries are keyed on the backend, the canonical query (words and
+    filters) and the page, and are dropped when the corpus version changes.
+    """
+    backend = get_search_backend(mode)
+    cache = get_search_cache()
+    version = get_version(CORPUS_VERSION)
+    key = (backend.name, canonical(query), offset, limit)
+
+    page = cache.get(key, version)
+    if page is None:
+        page = backend.search(query, offset=offset, limit=limit)
+        cache.set(key, page, version)
+    return page
@@ -0,0 +1,444 @@
+"""
+In-memory inverted index for Quran search
+"""
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from flask import current_app
+
+from app.extensions import db
+from app.models import AyahIndex
+from app.utils.arabic import normalize_arabic, word_spans
+from app.utils.mushaf import TOTAL_JUZ, juz_of
+from app.utils.surahs import SURAHS
+from app.utils.versioning import get_version
+from .corpus import CORPUS_VERSION
+from .fuzzy_index import TrigramIndex
+from .search_query import And, Filter, Not, Or, Phrase, Term
+from .suggest_index import PrefixIndex
+
+# Terms with at least this many ayahs keep a precomputed bitset
+BITSET_MIN_POSTINGS = 64
+
+# Set bit positions of every byte value, used to walk bitsets in order
+_BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def to_bitset(ordinals: Iterable[int], size: int) -> int:
+    """Pack ordinals into an int with bit ``i`` set for ordinal ``i``."""
+    bits = bytearray((size + 7) // 8)
+    for ordinal in ordinals:
+        bits[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(bits, "little")
+
+
+def iter_bitset(bits: int) -> Iterator[int]:
+    """Yield the ordinals set in a bitset in ascending order."""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for byte_index, byte in enumerate(data):
+        if byte:
+            base = byte_index << 3
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+def intersect(left: array, right: array) -> array:
+    """Intersect two sorted ordinal arrays."""
+    if len(left) > len(right):
+        left, right = right, left
+
+    result = array("H")
+    lo = 0
+    hi = len(right)
+    for ordinal in left:
+        lo = bisect_left(right, ordinal, lo, hi)
+        if lo == hi:
+            break
+        if right[lo] == ordinal:
+            result.append(ordinal)
+
+    return result
+
+
+def min_span(position_lists: Sequence[Sequence[int]]) -> int:
+    """Return the smallest window (last - first position) holding one position from every list."""
+    heap = [(positions[0], i, 0) for i, positions in enumerate(position_lists)]
+    heapq.heapify(heap)
+    highest = max(positions[0] for positions in position_lists)
+    best = highest - heap[0][0]
+
+    while True:
+        lowest, i, j = heapq.heappop(heap)
+        best = min(best, highest - lowest)
+        if best == 0 or j + 1 == len(position_lists[i]):
+            return best
+
+        following = position_lists[i][j + 1]
+        highest = max(highest, following)
+        heapq.heappush(heap, (following, i, j + 1))
+
+
+class SearchIndex:
+    """Token-level inverted index over every ayah in the corpus.
+
+    Ayahs are addressed by a global ordinal (their position in mushaf order)
+    and each posting list is a sorted ``array('H')`` of ordinals, so a
+    multi-word lookup is an intersection of compact integer arrays. Terms
+    are taken from the normalized text, so queries must be normalized with
+    ``normalize_arabic`` before lookup.
+
+    Word positions are kept next to each posting list: for a term,
+    ``positions[term] = (offsets, values)`` where the positions of its i-th
+    posting are ``values[offsets[i]:offsets[i + 1]]``. Phrase and proximity
+    queries are answered from these arrays alone.
+
+    Boolean queries are evaluated on bitsets (Python ints with one bit per
+    ordinal). Every filter value (surah, juz, page, revelation type) and
+    every common term has a precomputed bitset, so AND/OR/NOT are single
+    integer operations and facet counts are ``(result & mask).bit_count()``.
+
+    Each ayah also keeps the character span of every token in its original
+    vocalized text (``spans[span_offsets[o] + 2 * p]`` and the next value
+    are the start and end of token ``p``), so match highlights are a lookup.
+    """
+
+    __slots__ = (
+        "version", "surah_ids", "ayah_nos", "pages", "texts", "span_offsets", "spans",
+        "postings", "positions", "trigrams", "suggestions",
+        "all_bits", "surah_bits", "juz_bits", "page_bits", "type_bits", "term_bits",
+    )
+
+    def __init__(
+        self,
+        rows: Iterable[Tuple[int, int, str, int, str]],
+        revelation_types: Optional[Dict[int, str]] = None,
+        version: int = 0,
+    ):
+        self.version = version
+        self.surah_ids = array("H")
+        self.ayah_nos = array("H")
+        self.pages = array("H")
+        self.texts: List[str] = []
+        self.span_offsets = array("I")
+        self.spans = array("H")
+
+        surah_ordinals: Dict[int, List[int]] = {}
+        juz_ordinals: Dict[int, List[int]] = {}
+        page_ordinals: Dict[int, List[int]] = {}
+
+        postings: Dict[str, array] = {}
+        positions: Dict[str, Tuple[array, array]] = {}
+        for ordinal, (surah_id, ayah_no, text, page, normalized) in enumerate(sorted(rows)):
+            self.surah_ids.append(surah_id)
+            self.ayah_nos.append(ayah_no)
+            self.pages.append(page)
+            self.texts.append(text)
+
+            self.span_offsets.append(len(self.spans))
+            for span in word_spans(text):
+                self.spans.extend(span)
+
+            surah_ordinals.setdefault(surah_id, []).append(ordinal)
+            juz_ordinals.setdefault(juz_of(surah_id, ayah_no), []).append(ordinal)
+            page_ordinals.setdefault(page, []).append(ordinal)
+
+            # Rows imported before normalization existed are normalized here
+            normalized = normalized or normalize_arabic(text)
+            token_positions: Dict[str, List[int]] = {}
+            for position, token in enumerate(normalized.split()):
+                token_positions.setdefault(token, []).append(position)
+
+            for token, ayah_positions in token_positions.items():
+                posting = postings.get(token)
+                if posting is None:
+                    posting = postings[token] = array("H")
+                    positions[token] = (array("I", [0]), array("H"))
+                posting.append(ordinal)
+
+                offsets, values = positions[token]
+                values.extend(ayah_positions)
+                offsets.append(len(values))
+
+        self.postings = postings
+        self.positions = positions
+        vocabulary = sorted(postings)
+        self.trigrams = TrigramIndex(vocabulary)
+        self.suggestions = PrefixIndex(
+            vocabulary, [len(positions[term][1]) for term in vocabulary]
+        )
+
+        size = len(self.texts)
+        self.all_bits = (1 << size) - 1
+        self.surah_bits = [to_bitset(surah_ordinals.get(s, ()), size) for s in range(1, 115)]
+        self.juz_bits = [to_bitset(juz_ordinals.get(j, ()), size) for j in range(1, TOTAL_JUZ + 1)]
+        self.page_bits = {page: to_bitset(o, size) for page, o in page_ordinals.items()}
+
+        self.type_bits = {"meccan": 0, "medinan": 0}
+        for surah_id, revelation_type in (revelation_types or {}).items():
+            key = revelation_type.lower()
+            if key in self.type_bits and 1 <= surah_id <= 114:
+                self.type_bits[key] |= self.surah_bits[surah_id - 1]
+
+        self.term_bits = {
+            term: to_bitset(posting, size)
+            for term, posting in postings.items()
+            if len(posting) >= BITSET_MIN_POSTINGS
+        }
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def match_all(self, terms: Iterable[str]) -> array:
+        """Return the ordinals of ayahs containing every one of ``terms``."""
+        postings = []
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                return array("H")
+            postings.append(posting)
+
+        if not postings:
+            return array("H")
+
+        postings.sort(key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            result = intersect(result, posting)
+            if not result:
+                break
+
+        return result
+
+    def term_positions(self, term: str, ordinal: int) -> array:
+        """Return the word positions of ``term`` in the ayah at ``ordinal``."""
+        i = bisect_left(self.postings[term], ordinal)
+        offsets, values = self.positions[term]
+        return values[offsets[i]:offsets[i + 1]]
+
+    def match_phrase(self, words: List[str], slop: Optional[int] = None) -> array:
+        """Return the ordinals of ayahs containing ``words`` as a phrase.
+
+        Without ``slop`` the words must be adjacent and in order; with it,
+        one occurrence of each distinct word must fit in a window of
+        ``slop`` words, in any order.
+        """
+        candidates = self.match_all(set(words))
+        result = array("H")
+
+        if slop is None:
+            for ordinal in candidates:
+                starts = set(self.term_positions(words[0], ordinal))
+                for offset, word in enumerate(words[1:], 1):
+                    starts.intersection_update(
+                        position - offset for position in self.term_positions(word, ordinal)
+                    )
+                    if not starts:
+                        break
+                if starts:
+                    result.append(ordinal)
+        else:
+            distinct = list(dict.fromkeys(words))
+            for ordinal in candidates:
+                position_lists = [self.term_positions(word, ordinal) for word in distinct]
+                if min_span(position_lists) <= slop:
+                    result.append(ordinal)
+
+        return result
+
+    def term_bitset(self, term: str) -> int:
+        """Return the bitset of ayahs containing ``term``."""
+        bits = self.term_bits.get(term)
+        if bits is None:
+            bits = to_bitset(self.postings.get(term, ()), len(self.texts))
+        return bits
+
+    def filter_bitset(self, node: Filter) -> int:
+        """Return the precomputed bitset for a structural filter."""
+        if node.field == "type":
+            return self.type_bits.get(node.value, 0)
+
+        low, high = node.value
+        bits = 0
+        if node.field == "surah":
+            for surah_bits in self.surah_bits[low - 1:high]:
+                bits |= surah_bits
+        elif node.field == "juz":
+            for juz_bits in self.juz_bits[low - 1:high]:
+                bits |= juz_bits
+        elif node.field == "page":
+            for page in range(low, high + 1):
+                bits |= self.page_bits.get(page, 0)
+        return bits
+
+    def evaluate(self, node) -> int:
+        """Return the bitset of ayahs matching a parsed query tree."""
+        if isinstance(node, Term):
+            return self.term_bitset(node.word)
+        if isinstance(node, Phrase):
+            return to_bitset(self.match_phrase(node.words, node.slop), len(self.texts))
+        if isinstance(node, Filter):
+            return self.filter_bitset(node)
+        if isinstance(node, Not):
+            return self.all_bits & ~self.evaluate(node.clause)
+        if isinstance(node, And):
+            bits = self.all_bits
+            for clause in node.clauses:
+                bits &= self.evaluate(clause)
+                if not bits:
+                    break
+            return bits
+        if isinstance(node, Or):
+            bits = 0
+            for clause in node.clauses:
+                bits |= self.evaluate(clause)
+            return bits
+
+        raise TypeError(f"Unsupported query node: {type(node).__name__}")
+
+    def facets(self, bits: int) -> dict:
+        """Count matches per surah and per juz from the same bitsets."""
+        surahs = {}
+        for surah_id, surah_bits in enumerate(self.surah_bits, 1):
+            count = (bits & surah_bits).bit_count()
+            if count:
+                surahs[surah_id] = count
+
+        juz = {}
+        for juz_no, juz_bits in enumerate(self.juz_bits, 1):
+            count = (bits & juz_bits).bit_count()
+            if count:
+                juz[juz_no] = count
+
+        return {"surah": surahs, "juz": juz}
+
+    def fuzzy_terms(self, query: str, threshold: float) -> List[List[Tuple[str, float]]]:
+        """Expand each distinct query word to ``(term, similarity)`` vocabulary matches."""
+        return [self.trigrams.similar(word, threshold) for word in dict.fromkeys(query.split())]
+
+    def fuzzy_search(
+        self,
+        query: str,
+        threshold: float,
+        expansions: Optional[List[List[Tuple[str, float]]]] = None,
+    ) -> List[Tuple[int, float]]:
+        """Return ``(ordinal, score)`` pairs for ayahs loosely matching every query word.
+
+        Each word is expanded to the vocabulary terms within ``threshold``
+        trigram similarity (or taken from ``expansions``, as returned by
+        ``fuzzy_terms``); an ayah scores the best similarity it reaches for
+        every word, summed over the words. Results are ordered by score.
+        """
+        if expansions is None:
+            expansions = self.fuzzy_terms(query, threshold)
+
+        scores: Optional[Dict[int, float]] = None
+
+        for matches in expansions:
+            # Apply the weakest matches first so stronger ones overwrite them
+            best: Dict[int, float] = {}
+            for term, similarity in sorted(matches, key=lambda match: match[1]):
+                best.update(dict.fromkeys(self.postings[term], similarity))
+
+            if scores is None:
+                scores = best
+            else:
+                scores = {ordinal: score + best[ordinal] for ordinal, score in scores.items() if ordinal in best}
+
+            if not scores:
+                return []
+
+        if scores is None:
+            return []
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def ordinal(self, surah_id: int, ayah_no: int) -> Optional[int]:
+        """Return the ordinal of an ayah, or ``None`` if it is not indexed."""
+        ordinal = bisect_left(self.surah_ids, surah_id) + ayah_no - 1
+        if (
+            0 <= ordinal < len(self.texts)
+            and self.surah_ids[ordinal] == surah_id
+            and self.ayah_nos[ordinal] == ayah_no
+        ):
+            return ordinal
+        return None
+
+    def highlights(self, ordinal: int, terms: Iterable[str]) -> List[List[int]]:
+        """Return ``[start, end)`` character ranges of ``terms`` in the ayah's original text."""
+        start = self.span_offsets[ordinal]
+        end = self.span_offsets[ordinal + 1] if ordinal + 1 < len(self.span_offsets) else len(self.spans)
+
+        token_positions = set()
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            i = bisect_left(posting, ordinal)
+            if i < len(posting) and posting[i] == ordinal:
+                offsets, values = self.positions[term]
+                token_positions.update(values[offsets[i]:offsets[i + 1]])
+
+        ranges = []
+        for position in sorted(token_positions):
+            offset = start + 2 * position
+            if offset < end:
+                ranges.append([self.spans[offset], self.spans[offset + 1]])
+        return ranges
+
+    def to_dict(self, ordinal: int) -> dict:
+        """Convert an ayah to the same dictionary as ``AyahIndex.to_dict``."""
+        return {
+            "surah_id": self.surah_ids[ordinal],
+            "ayah_no": self.ayah_nos[ordinal],
+            "text_plain": self.texts[ordinal],
+            "page": self.pages[ordinal],
+        }
+
+
+_index: Optional[SearchIndex] = None
+_lock = threading.Lock()
+
+
+def build_search_index(version: int = 0) -> SearchIndex:
+    """Build a fresh index from the ``ayah_index`` table and the static surah metadata."""
+    rows = db.session.query(
+        AyahIndex.surah_id,
+        AyahIndex.ayah_no,
+        AyahIndex.text_plain,
+        AyahIndex.page,
+        AyahIndex.text_normalized,
+    ).all()
+    revelation_types = {surah.id: surah.revelation_type for surah in SURAHS}
+
+    index = SearchIndex(rows, revelation_types=revelation_types, version=version)
+    current_app.logger.info(
+        f"Search index built: {len(index)} ayahs, {len(index.postings)} terms"
+    )
+    return index
+
+
+def get_search_index() -> SearchIndex:
+    """Get the process-wide search index, rebuilding it if the corpus changed."""
+    global _index
+
+    version = get_version(CORPUS_VERSION)
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _lock:
+        if _index is None or _index.version != version:
+            _index = build_search_index(version)
+        return _index
+
+
+def warm_search_index(app) -> None:
+    """Build the search index at startup so the first request does not pay for it."""
+    with app.app_context():
+        try:
+            get_search_index()
+        except Exception as e:
+            app.logger.warning(f"Search index warm-up skipped: {str(e)}")
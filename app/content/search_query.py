@@ -0,0 +1,300 @@
+"""
+Query parsing for /content/search
+"""
+import re
+from typing import List, Optional, Tuple, Union
+
+from app.utils.arabic import normalize_arabic
+from app.utils.mushaf import TOTAL_JUZ
+
+
+class QueryError(ValueError):
+    """Raised for search strings that cannot be parsed."""
+
+
+class Term:
+    """A single normalized word."""
+
+    __slots__ = ("word",)
+
+    def __init__(self, word: str):
+        self.word = word
+
+    def terms(self) -> List[str]:
+        return [self.word]
+
+
+class Phrase:
+    """Words that must appear in order, or within ``slop`` words of each other."""
+
+    __slots__ = ("words", "slop")
+
+    def __init__(self, words: List[str], slop: Optional[int] = None):
+        self.words = words
+        self.slop = slop
+
+    def terms(self) -> List[str]:
+        return list(self.words)
+
+
+class And:
+    """Clauses that must all match."""
+
+    __slots__ = ("clauses",)
+
+    def __init__(self, clauses: list):
+        self.clauses = clauses
+
+    def terms(self) -> List[str]:
+        return [word for clause in self.clauses for word in clause.terms()]
+
+
+class Or:
+    """Clauses of which at least one must match."""
+
+    __slots__ = ("clauses",)
+
+    def __init__(self, clauses: list):
+        self.clauses = clauses
+
+    def terms(self) -> List[str]:
+        return [word for clause in self.clauses for word in clause.terms()]
+
+
+class Not:
+    """A clause that must not match."""
+
+    __slots__ = ("clause",)
+
+    def __init__(self, clause):
+        self.clause = clause
+
+    def terms(self) -> List[str]:
+        return []
+
+
+class Filter:
+    """A structural filter such as ``surah:2``, ``page:10-20`` or ``type:meccan``.
+
+    ``value`` is an inclusive ``(low, high)`` range for numeric fields and
+    ``"meccan"``/``"medinan"`` for ``type``.
+    """
+
+    __slots__ = ("field", "value")
+
+    def __init__(self, field: str, value: Union[Tuple[int, int], str]):
+        self.field = field
+        self.value = value
+
+    def terms(self) -> List[str]:
+        return []
+
+
+# Upper bound of each numeric filter
+FILTER_LIMITS = {
+    "surah": 114,
+    "juz": TOTAL_JUZ,
+    "page": 604,
+}
+
+REVELATION_TYPES = {
+    "meccan": "meccan",
+    "makki": "meccan",
+    "مكية": "meccan",
+    "medinan": "medinan",
+    "madani": "medinan",
+    "مدنية": "medinan",
+}
+
+# Longest query string accepted, and deepest nesting of parentheses/NOT
+MAX_QUERY_LENGTH = 1000
+MAX_NESTING = 32
+
+# Parentheses, optionally negated "phrases"~N, or anything else up to a space
+_TOKEN = re.compile(r'[()]|-?"[^"]*"?(?:~\d+)?|[^\s()"]+')
+_PHRASE = re.compile(r'(-?)"([^"]*)"?(?:~(\d+))?$')
+_RANGE = re.compile(r"(\d+)(?:-(\d+))?$")
+
+
+def _parse_filter(field: str, value: str) -> Filter:
+    if field == "type":
+        revelation_type = REVELATION_TYPES.get(value.lower())
+        if revelation_type is None:
+            raise QueryError("Invalid type filter. Must be 'meccan' or 'medinan'")
+        return Filter(field, revelation_type)
+
+    match = _RANGE.match(value)
+    if not match:
+        raise QueryError(f"Invalid {field} filter. Use {field}:N or {field}:N-M")
+
+    low = int(match.group(1))
+    high = int(match.group(2) or low)
+    limit = FILTER_LIMITS[field]
+    if not 1 <= low <= high <= limit:
+        raise QueryError(f"Invalid {field} filter. Must be between 1 and {limit}")
+
+    return Filter(field, (low, high))
+
+
+class _Parser:
+    """Recursive descent parser; OR binds looser than (implicit) AND, NOT binds tightest."""
+
+    def __init__(self, query: str):
+        self.tokens = _TOKEN.findall(query)
+        self.pos = 0
+        self.depth = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def next(self) -> str:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self.parse_or()
+        while self.peek() is not None:
+            # Stray closing parentheses are ignored
+            self.next()
+            node = _combine(And, [node, self.parse_or()])
+        return node
+
+    def parse_or(self):
+        clauses = [self.parse_and()]
+        while self.peek() == "OR":
+            self.next()
+            clauses.append(self.parse_and())
+        return _combine(Or, clauses)
+
+    def parse_and(self):
+        clauses = []
+        while True:
+            token = self.peek()
+            if token is None or token in (")", "OR"):
+                break
+            if token == "AND":
+                self.next()
+                continue
+            clauses.append(self.parse_unary())
+        return _combine(And, clauses)
+
+    def nested(self, parse):
+        """Run ``parse`` one nesting level deeper, bounding the recursion."""
+        if self.depth >= MAX_NESTING:
+            raise QueryError(f"Query is nested too deeply (at most {MAX_NESTING} levels)")
+        self.depth += 1
+        try:
+            return parse()
+        finally:
+            self.depth -= 1
+
+    def parse_unary(self):
+        if self.peek() == "NOT":
+            self.next()
+            if self.peek() in (None, ")", "OR"):
+                return None
+            clause = self.nested(self.parse_unary)
+            return Not(clause) if clause is not None else None
+        return self.parse_primary()
+
+    def parse_primary(self):
+        token = self.next()
+
+        if token == "(":
+            node = self.nested(self.parse_or)
+            if self.peek() == ")":
+                self.next()
+            return node
+
+        match = _PHRASE.match(token)
+        if match:
+            negated, phrase, slop = match.groups()
+            words = normalize_arabic(phrase).split()
+            if len(words) > 1:
+                node = Phrase(words, int(slop) if slop is not None else None)
+            elif words:
+                node = Term(words[0])
+            else:
+                return None
+            return Not(node) if negated else node
+
+        field, separator, value = token.partition(":")
+        if separator and field.lower() in (*FILTER_LIMITS, "type"):
+            return _parse_filter(field.lower(), value)
+
+        negated = token.startswith("-") and len(token) > 1
+        words = normalize_arabic(token[1:] if negated else token).split()
+        if not words:
+            return None
+        node = Term(words[0])
+        return Not(node) if negated else node
+
+
+def _combine(node_class, clauses: list):
+    clauses = [clause for clause in clauses if clause is not None]
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return node_class(clauses)
+
+
+def parse_query(query: str):
+    """Parse a raw search string into a query tree of normalized words.
+
+    Words are required by default (implicit AND) and can be combined with
+    ``AND``, ``OR``, ``NOT`` (or a leading ``-``) and parentheses. Quoted
+    text is an exact phrase and ``"..."~N`` matches the words in any order
+    within a span of N words. ``surah:N``, ``juz:N``, ``page:N`` (each also
+    as a ``N-M`` range) and ``type:meccan|medinan`` restrict the results.
+
+    Returns ``None`` when nothing searchable is left after normalization and
+    raises ``QueryError`` for invalid filters and for queries longer than
+    ``MAX_QUERY_LENGTH`` or nested deeper than ``MAX_NESTING``.
+    """
+    if len(query) > MAX_QUERY_LENGTH:
+        raise QueryError(f"Query is too long (at most {MAX_QUERY_LENGTH} characters)")
+    return _Parser(query).parse()
+
+
+def split_filters(node) -> Tuple[object, List[Filter]]:
+    """Separate top-level filters from the text part of a query tree.
+
+    Returns ``(text_node, filters)`` where ``text_node`` is ``None`` for a
+    filter-only query. Filters nested inside OR/NOT stay in ``text_node``.
+    """
+    if isinstance(node, Filter):
+        return None, [node]
+    if isinstance(node, And):
+        filters = [clause for clause in node.clauses if isinstance(clause, Filter)]
+        if filters:
+            rest = [clause for clause in node.clauses if not isinstance(clause, Filter)]
+            return _combine(And, rest), filters
+    return node, []
+
+
+def canonical(node) -> str:
+    """Render a query tree as a canonical string, used as a cache key.
+
+    Queries that differ only in diacritics, spacing or operator spelling
+    (``-x`` vs ``NOT x``) render the same.
+    """
+    if isinstance(node, Term):
+        return node.word
+    if isinstance(node, Phrase):
+        phrase = '"{}"'.format(" ".join(node.words))
+        return phrase if node.slop is None else f"{phrase}~{node.slop}"
+    if isinstance(node, Filter):
+        if node.field == "type":
+            return f"type:{node.value}"
+        low, high = node.value
+        return f"{node.field}:{low}-{high}"
+    if isinstance(node, Not):
+        return f"NOT {canonical(node.clause)}"
+    if isinstance(node, And):
+        return "(" + " AND ".join(canonical(clause) for clause in node.clauses) + ")"
+    if isinstance(node, Or):
+        return "(" + " OR ".join(canonical(clause) for clause in node.clauses) + ")"
+
+    raise TypeError(f"Unsupported query node: {type(node).__name__}")
@@ -0,0 +1,305 @@
+"""
+Prebuilt SQLite snapshot of the static content tables
+"""
+import json
+import os
+import shutil
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import Table, create_engine, inspect, select, text
+
+from app.extensions import db
+from app.models import AyahIndex, Reciter, Surah, Translation, TranslationAyah
+from app.utils.bulk_load import DEFAULT_BATCH_SIZE, batched, upsert
+from app.utils.import_manifest import ImportManifest, content_hash, stored_hashes
+from app.utils.versioning import bump_version
+from .corpus import CORPUS_VERSION, refresh_corpus_file
+from .reciters import RECITERS_VERSION
+from .search_backends import SQLiteFTSBackend, sync_fulltext_index
+
+
+# Stored in PRAGMA user_version; bumped when the snapshot layout changes
+SNAPSHOT_FORMAT = 1
+
+META_TABLE = "snapshot_meta"
+
+
+def content_tables() -> Tuple[Table, ...]:
+    """Tables shipped in a snapshot, parents before children."""
+    return (
+        Surah.__table__,
+        Reciter.__table__,
+        Translation.__table__,
+        AyahIndex.__table__,
+        TranslationAyah.__table__,
+    )
+
+
+def _replaced_tables() -> Tuple[Table, ...]:
+    """Content tables replaced wholesale on load (nothing outside them refers to their rows)."""
+    return tuple(table for table in content_tables() if table is not Reciter.__table__)
+
+
+def _reciter_columns() -> Tuple[str, ...]:
+    """Reciter columns copied on load; ids are left to the target database."""
+    return tuple(column.name for column in Reciter.__table__.columns if column.name != "id")
+
+
+def snapshot_path() -> str:
+    """Return the path of the content snapshot in the instance folder."""
+    return os.path.join(current_app.instance_path, current_app.config.get("CONTENT_SNAPSHOT_FILE", "content_snapshot.db"))
+
+
+def _revision(conn) -> Optional[str]:
+    """Return the Alembic revision of a database, or ``None`` if it is not stamped."""
+    if not inspect(conn).has_table("alembic_version"):
+        return None
+    return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def _manifest_sections(conn) -> Dict[str, Dict[str, str]]:
+    """Compute import manifest hashes from the rows of the snapshot.
+
+    The hashes match the ones ``scripts/import_quran.py`` and
+    ``scripts/create_surahs.py`` compute from their input, so an import
+    after a bootstrap only writes what differs from the snapshot. Reciters
+    are only recorded if the importer owns them; translation hashes cover
+    the source files, so they are carried over from the current manifest.
+    """
+    manifest = ImportManifest.load()
+    imported = manifest.sections.get("reciters", {})
+    sections = {
+        "surahs": stored_hashes(conn, Surah.__table__, "id"),
+        "ayah_index": stored_hashes(conn, AyahIndex.__table__, "surah_id"),
+        "reciters": {
+            code: digest
+            for code, digest in stored_hashes(conn, Reciter.__table__, "code", exclude=("id",)).items()
+            if code in imported
+        },
+        "translations": {},
+    }
+
+    for code in conn.execute(select(Translation.__table__.c.code)).scalars():
+        digest = manifest.get("translations", code)
+        if digest:
+            sections["translations"][code] = digest
+
+    return sections
+
+
+def build_snapshot(output: Optional[str] = None) -> dict:
+    """Write the content tables of the current database to a SQLite snapshot.
+
+    The snapshot holds the full schema (created from the models and stamped
+    with the database's Alembic revision), the surahs, reciters, ayahs and
+    translations, the FTS5 search table already populated, and a
+    ``snapshot_meta`` table with the format, revision, row counts and
+    content hash. It is written to a temporary file and moved into place,
+    so readers never see a partial snapshot. Returns the metadata.
+    """
+    output = output or snapshot_path()
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    tmp_path = f"{output}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    engine = create_engine(f"sqlite:///{tmp_path}")
+    try:
+        db.metadata.create_all(engine)
+
+        with db.engine.connect() as source, engine.begin() as target:
+            revision = _revision(source)
+            if revision is None:
+                raise ValueError("The database is not migrated; run 'flask db upgrade' first")
+
+            counts = {}
+            for table in content_tables():
+                rows = source.execute(select(table).order_by(*table.primary_key.columns)).mappings()
+                counts[table.name] = 0
+                for batch in batched((dict(row) for row in rows), DEFAULT_BATCH_SIZE):
+                    target.execute(table.insert(), batch)
+                    counts[table.name] += len(batch)
+            if not counts[AyahIndex.__tablename__]:
+                raise ValueError("No ayahs in the database; run scripts/import_quran.py first")
+
+            fts = SQLiteFTSBackend.table
+            target.exec_driver_sql(SQLiteFTSBackend.create_sql)
+            target.exec_driver_sql(
+                f"INSERT INTO {fts} (text_normalized, surah_id, ayah_no) "
+                "SELECT text_normalized, surah_id, ayah_no FROM ayah_index"
+            )
+            target.exec_driver_sql(f"INSERT INTO {fts} ({fts}) VALUES ('optimize')")
+
+            target.exec_driver_sql(
+                "CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)"
+            )
+            target.execute(text("INSERT INTO alembic_version (version_num) VALUES (:revision)"), {"revision": revision})
+
+            manifest = _manifest_sections(target)
+            meta = {
+                "format": SNAPSHOT_FORMAT,
+                "revision": revision,
+                "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "counts": counts,
+                "content_hash": content_hash([manifest]),
+                "manifest": manifest,
+            }
+            target.exec_driver_sql(f"CREATE TABLE {META_TABLE} (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            target.execute(
+                text(f"INSERT INTO {META_TABLE} (key, value) VALUES (:key, :value)"),
+                [{"key": key, "value": json.dumps(value, ensure_ascii=False)} for key, value in meta.items()],
+            )
+            target.exec_driver_sql(f"PRAGMA user_version = {SNAPSHOT_FORMAT}")
+
+        with engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+    finally:
+        engine.dispose()
+
+    os.replace(tmp_path, output)
+    return meta
+
+
+def read_snapshot_meta(path: Optional[str] = None) -> dict:
+    """Read the metadata of a snapshot, checking its format."""
+    path = path or snapshot_path()
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format {version} (expected {SNAPSHOT_FORMAT})")
+        return {key: json.loads(value) for key, value in conn.execute(f"SELECT key, value FROM {META_TABLE}")}
+    except sqlite3.DatabaseError as e:
+        raise ValueError(f"Invalid content snapshot {path}: {str(e)}") from e
+    finally:
+        conn.close()
+
+
+def load_snapshot(path: Optional[str] = None) -> str:
+    """Load the content tables of the current database from a snapshot.
+
+    An SQLite database file that does not exist yet (or has no tables) is
+    replaced by a copy of the snapshot, which already holds the schema and
+    the search index. An existing SQLite database must be at the snapshot's
+    revision; the snapshot is attached and its tables copied in one
+    transaction. Other databases receive the rows through batched inserts,
+    also in one transaction. Either way surahs, ayahs and translations are
+    replaced wholesale, while reciters are upserted on their code so the
+    ones added through the admin API (and the settings and downloads that
+    point at them) keep their ids. Returns the method used: ``"copy"``,
+    ``"attach"`` or ``"rows"``.
+    """
+    path = path or snapshot_path()
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Content snapshot not found: {path}")
+    meta = read_snapshot_meta(path)
+
+    if db.engine.dialect.name == "sqlite":
+        method = _load_sqlite(path, meta)
+    else:
+        _load_rows(path)
+        method = "rows"
+
+    if method != "copy":
+        sync_fulltext_index()
+
+    # The replaced tables now hold exactly the snapshot's rows; reciters
+    # the snapshot does not know keep their entries
+    manifest = ImportManifest.load()
+    for section, digests in meta["manifest"].items():
+        if section != "reciters":
+            for key in manifest.keys(section):
+                if key not in digests:
+                    manifest.discard(section, key)
+        for key, digest in digests.items():
+            manifest.set(section, key, digest)
+    manifest.save()
+
+    refresh_corpus_file(bump_version(CORPUS_VERSION))
+    bump_version(RECITERS_VERSION)
+    current_app.logger.info(f"Content snapshot {meta['content_hash'][:12]} loaded ({method})")
+    return method
+
+
+def _load_sqlite(path: str, meta: dict) -> str:
+    database = db.engine.url.database
+    in_memory = not database or database == ":memory:"
+
+    if not inspect(db.engine).get_table_names():
+        if not in_memory:
+            db.engine.dispose()
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(database + suffix):
+                    os.remove(database + suffix)
+            tmp_path = f"{database}.tmp"
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, database)
+            return "copy"
+        db.metadata.create_all(db.engine)
+
+    with db.engine.connect() as conn:
+        revision = _revision(conn)
+        if revision is not None and revision != meta["revision"]:
+            raise ValueError(
+                f"Database revision {revision} does not match the snapshot ({meta['revision']}); "
+                "run 'flask db upgrade' or rebuild the snapshot"
+            )
+        conn.commit()
+
+        # ATTACH is not allowed inside a transaction
+        conn.exec_driver_sql("ATTACH DATABASE ? AS snapshot", (path,))
+        conn.commit()
+        try:
+            with conn.begin():
+                for table in reversed(_replaced_tables()):
+                    conn.exec_driver_sql(f"DELETE FROM main.{table.name}")
+                for table in _replaced_tables():
+                    columns = ", ".join(column.name for column in table.columns)
+                    conn.exec_driver_sql(
+                        f"INSERT INTO main.{table.name} ({columns}) SELECT {columns} FROM snapshot.{table.name}"
+                    )
+
+                # Reciters are matched on their code; existing rows keep their id
+                columns = _reciter_columns()
+                updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != "code")
+                conn.exec_driver_sql(
+                    f"INSERT INTO main.reciters ({', '.join(columns)}) "
+                    f"SELECT {', '.join(columns)} FROM snapshot.reciters WHERE true "
+                    f"ON CONFLICT (code) DO UPDATE SET {updates}"
+                )
+        finally:
+            conn.exec_driver_sql("DETACH DATABASE snapshot")
+            conn.commit()
+    return "attach"
+
+
+def _load_rows(path: str) -> None:
+    source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    source.row_factory = sqlite3.Row
+
+    def rows(table: Table, columns):
+        cursor = source.execute(f"SELECT {', '.join(columns)} FROM {table.name}")
+        return batched((dict(row) for row in cursor), DEFAULT_BATCH_SIZE)
+
+    try:
+        with db.engine.begin() as conn:
+            for table in reversed(_replaced_tables()):
+                conn.execute(table.delete())
+            for table in _replaced_tables():
+                for batch in rows(table, [column.name for column in table.columns]):
+                    conn.execute(table.insert(), batch)
+
+            for batch in rows(Reciter.__table__, _reciter_columns()):
+                upsert(conn, Reciter.__table__, batch, ("code",))
+
+            if conn.dialect.name == "postgresql":
+                # Explicit ids do not advance the translations sequence
+                conn.execute(text(
+                    "SELECT setval(pg_get_serial_sequence('translations', 'id'), MAX(id)) "
+                    "FROM translations HAVING MAX(id) IS NOT NULL"
+                ))
+    finally:
+        source.close()
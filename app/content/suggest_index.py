@@ -0,0 +1,71 @@
+"""
+Prefix index for search-box autocomplete
+"""
+import heapq
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+# Upper bound for the number of completions returned per prefix
+MAX_SUGGESTIONS = 20
+
+# Prefixes covering more terms than this get their top completions precomputed
+PRECOMPUTE_MIN_TERMS = 128
+
+# Sorts after every character, so ``prefix + _MAX_CHAR`` bounds a prefix range
+_MAX_CHAR = chr(0x10FFFF)
+
+
+class PrefixIndex:
+    """Sorted vocabulary with frequencies, answering top-k prefix completions.
+
+    The terms of a prefix form a contiguous range of the sorted vocabulary
+    found with two binary searches; the range is then ranked by frequency.
+    Broad prefixes (a letter, or the article "ال") cover thousands of terms,
+    so their best ``MAX_SUGGESTIONS`` are precomputed at build time and every
+    lookup ranks at most ``PRECOMPUTE_MIN_TERMS`` terms.
+    """
+
+    __slots__ = ("terms", "counts", "top")
+
+    def __init__(self, terms: List[str], counts: List[int]):
+        self.terms = terms
+        self.counts = array("I", counts)
+
+        top: Dict[str, array] = {}
+        prefixes = sorted({term[:1] for term in terms if term})
+        length = 1
+        while prefixes:
+            broad = []
+            for prefix in prefixes:
+                low, high = self.range(prefix)
+                if high - low > PRECOMPUTE_MIN_TERMS:
+                    top[prefix] = array("I", self._rank(low, high, MAX_SUGGESTIONS))
+                    broad.append(prefix)
+            length += 1
+            prefixes = sorted({
+                self.terms[i][:length]
+                for prefix in broad
+                for i in range(*self.range(prefix))
+                if len(self.terms[i]) >= length
+            })
+
+        self.top = top
+
+    def range(self, prefix: str) -> Tuple[int, int]:
+        """Return the ``[low, high)`` range of terms starting with ``prefix``."""
+        low = bisect_left(self.terms, prefix)
+        high = bisect_left(self.terms, prefix + _MAX_CHAR, low)
+        return low, high
+
+    def _rank(self, low: int, high: int, limit: int) -> List[int]:
+        counts = self.counts
+        return heapq.nsmallest(limit, range(low, high), key=lambda i: (-counts[i], i))
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Return up to ``limit`` ``(term, frequency)`` completions, most frequent first."""
+        limit = min(limit, MAX_SUGGESTIONS)
+        ranked = self.top.get(prefix)
+        if ranked is None:
+            ranked = self._rank(*self.range(prefix), limit)
+        return [(self.terms[i], self.counts[i]) for i in ranked[:limit]]
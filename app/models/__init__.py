@@ -1,5 +1,5 @@
 from .user import User, UserSettings
-from .quran import Reciter, AyahIndex, Surah
+from .quran import Reciter, AyahIndex, Surah, Translation, TranslationAyah, ImportDigest
 from .progress import Progress, ReviewQueue
 from .playlists import Playlist, PlaylistItem
 from .downloads import Download
@@ -10,6 +10,9 @@ __all__ = [
     "Reciter",
     "AyahIndex",
     "Surah",
+    "Translation",
+    "TranslationAyah",
+    "ImportDigest",
     "Progress",
     "ReviewQueue",
     "Playlist",
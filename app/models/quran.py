@@ -70,7 +70,8 @@ class AyahIndex(db.Model):
     
     surah_id = Column(Integer, ForeignKey('surahs.id'), primary_key=True)
     ayah_no = Column(Integer, primary_key=True)
-    text_plain = Column(Text, nullable=False)  # Text without diacritics
+    text_plain = Column(Text, nullable=False)  # Uthmani text as imported
+    text_normalized = Column(Text, nullable=False, default="", server_default="")  # Normalized text for search
     page = Column(Integer, nullable=False)
     
     # Relationships
@@ -86,4 +87,71 @@ class AyahIndex(db.Model):
             "ayah_no": self.ayah_no,
             "text_plain": self.text_plain,
             "page": self.page,
-        } 
\ No newline at end of file
+        } 
+
+class Translation(db.Model):
+    """Translation or tafsir dataset."""
+    
+    __tablename__ = "translations"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    code = Column(String(50), unique=True, nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+    language = Column(String(10), nullable=False)
+    kind = Column(String(20), nullable=False, default="translation")  # translation or tafsir
+    
+    # Relationships
+    ayahs = relationship("TranslationAyah", back_populates="translation", lazy="dynamic")
+    
+    def __repr__(self):
+        return f"<Translation(id={self.id}, code='{self.code}')>"
+    
+    def to_dict(self) -> dict:
+        """Convert translation to dictionary for API responses."""
+        return {
+            "id": self.id,
+            "code": self.code,
+            "name": self.name,
+            "language": self.language,
+            "kind": self.kind,
+        }
+
+
+class TranslationAyah(db.Model):
+    """Text of one ayah in a translation or tafsir."""
+    
+    __tablename__ = "translation_ayahs"
+    
+    translation_id = Column(Integer, ForeignKey('translations.id'), primary_key=True)
+    surah_id = Column(Integer, ForeignKey('surahs.id'), primary_key=True)
+    ayah_no = Column(Integer, primary_key=True)
+    text = Column(Text, nullable=False)
+    text_normalized = Column(Text, nullable=False, default="")  # Normalized search tokens
+    
+    # Relationships
+    translation = relationship("Translation", back_populates="ayahs")
+    
+    def __repr__(self):
+        return f"<TranslationAyah(translation_id={self.translation_id}, surah_id={self.surah_id}, ayah_no={self.ayah_no})>"
+    
+    def to_dict(self) -> dict:
+        """Convert translated ayah to dictionary for API responses."""
+        return {
+            "translation_id": self.translation_id,
+            "surah_id": self.surah_id,
+            "ayah_no": self.ayah_no,
+            "text": self.text,
+        }
+
+
+class ImportDigest(db.Model):
+    """Content hash of a group of imported rows (import manifest entry)."""
+    
+    __tablename__ = "import_manifest"
+    
+    section = Column(String(50), primary_key=True)  # Table the rows belong to
+    key = Column(String(255), primary_key=True)  # Surah id, reciter code, dataset code...
+    digest = Column(String(64), nullable=False)  # SHA-256 of the rows
+    
+    def __repr__(self):
+        return f"<ImportDigest(section='{self.section}', key='{self.key}')>"
@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db, limiter
 from app.models import Playlist, PlaylistItem, User
 from marshmallow import ValidationError
+from app.utils.surahs import range_error
 import math
 
 # Create blueprint
@@ -174,12 +175,10 @@ def add_playlist_item(playlist_id):
             if field not in data:
                 return {"error": f"Field '{field}' is required"}, 400
         
-        # Validate surah and ayah numbers
-        if not (1 <= data["from_surah"] <= 114 and 1 <= data["to_surah"] <= 114):
-            return {"error": "Invalid surah ID. Must be between 1 and 114"}, 400
-        
-        if data["from_ayah"] < 1 or data["to_ayah"] < 1:
-            return {"error": "Invalid ayah number. Must be greater than 0"}, 400
+        # Validate surah and ayah numbers against the static surah table
+        error = range_error(data["from_surah"], data["from_ayah"], data["to_surah"], data["to_ayah"])
+        if error:
+            return {"error": error}, 400
         
         # Get next position
         max_position = db.session.query(db.func.max(PlaylistItem.position)).filter_by(
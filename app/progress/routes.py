@@ -4,6 +4,8 @@ from app.extensions import db, limiter
 from app.models import Progress, User, AyahIndex
 from app.schemas.progress import ProgressSchema, ProgressUpdateSchema
 from marshmallow import ValidationError
+from app.utils.mushaf import TOTAL_AYAHS
+from app.utils.surahs import ayah_error, surah_error
 import math
 from datetime import datetime
 
@@ -22,6 +24,11 @@ def get_user_progress():
         status_filter = request.args.get("status")
         surah_filter = request.args.get("surah_id", type=int)
         
+        if surah_filter is not None:
+            error = surah_error(surah_filter)
+            if error:
+                return {"error": error}, 400
+        
         query = Progress.query.filter_by(user_id=current_user_id)
         
         # Apply filters
@@ -71,6 +78,10 @@ def create_progress():
         schema = ProgressUpdateSchema()
         validated_data = schema.load(data)
         
+        error = ayah_error(validated_data["surah_id"], validated_data["ayah_no"])
+        if error:
+            return {"error": error}, 400
+        
         # Check if progress already exists
         existing_progress = Progress.query.filter_by(
             user_id=current_user_id,
@@ -135,11 +146,9 @@ def get_ayah_progress(surah_id, ayah_no):
     try:
         current_user_id = get_jwt_identity()
         
-        if surah_id < 1 or surah_id > 114:
-            return {"error": "Invalid surah ID. Must be between 1 and 114"}, 400
-        
-        if ayah_no < 1:
-            return {"error": "Invalid ayah number. Must be greater than 0"}, 400
+        error = ayah_error(surah_id, ayah_no)
+        if error:
+            return {"error": error}, 400
         
         progress = Progress.query.filter_by(
             user_id=current_user_id,
@@ -166,11 +175,9 @@ def update_ayah_progress(surah_id, ayah_no):
         current_user_id = get_jwt_identity()
         data = request.get_json()
         
-        if surah_id < 1 or surah_id > 114:
-            return {"error": "Invalid surah ID. Must be between 1 and 114"}, 400
-        
-        if ayah_no < 1:
-            return {"error": "Invalid ayah number. Must be greater than 0"}, 400
+        error = ayah_error(surah_id, ayah_no)
+        if error:
+            return {"error": error}, 400
         
         progress = Progress.query.filter_by(
             user_id=current_user_id,
@@ -216,11 +223,9 @@ def delete_ayah_progress(surah_id, ayah_no):
     try:
         current_user_id = get_jwt_identity()
         
-        if surah_id < 1 or surah_id > 114:
-            return {"error": "Invalid surah ID. Must be between 1 and 114"}, 400
-        
-        if ayah_no < 1:
-            return {"error": "Invalid ayah number. Must be greater than 0"}, 400
+        error = ayah_error(surah_id, ayah_no)
+        if error:
+            return {"error": error}, 400
         
         progress = Progress.query.filter_by(
             user_id=current_user_id,
@@ -249,8 +254,9 @@ def get_surah_progress(surah_id):
     try:
         current_user_id = get_jwt_identity()
         
-        if surah_id < 1 or surah_id > 114:
-            return {"error": "Invalid surah ID. Must be between 1 and 114"}, 400
+        error = surah_error(surah_id)
+        if error:
+            return {"error": error}, 400
         
         # Get all progress items for this surah
         progress_items = Progress.query.filter_by(
@@ -312,8 +318,8 @@ def get_progress_summary():
             status="not_started"
         ).count()
         
-        # Calculate completion percentage (total Quran has 6236 ayahs)
-        total_quran_ayahs = 6236
+        # Calculate completion percentage
+        total_quran_ayahs = TOTAL_AYAHS
         overall_completion = (completed_ayahs / total_quran_ayahs * 100) if total_quran_ayahs > 0 else 0
         
         # Get recent activity
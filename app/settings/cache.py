@@ -0,0 +1,63 @@
+"""
+Process-local cache of user settings
+"""
+import zlib
+from typing import Optional
+
+from flask import current_app
+
+from app.models import UserSettings
+from app.utils.cache import LRUCache
+from app.utils.versioning import bump_version, get_version
+
+
+# Users are hashed into a fixed number of stamps
+# (instance/user-settings/<bucket>.version), so the folder stays bounded
+# however many users there are. A write bumps its user's bucket and only
+# invalidates the users sharing it in the other workers
+USER_SETTINGS_STAMPS = "user-settings"
+
+_settings_cache: Optional[LRUCache] = None
+
+
+def _stamp_name(user_id) -> str:
+    # crc32 rather than hash(), which differs between processes
+    buckets = max(current_app.config.get("USER_SETTINGS_STAMP_BUCKETS", 256), 1)
+    bucket = zlib.crc32(str(user_id).encode("utf-8")) % buckets
+    return f"{USER_SETTINGS_STAMPS}/{bucket}"
+
+
+def get_settings_cache() -> LRUCache:
+    """Get the process-local cache of user settings, keyed by user id."""
+    global _settings_cache
+    if _settings_cache is None:
+        _settings_cache = LRUCache(
+            maxsize=current_app.config.get("USER_SETTINGS_CACHE_SIZE", 4096),
+            ttl=current_app.config.get("USER_SETTINGS_CACHE_TTL", 600),
+        )
+    return _settings_cache
+
+
+def get_cached_settings(user_id: str) -> Optional[dict]:
+    """Return a user's settings as a dictionary, or ``None`` if they have none.
+
+    Entries are stored with the user's stamp at the time they were read and
+    reloaded when the stamp moved. Users without settings are cached too
+    (as an empty dictionary), so repeated lookups for them do not reach the
+    database either.
+    """
+    cache = get_settings_cache()
+    version = get_version(_stamp_name(user_id))
+
+    entry = cache.get(user_id)
+    if entry is None or entry[0] != version:
+        row = UserSettings.query.filter_by(user_id=user_id).first()
+        entry = (version, row.to_dict() if row else {})
+        cache.set(user_id, entry)
+    return entry[1] or None
+
+
+def store_settings(user_id: str, settings: UserSettings) -> None:
+    """Write updated settings through to the cache after they were committed."""
+    version = bump_version(_stamp_name(user_id))
+    get_settings_cache().set(user_id, (version, settings.to_dict()))
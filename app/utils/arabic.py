@@ -0,0 +1,121 @@
+"""
+Arabic text normalization for Quran search
+"""
+import re
+from typing import List, Tuple
+
+# Harakat, tanween, shadda, sukun, maddah and the combining hamzas
+_TASHKEEL = [chr(c) for c in range(0x064B, 0x0660)]
+
+_DAGGER_ALEF = "ٰ"
+_SMALL_YEH = "ۧ"
+_SMALL_NOON = "ۨ"
+
+# Tatweel, Quranic annotation signs, waqf marks, the small waw and the open
+# tanween forms. The dagger alef, small yeh and small noon stand for letters
+# and are mapped instead (see _SPELLED_LETTERS)
+_QURANIC_MARKS = (
+    ["ـ"]
+    + [chr(c) for c in range(0x06D6, 0x06EE) if chr(c) not in (_SMALL_YEH, _SMALL_NOON)]
+    + [chr(c) for c in range(0x08F0, 0x08F4)]
+)
+
+# Standalone hamza is written on a seat (or not at all) in plain spelling,
+# so it is dropped on both sides of the comparison
+_STANDALONE_HAMZA = ["ء"]
+
+# Stems spelled without the long alef in plain Arabic as well: ذلك, هذا,
+# هؤلاء, أولئك, لكن, إله, الرحمن
+_ALEF_UNWRITTEN = ("ذٰلك", "هٰذ", "هٰؤل", "أولٰئك", "لٰكن", "إلٰه", "رحمٰن")
+
+# Uthmani spellings of a long alef and of hamza, rewritten to the plain
+# spelling. Applied in order, after the marks are stripped and before the
+# letters are folded
+_UTHMANI_SPELLINGS = [
+    # Hamza between a long alef and ya sits on the ya: إسرٰءيل, شركاءي
+    (re.compile("([ا" + _DAGGER_ALEF + "])ءي"), "\\1ئي"),
+    # Words that keep the long alef unwritten in plain spelling too
+    (re.compile("|".join(_ALEF_UNWRITTEN)), lambda match: match.group().replace(_DAGGER_ALEF, "")),
+    # Alef written as waw: صلوٰة, زكوٰة, حيوٰة, ربوٰا
+    (re.compile("و" + _DAGGER_ALEF + "(?=ة)"), "ا"),
+    (re.compile("و" + _DAGGER_ALEF + "ا"), "ا"),
+    # Alef maqsura keeps its ya at the end of a word (على, موسى) and is a
+    # plain alef inside one (هداكم, التوراة)
+    (re.compile("ى" + _DAGGER_ALEF + r"(?=\S)"), "ا"),
+    (re.compile("ى" + _DAGGER_ALEF), "ى"),
+    # The vocative particle is joined to the following word: يٰأيها, ويٰقوم
+    (re.compile("(?<!\\S)([وف]?)ي" + _DAGGER_ALEF + r"(?=\S)"), r"\1يا "),
+]
+
+# Small letters that stand for a letter left out of the Uthmani skeleton
+_SPELLED_LETTERS = {
+    _DAGGER_ALEF: "ا",
+    _SMALL_YEH: "ي",
+    _SMALL_NOON: "ن",
+}
+
+# Letter variants folded onto a single base letter
+_LETTER_VARIANTS = {
+    "آ": "ا",
+    "أ": "ا",
+    "إ": "ا",
+    "ٱ": "ا",  # alef wasla
+    "ٲ": "ا",
+    "ٳ": "ا",
+    "ؤ": "و",
+    "ئ": "ي",
+    "ى": "ي",
+    "ی": "ي",  # Farsi yeh
+    "ة": "ه",
+    "ک": "ك",  # keheh
+}
+
+_MARKS_TABLE = str.maketrans({mark: None for mark in _TASHKEEL + _QURANIC_MARKS})
+_LETTERS_TABLE = str.maketrans(
+    {
+        **{hamza: None for hamza in _STANDALONE_HAMZA},
+        **_SPELLED_LETTERS,
+        **_LETTER_VARIANTS,
+    }
+)
+
+
+def normalize_arabic(text: str) -> str:
+    """Normalize Arabic text for diacritic-insensitive matching.
+
+    Strips tashkeel and Quranic annotation marks, rewrites the Uthmani
+    spellings of a long alef (dagger alef, alef written as waw or ya, the
+    joined vocative ``يٰ``) to plain spelling, folds alef/hamza/ya/
+    ta-marbuta variants and alef wasla onto their base letters, and
+    collapses whitespace. Words that consist only of marks are dropped, so
+    the result is a single-space separated list of search tokens.
+    """
+    text = text.translate(_MARKS_TABLE)
+    for pattern, replacement in _UTHMANI_SPELLINGS:
+        text = pattern.sub(replacement, text)
+    return " ".join(text.translate(_LETTERS_TABLE).split())
+
+
+_WORD = re.compile(r"\S+")
+
+
+def word_spans(text: str) -> List[Tuple[int, int]]:
+    """Return the ``(start, end)`` character span in ``text`` of each token of
+    ``normalize_arabic(text)``, in order.
+
+    Spans cover the whole original word including its marks, except for
+    leading annotation signs (such as the rub el hizb ornament) that
+    normalization drops. A word that normalizes to several tokens (the
+    joined vocative) gives each of them the span of the whole word.
+    """
+    spans = []
+    for match in _WORD.finditer(text):
+        word = match.group()
+        tokens = len(normalize_arabic(word).split())
+        if not tokens:
+            continue
+        start = match.start()
+        while _MARKS_TABLE.get(ord(text[start]), text[start]) is None:
+            start += 1
+        spans.extend([(start, match.end())] * tokens)
+    return spans
@@ -0,0 +1,205 @@
+"""
+Bulk loading of table rows through SQLAlchemy Core
+"""
+import csv
+import io
+import time
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Table, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.extensions import db
+
+
+DEFAULT_BATCH_SIZE = 2000
+
+
+class LoadStats:
+    """Row count and timing of a bulk load."""
+
+    __slots__ = ("rows", "seconds")
+
+    def __init__(self, rows: int, seconds: float):
+        self.rows = rows
+        self.seconds = seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.rows} rows in {self.seconds:.3f}s ({self.rows_per_second:,.0f} rows/s)"
+
+
+def batched(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """Split ``rows`` into lists of at most ``size`` rows."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+@contextmanager
+def bulk_connection() -> Iterator:
+    """Yield a connection inside one transaction, set up for bulk writes.
+
+    On SQLite the transaction runs with ``journal_mode=WAL`` and
+    ``synchronous=OFF`` (both restored afterwards), which is safe because
+    the whole load is a single transaction.
+    """
+    with db.engine.connect() as conn:
+        dialect = conn.dialect.name
+        if dialect == "sqlite":
+            # Pragmas must run before the transaction starts
+            synchronous = conn.exec_driver_sql("PRAGMA synchronous").scalar()
+            journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.commit()
+
+        try:
+            with conn.begin():
+                yield conn
+        finally:
+            if dialect == "sqlite":
+                # journal_mode is stored in the database file, so it must be put back too
+                conn.exec_driver_sql(f"PRAGMA journal_mode={journal_mode}")
+                conn.exec_driver_sql(f"PRAGMA synchronous={int(synchronous)}")
+                conn.commit()
+
+
+def load_rows(
+    conn,
+    table: Table,
+    rows: Iterable[Dict],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    keys: Optional[Sequence[str]] = None,
+) -> LoadStats:
+    """Write ``rows`` to ``table`` on ``conn`` in batches of ``batch_size``.
+
+    PostgreSQL receives each batch through ``COPY``; other databases get
+    one ``executemany`` insert per batch. With ``keys`` existing rows are
+    updated in place: on PostgreSQL the batch is copied into a temporary
+    staging table and merged with ``INSERT ... ON CONFLICT``, elsewhere it
+    goes through ``upsert``. Runs inside the caller's transaction.
+    """
+    start = time.perf_counter()
+    total = 0
+    postgresql_copy = conn.dialect.name == "postgresql"
+    staging = None
+
+    for batch in batched(rows, batch_size):
+        if postgresql_copy and keys:
+            staging = staging or _create_staging_table(conn, table)
+            _copy_batch(conn, staging, batch)
+            _merge_staging_table(conn, table, staging, list(batch[0]), keys)
+        elif postgresql_copy:
+            _copy_batch(conn, table.name, batch)
+        elif keys:
+            upsert(conn, table, batch, keys)
+        else:
+            conn.execute(table.insert(), batch)
+        total += len(batch)
+
+    if staging:
+        conn.exec_driver_sql(f"DROP TABLE {staging}")
+    return LoadStats(total, time.perf_counter() - start)
+
+
+def bulk_load(
+    table: Table,
+    rows: Iterable[Dict],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    replace: bool = False,
+    where=None,
+) -> LoadStats:
+    """Load ``rows`` into ``table`` in one transaction, bypassing the ORM.
+
+    Rows are consumed lazily and written by ``load_rows`` on a
+    ``bulk_connection``. With ``replace`` the table (or only the rows
+    matching ``where``) is emptied first, in the same transaction.
+    """
+    start = time.perf_counter()
+    with bulk_connection() as conn:
+        if replace:
+            delete = table.delete()
+            conn.execute(delete.where(where) if where is not None else delete)
+        stats = load_rows(conn, table, rows, batch_size)
+    return LoadStats(stats.rows, time.perf_counter() - start)
+
+
+def _create_staging_table(conn, table: Table) -> str:
+    """Create an empty temporary table shaped like ``table`` and return its name."""
+    name = f"{table.name}_staging"
+    conn.exec_driver_sql(f"CREATE TEMPORARY TABLE {name} (LIKE {table.name} INCLUDING DEFAULTS) ON COMMIT DROP")
+    return name
+
+
+def _merge_staging_table(conn, table: Table, staging: str, columns: List[str], keys: Sequence[str]) -> None:
+    """Upsert the rows of the staging table into ``table`` and empty it."""
+    quote = conn.dialect.identifier_preparer.quote
+    names = ", ".join(quote(c) for c in columns)
+    updates = ", ".join(f"{quote(c)} = excluded.{quote(c)}" for c in columns if c not in keys)
+    action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+    conn.exec_driver_sql(
+        f"INSERT INTO {table.name} ({names}) SELECT {names} FROM {staging} "
+        f"ON CONFLICT ({', '.join(quote(k) for k in keys)}) {action}"
+    )
+    conn.exec_driver_sql(f"TRUNCATE {staging}")
+
+
+def _copy_batch(conn, table_name: str, batch: List[Dict]) -> None:
+    """Send a batch to PostgreSQL with ``COPY ... FROM STDIN``."""
+    columns = list(batch[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow(["\\N" if row[c] is None else row[c] for c in columns])
+
+    quoted = ", ".join(conn.dialect.identifier_preparer.quote(c) for c in columns)
+    sql = f"COPY {table_name} ({quoted}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+
+    cursor = conn.connection.driver_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
+
+def upsert(conn, table: Table, rows: List[Dict], keys: Sequence[str]) -> int:
+    """Insert ``rows`` into ``table``, updating the rows whose ``keys`` already exist.
+
+    Uses ``INSERT ... ON CONFLICT DO UPDATE`` on PostgreSQL and SQLite, so
+    unchanged primary keys (and anything referencing them) are kept. Other
+    databases get a delete of the matching keys followed by an insert.
+    Runs on ``conn`` inside the caller's transaction.
+    """
+    if not rows:
+        return 0
+
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(table)
+        updates = {c: stmt.excluded[c] for c in rows[0] if c not in keys}
+        if updates:
+            stmt = stmt.on_conflict_do_update(index_elements=list(keys), set_=updates)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(keys))
+        conn.execute(stmt, rows)
+    else:
+        conn.execute(table.delete().where(
+            tuple_(*(table.c[k] for k in keys)).in_([tuple(row[k] for k in keys) for row in rows])
+        ))
+        conn.execute(table.insert(), rows)
+    return len(rows)
@@ -0,0 +1,153 @@
+"""
+HTTP caching helpers
+"""
+import gzip
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Dict, Optional, Sequence
+
+from flask import current_app, make_response, request
+
+from .cache import LRUCache
+from .versioning import get_version
+
+try:
+    import brotli
+except ImportError:  # optional, only gzip variants are built without it
+    brotli = None
+
+
+def _last_modified(version: int) -> Optional[datetime]:
+    """Return the Last-Modified date of a stamp version, or ``None`` if it is not safe yet.
+
+    HTTP dates have a one-second resolution, so the version is rounded up
+    to the next whole second. That date is only sent once it has passed:
+    any later bump then falls in a later second, and a client revalidating
+    with the date can never miss a change made within the same second.
+    """
+    if not version:
+        return None
+    seconds = version // 10**9 + 1
+    if seconds > time.time():
+        return None
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+def conditional(*names: str):
+    """Serve a view with an ETag and Cache-Control derived from version stamps.
+
+    The ETag combines the API version with the versions of ``names``, so it
+    only changes when the underlying data is re-imported. A matching
+    ``If-None-Match`` (or ``If-Modified-Since``) is answered with 304 before
+    the view runs, so revalidation costs a few ``stat`` calls. The 304
+    carries the same Cache-Control and ``Vary`` headers as a 200 would.
+    ``If-Modified-Since`` is only used by clients that sent no ETag.
+    """
+    def decorator(view):
+        vary = getattr(view, "vary", ())
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versions = [get_version(name) for name in names]
+            etag = "-".join([current_app.config.get("API_VERSION", ""), *(f"{v:x}" for v in versions)])
+            last_modified = _last_modified(max(versions, default=0))
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                not_modified = bool(
+                    last_modified and request.if_modified_since
+                    and request.if_modified_since >= last_modified
+                )
+
+            if not_modified:
+                response = current_app.response_class(status=304)
+                response.vary.update(vary)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            response.cache_control.public = True
+            response.cache_control.max_age = current_app.config.get("CONTENT_CACHE_MAX_AGE", 3600)
+            return response
+        return wrapper
+    return decorator
+
+
+class CompressedPayload:
+    """A response body stored as identity, gzip and (if available) brotli bytes."""
+
+    __slots__ = ("mimetype", "variants")
+
+    def __init__(self, body: bytes, mimetype: str):
+        self.mimetype = mimetype
+        self.variants: Dict[str, bytes] = {
+            "identity": body,
+            # mtime=0 keeps the bytes identical across workers and restarts
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+        }
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body, quality=11)
+
+    def encoding_for(self, accept_encodings) -> str:
+        """Pick the best variant the client accepts, preferring the smallest."""
+        offered = sorted(self.variants, key=lambda name: len(self.variants[name]))
+        return accept_encodings.best_match(offered, default="identity")
+
+
+_response_cache: Optional[LRUCache] = None
+
+
+def get_response_cache() -> LRUCache:
+    """Get the process-local cache of precompressed responses."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = LRUCache(maxsize=current_app.config.get("RESPONSE_CACHE_SIZE", 512))
+    return _response_cache
+
+
+def precompressed(*names: str, query_args: Sequence[str] = ()):
+    """Serve a view's 200 responses from precompressed bytes.
+
+    The first request for a URL runs the view and stores its body in every
+    supported encoding; later requests send the variant matching
+    ``Accept-Encoding`` as is, without running the view or encoding JSON.
+    Entries are keyed on the path and the values of the ``query_args``
+    arguments, so other query arguments can neither bypass the cache nor
+    evict entries. Entries stop matching when any of the ``names`` versions
+    changes; streamed responses are passed through uncached. Only use it on
+    views whose output depends on nothing but the path and ``query_args``.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = get_response_cache()
+            # The versions are part of the key: views depending on different
+            # stamps share the cache, and stale entries age out of the LRU
+            version = tuple(get_version(name) for name in names)
+            key = (request.path, *(request.args.get(name) for name in query_args), version)
+
+            payload = cache.get(key)
+            if payload is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                payload = CompressedPayload(response.get_data(), response.mimetype)
+                cache.set(key, payload)
+
+            encoding = payload.encoding_for(request.accept_encodings)
+            response = current_app.response_class(payload.variants[encoding], mimetype=payload.mimetype)
+            if encoding != "identity":
+                response.headers["Content-Encoding"] = encoding
+            response.vary.update(wrapper.vary)
+            return response
+
+        # Read by conditional() so its 304 responses vary the same way
+        wrapper.vary = ("Accept-Encoding",)
+        return wrapper
+    return decorator
@@ -0,0 +1,106 @@
+"""
+Content-hash manifest of imported data
+"""
+import hashlib
+import json
+from itertools import groupby
+from typing import Dict, Iterable, Optional, Sequence
+
+from sqlalchemy import Table, select, tuple_
+
+from app.extensions import db
+from app.models.quran import ImportDigest
+from app.utils.bulk_load import upsert
+
+
+def content_hash(rows: Iterable[Dict]) -> str:
+    """Return a SHA-256 digest of ``rows``, independent of dictionary key order."""
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(json.dumps(row, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def stored_hashes(conn, table: Table, key: str, exclude: Sequence[str] = ()) -> Dict[str, str]:
+    """Hash the rows stored in ``table``, grouped by the ``key`` column.
+
+    Rows are read in primary key order without the ``exclude`` columns, so
+    each digest equals the ``content_hash`` an importer computes for the
+    same rows from its input.
+    """
+    columns = [column for column in table.columns if column.name not in exclude]
+    rows = conn.execute(
+        select(*columns).order_by(table.c[key], *table.primary_key.columns)
+    ).mappings()
+    return {
+        str(value): content_hash([dict(row) for row in group])
+        for value, group in groupby(rows, key=lambda row: row[key])
+    }
+
+
+class ImportManifest:
+    """Hashes of the content last imported, by section (table) and key.
+
+    Importers compare the hash of each group of incoming rows (a surah's
+    ayahs, a reciter, ...) with the stored one and only write the groups
+    that changed. The manifest lives in the ``import_manifest`` table of the
+    database it describes and is saved after the import committed, so a
+    failed import is simply redone on the next run.
+    """
+
+    def __init__(self, sections: Optional[Dict[str, Dict[str, str]]] = None):
+        self.sections = sections or {}
+        self._dirty = set()
+
+    @classmethod
+    def load(cls, conn=None) -> "ImportManifest":
+        """Read the manifest of the current database (through ``conn`` if given)."""
+        table = ImportDigest.__table__
+        query = select(table.c.section, table.c.key, table.c.digest)
+        rows = (conn or db.session).execute(query).all()
+        sections = {}
+        for section, key, digest in rows:
+            sections.setdefault(section, {})[key] = digest
+        return cls(sections)
+
+    def get(self, section: str, key) -> Optional[str]:
+        return self.sections.get(section, {}).get(str(key))
+
+    def set(self, section: str, key, digest: str) -> None:
+        digests = self.sections.setdefault(section, {})
+        if digests.get(str(key)) != digest:
+            digests[str(key)] = digest
+            self._dirty.add((section, str(key)))
+
+    def discard(self, section: str, key) -> None:
+        if self.sections.get(section, {}).pop(str(key), None) is not None:
+            self._dirty.add((section, str(key)))
+
+    def keys(self, section: str):
+        return list(self.sections.get(section, {}))
+
+    def save(self, conn=None) -> None:
+        """Write the entries set or discarded since the manifest was loaded.
+
+        Runs on ``conn`` inside the caller's transaction if given, otherwise
+        in a transaction of its own.
+        """
+        if not self._dirty:
+            return
+        if conn is None:
+            with db.engine.begin() as conn:
+                self.save(conn)
+            return
+
+        table = ImportDigest.__table__
+        entries = sorted(self._dirty)
+        removed = [(section, key) for section, key in entries if self.get(section, key) is None]
+        if removed:
+            conn.execute(table.delete().where(tuple_(table.c.section, table.c.key).in_(removed)))
+        upsert(conn, table, [
+            {"section": section, "key": key, "digest": self.get(section, key)}
+            for section, key in entries
+            if self.get(section, key) is not None
+        ], ("section", "key"))
+        self._dirty.clear()
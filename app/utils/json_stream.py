@@ -0,0 +1,108 @@
+"""
+Constant-memory reading of large JSON and NDJSON datasets
+"""
+import json
+from typing import IO, Iterator, Optional
+
+CHUNK_SIZE = 64 * 1024
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+_WHITESPACE = " \t\r\n,:"
+
+# Characters that can follow a complete value
+_DELIMITERS = _WHITESPACE + "]}"
+
+
+def iter_json_records(stream: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """Yield every object found directly inside a JSON array, reading incrementally.
+
+    The document is scanned container by container: keys and scalars are
+    skipped, and each object that is an array element is decoded with
+    ``raw_decode`` and yielded. Both ``[{...}, ...]`` and quran.json's
+    ``{"1": [{...}, ...], ...}`` layouts work, at any nesting depth. Only
+    the current record and one chunk of text are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    stack = []
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def decode():
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof or not fill():
+                    raise
+                continue
+            # A number cut by the chunk boundary ("1" of "1.5") decodes as a
+            # shorter number, so a value must be followed by a delimiter
+            if (end == len(buffer) or buffer[end] not in _DELIMITERS) and not eof and fill():
+                continue
+            pos = end
+            return value
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos >= len(buffer):
+            if not fill():
+                break
+            continue
+
+        char = buffer[pos]
+        if char == "{" and stack and stack[-1] == "[":
+            yield decode()
+        elif char in "{[":
+            stack.append(char)
+            pos += 1
+        elif char in "}]":
+            if not stack:
+                raise ValueError(f"Unbalanced '{char}' in JSON input")
+            stack.pop()
+            pos += 1
+        else:
+            # Object key or scalar value
+            decode()
+
+    if stack:
+        raise ValueError("Truncated JSON input")
+
+
+def iter_ndjson_records(stream: IO[str]) -> Iterator[dict]:
+    """Yield one object per non-blank line of an NDJSON stream."""
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid NDJSON on line {number}: {e.msg}") from e
+
+
+def iter_records(path: str, format: Optional[str] = None) -> Iterator[dict]:
+    """Stream the records of a JSON or NDJSON file (chosen by suffix unless ``format`` is given)."""
+    if format is None:
+        format = "ndjson" if str(path).endswith(NDJSON_SUFFIXES) else "json"
+    if format not in ("json", "ndjson"):
+        raise ValueError(f"Unknown input format: {format}")
+
+    with open(path, "r", encoding="utf-8") as f:
+        if format == "ndjson":
+            yield from iter_ndjson_records(f)
+        else:
+            yield from iter_json_records(f)
@@ -0,0 +1,202 @@
+"""
+Static metadata of the 114 surahs
+"""
+from typing import Optional, Tuple
+
+from .mushaf import (
+    SURAH_AYAH_COUNTS,
+    SURAH_START_ORDINALS,
+    TOTAL_SURAHS,
+    juz_of,
+    page_of,
+)
+
+# Name (Arabic, English) and revelation type of each surah, in mushaf order
+_SURAH_NAMES = (
+    ("الفاتحة", "Al-Fatiha", "Meccan"),
+    ("البقرة", "Al-Baqarah", "Medinan"),
+    ("آل عمران", "Aal-Imran", "Medinan"),
+    ("النساء", "An-Nisa", "Medinan"),
+    ("المائدة", "Al-Ma'idah", "Medinan"),
+    ("الأنعام", "Al-An'am", "Meccan"),
+    ("الأعراف", "Al-A'raf", "Meccan"),
+    ("الأنفال", "Al-Anfal", "Medinan"),
+    ("التوبة", "At-Tawbah", "Medinan"),
+    ("يونس", "Yunus", "Meccan"),
+    ("هود", "Hud", "Meccan"),
+    ("يوسف", "Yusuf", "Meccan"),
+    ("الرعد", "Ar-Ra'd", "Medinan"),
+    ("إبراهيم", "Ibrahim", "Meccan"),
+    ("الحجر", "Al-Hijr", "Meccan"),
+    ("النحل", "An-Nahl", "Meccan"),
+    ("الإسراء", "Al-Isra", "Meccan"),
+    ("الكهف", "Al-Kahf", "Meccan"),
+    ("مريم", "Maryam", "Meccan"),
+    ("طه", "Ta-Ha", "Meccan"),
+    ("الأنبياء", "Al-Anbiya", "Meccan"),
+    ("الحج", "Al-Hajj", "Medinan"),
+    ("المؤمنون", "Al-Mu'minun", "Meccan"),
+    ("النور", "An-Nur", "Medinan"),
+    ("الفرقان", "Al-Furqan", "Meccan"),
+    ("الشعراء", "Ash-Shu'ara", "Meccan"),
+    ("النمل", "An-Naml", "Meccan"),
+    ("القصص", "Al-Qasas", "Meccan"),
+    ("العنكبوت", "Al-Ankabut", "Meccan"),
+    ("الروم", "Ar-Rum", "Meccan"),
+    ("لقمان", "Luqman", "Meccan"),
+    ("السجدة", "As-Sajdah", "Meccan"),
+    ("الأحزاب", "Al-Ahzab", "Medinan"),
+    ("سبأ", "Saba", "Meccan"),
+    ("فاطر", "Fatir", "Meccan"),
+    ("يس", "Ya-Sin", "Meccan"),
+    ("الصافات", "As-Saffat", "Meccan"),
+    ("ص", "Sad", "Meccan"),
+    ("الزمر", "Az-Zumar", "Meccan"),
+    ("غافر", "Ghafir", "Meccan"),
+    ("فصلت", "Fussilat", "Meccan"),
+    ("الشورى", "Ash-Shura", "Meccan"),
+    ("الزخرف", "Az-Zukhruf", "Meccan"),
+    ("الدخان", "Ad-Dukhan", "Meccan"),
+    ("الجاثية", "Al-Jathiyah", "Meccan"),
+    ("الأحقاف", "Al-Ahqaf", "Meccan"),
+    ("محمد", "Muhammad", "Medinan"),
+    ("الفتح", "Al-Fath", "Medinan"),
+    ("الحجرات", "Al-Hujurat", "Medinan"),
+    ("ق", "Qaf", "Meccan"),
+    ("الذاريات", "Adh-Dhariyat", "Meccan"),
+    ("الطور", "At-Tur", "Meccan"),
+    ("النجم", "An-Najm", "Meccan"),
+    ("القمر", "Al-Qamar", "Meccan"),
+    ("الرحمن", "Ar-Rahman", "Meccan"),
+    ("الواقعة", "Al-Waqi'ah", "Meccan"),
+    ("الحديد", "Al-Hadid", "Medinan"),
+    ("المجادلة", "Al-Mujadilah", "Medinan"),
+    ("الحشر", "Al-Hashr", "Medinan"),
+    ("الممتحنة", "Al-Mumtahanah", "Medinan"),
+    ("الصف", "As-Saf", "Medinan"),
+    ("الجمعة", "Al-Jumu'ah", "Medinan"),
+    ("المنافقون", "Al-Munafiqun", "Medinan"),
+    ("التغابن", "At-Taghabun", "Medinan"),
+    ("الطلاق", "At-Talaq", "Medinan"),
+    ("التحريم", "At-Tahrim", "Medinan"),
+    ("الملك", "Al-Mulk", "Meccan"),
+    ("القلم", "Al-Qalam", "Meccan"),
+    ("الحاقة", "Al-Haqqah", "Meccan"),
+    ("المعارج", "Al-Ma'arij", "Meccan"),
+    ("نوح", "Nuh", "Meccan"),
+    ("الجن", "Al-Jinn", "Meccan"),
+    ("المزمل", "Al-Muzzammil", "Meccan"),
+    ("المدثر", "Al-Muddathir", "Meccan"),
+    ("القيامة", "Al-Qiyamah", "Meccan"),
+    ("الإنسان", "Al-Insan", "Medinan"),
+    ("المرسلات", "Al-Mursalat", "Meccan"),
+    ("النبأ", "An-Naba", "Meccan"),
+    ("النازعات", "An-Nazi'at", "Meccan"),
+    ("عبس", "Abasa", "Meccan"),
+    ("التكوير", "At-Takwir", "Meccan"),
+    ("الانفطار", "Al-Infitar", "Meccan"),
+    ("المطففين", "Al-Mutaffifin", "Meccan"),
+    ("الانشقاق", "Al-Inshiqaq", "Meccan"),
+    ("البروج", "Al-Buruj", "Meccan"),
+    ("الطارق", "At-Tariq", "Meccan"),
+    ("الأعلى", "Al-A'la", "Meccan"),
+    ("الغاشية", "Al-Ghashiyah", "Meccan"),
+    ("الفجر", "Al-Fajr", "Meccan"),
+    ("البلد", "Al-Balad", "Meccan"),
+    ("الشمس", "Ash-Shams", "Meccan"),
+    ("الليل", "Al-Layl", "Meccan"),
+    ("الضحى", "Ad-Duha", "Meccan"),
+    ("الشرح", "Ash-Sharh", "Meccan"),
+    ("التين", "At-Tin", "Meccan"),
+    ("العلق", "Al-Alaq", "Meccan"),
+    ("القدر", "Al-Qadr", "Meccan"),
+    ("البينة", "Al-Bayyinah", "Medinan"),
+    ("الزلزلة", "Az-Zalzalah", "Medinan"),
+    ("العاديات", "Al-Adiyat", "Meccan"),
+    ("القارعة", "Al-Qari'ah", "Meccan"),
+    ("التكاثر", "At-Takathur", "Meccan"),
+    ("العصر", "Al-Asr", "Meccan"),
+    ("الهمزة", "Al-Humazah", "Meccan"),
+    ("الفيل", "Al-Fil", "Meccan"),
+    ("قريش", "Quraysh", "Meccan"),
+    ("الماعون", "Al-Ma'un", "Meccan"),
+    ("الكوثر", "Al-Kawthar", "Meccan"),
+    ("الكافرون", "Al-Kafirun", "Meccan"),
+    ("النصر", "An-Nasr", "Medinan"),
+    ("المسد", "Al-Masad", "Meccan"),
+    ("الإخلاص", "Al-Ikhlas", "Meccan"),
+    ("الفلق", "Al-Falaq", "Meccan"),
+    ("الناس", "An-Nas", "Meccan"),
+)
+
+
+class SurahInfo:
+    """Immutable surah metadata."""
+
+    __slots__ = (
+        "id", "name_arabic", "name_english", "total_ayahs", "revelation_type",
+        "juz", "page", "start",
+    )
+
+    def __init__(self, id: int, name_arabic: str, name_english: str, revelation_type: str):
+        self.id = id
+        self.name_arabic = name_arabic
+        self.name_english = name_english
+        self.total_ayahs = SURAH_AYAH_COUNTS[id - 1]
+        self.revelation_type = revelation_type
+        self.juz = juz_of(id, 1)
+        self.page = page_of(id, 1)
+        # Mushaf-order ordinal of the first ayah
+        self.start = SURAH_START_ORDINALS[id - 1]
+
+    def to_dict(self) -> dict:
+        """Convert to the same dictionary as ``Surah.to_dict``, plus the starting page."""
+        return {
+            "id": self.id,
+            "name_arabic": self.name_arabic,
+            "name_english": self.name_english,
+            "total_ayahs": self.total_ayahs,
+            "revelation_type": self.revelation_type,
+            "juz": self.juz,
+            "page": self.page,
+        }
+
+
+SURAHS: Tuple[SurahInfo, ...] = tuple(
+    SurahInfo(surah_id, *names) for surah_id, names in enumerate(_SURAH_NAMES, 1)
+)
+
+
+def get_surah(surah_id: int) -> Optional[SurahInfo]:
+    """Return the metadata of a surah, or ``None`` for an invalid id."""
+    if 1 <= surah_id <= TOTAL_SURAHS:
+        return SURAHS[surah_id - 1]
+    return None
+
+
+def surah_error(surah_id) -> Optional[str]:
+    """Return the error message for an invalid surah id, or ``None``."""
+    if not isinstance(surah_id, int) or isinstance(surah_id, bool) or not 1 <= surah_id <= TOTAL_SURAHS:
+        return f"Invalid surah ID. Must be between 1 and {TOTAL_SURAHS}"
+    return None
+
+
+def ayah_error(surah_id, ayah_no) -> Optional[str]:
+    """Return the error message for an invalid ``(surah_id, ayah_no)``, or ``None``."""
+    error = surah_error(surah_id)
+    if error:
+        return error
+    total_ayahs = SURAH_AYAH_COUNTS[surah_id - 1]
+    if not isinstance(ayah_no, int) or isinstance(ayah_no, bool) or not 1 <= ayah_no <= total_ayahs:
+        return f"Invalid ayah number. Surah {surah_id} has {total_ayahs} ayahs"
+    return None
+
+
+def range_error(from_surah, from_ayah, to_surah, to_ayah) -> Optional[str]:
+    """Return the error message for an invalid ayah range, or ``None``."""
+    error = ayah_error(from_surah, from_ayah) or ayah_error(to_surah, to_ayah)
+    if error:
+        return error
+    if (from_surah, from_ayah) > (to_surah, to_ayah):
+        return "Invalid range. Start must not be after end"
+    return None
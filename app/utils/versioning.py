@@ -0,0 +1,42 @@
+"""
+Cross-process version stamps for cached content
+"""
+import os
+import time
+
+from flask import current_app
+
+
+def _stamp_path(name: str) -> str:
+    """Return the path of the stamp file for ``name`` inside the instance folder.
+
+    Names may contain ``/`` to group many stamps (one per user, say) in a
+    subfolder.
+    """
+    return os.path.join(current_app.instance_path, f"{name}.version")
+
+
+def get_version(name: str) -> int:
+    """Get the current version of ``name`` (0 if it was never bumped).
+
+    The version is the modification time of a stamp file in the instance
+    folder, so every process sharing that folder sees the same value for
+    the cost of a single ``stat`` call.
+    """
+    try:
+        return os.stat(_stamp_path(name)).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def bump_version(name: str) -> int:
+    """Bump the version of ``name`` and return the new value."""
+    path = _stamp_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    version = max(time.time_ns(), get_version(name) + 1)
+
+    with open(path, "w") as f:
+        f.write(str(version))
+    os.utime(path, ns=(version, version))
+
+    return version
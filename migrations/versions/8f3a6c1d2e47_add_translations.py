@@ -0,0 +1,48 @@
+"""Add translation and tafsir datasets
+
+Revision ID: 8f3a6c1d2e47
+Revises: 5b2e9c41f7a3
+Create Date: 2026-10-18 00:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f3a6c1d2e47'
+down_revision = '5b2e9c41f7a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('translations',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('code', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('language', sa.String(length=10), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('translations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_translations_code'), ['code'], unique=True)
+
+    op.create_table('translation_ayahs',
+    sa.Column('translation_id', sa.Integer(), nullable=False),
+    sa.Column('surah_id', sa.Integer(), nullable=False),
+    sa.Column('ayah_no', sa.Integer(), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('text_normalized', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['surah_id'], ['surahs.id'], ),
+    sa.ForeignKeyConstraint(['translation_id'], ['translations.id'], ),
+    sa.PrimaryKeyConstraint('translation_id', 'surah_id', 'ayah_no')
+    )
+
+
+def downgrade():
+    op.drop_table('translation_ayahs')
+    with op.batch_alter_table('translations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_translations_code'))
+
+    op.drop_table('translations')
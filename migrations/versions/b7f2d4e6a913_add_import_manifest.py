@@ -0,0 +1,29 @@
+"""Store the import manifest in the database
+
+Revision ID: b7f2d4e6a913
+Revises: e41b7c9d2a58
+Create Date: 2026-10-18 03:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7f2d4e6a913'
+down_revision = 'e41b7c9d2a58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('import_manifest',
+    sa.Column('section', sa.String(length=50), nullable=False),
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('digest', sa.String(length=64), nullable=False),
+    sa.PrimaryKeyConstraint('section', 'key')
+    )
+
+
+def downgrade():
+    op.drop_table('import_manifest')
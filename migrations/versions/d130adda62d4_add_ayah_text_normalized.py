@@ -0,0 +1,84 @@
+"""Add normalized search text to ayah_index
+
+Revision ID: d130adda62d4
+Revises: 826fcbc57eb4
+Create Date: 2026-10-17 20:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd130adda62d4'
+down_revision = '826fcbc57eb4'
+branch_labels = None
+depends_on = None
+
+
+# Frozen copy of app.utils.arabic.normalize_arabic as of this revision, so
+# later changes to the normalizer do not change what this migration writes
+_DROPPED = (
+    [chr(c) for c in range(0x064B, 0x0660)]
+    + ["\u0670", "\u0640"]
+    + [chr(c) for c in range(0x06D6, 0x06EE)]
+    + [chr(c) for c in range(0x08F0, 0x08F4)]
+    + ["\u0621"]
+)
+_FOLDED = {
+    "\u0622": "\u0627",
+    "\u0623": "\u0627",
+    "\u0625": "\u0627",
+    "\u0671": "\u0627",
+    "\u0672": "\u0627",
+    "\u0673": "\u0627",
+    "\u0624": "\u0648",
+    "\u0626": "\u064a",
+    "\u0649": "\u064a",
+    "\u06cc": "\u064a",
+    "\u0629": "\u0647",
+    "\u06a9": "\u0643",
+}
+_TRANSLATION_TABLE = str.maketrans({**{mark: None for mark in _DROPPED}, **_FOLDED})
+
+
+def _normalize_arabic(text):
+    return " ".join(text.translate(_TRANSLATION_TABLE).split())
+
+
+def upgrade():
+    with op.batch_alter_table('ayah_index', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('text_normalized', sa.Text(), nullable=False, server_default=''))
+
+    # Backfill rows imported before the column existed
+    bind = op.get_bind()
+    ayah_index = sa.table(
+        'ayah_index',
+        sa.column('surah_id', sa.Integer()),
+        sa.column('ayah_no', sa.Integer()),
+        sa.column('text_plain', sa.Text()),
+        sa.column('text_normalized', sa.Text()),
+    )
+    rows = bind.execute(
+        sa.select(ayah_index.c.surah_id, ayah_index.c.ayah_no, ayah_index.c.text_plain)
+    ).all()
+    if rows:
+        bind.execute(
+            ayah_index.update()
+            .where(ayah_index.c.surah_id == sa.bindparam('b_surah_id'))
+            .where(ayah_index.c.ayah_no == sa.bindparam('b_ayah_no'))
+            .values(text_normalized=sa.bindparam('b_text_normalized')),
+            [
+                {
+                    'b_surah_id': surah_id,
+                    'b_ayah_no': ayah_no,
+                    'b_text_normalized': _normalize_arabic(text_plain),
+                }
+                for surah_id, ayah_no, text_plain in rows
+            ],
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('ayah_index', schema=None) as batch_op:
+        batch_op.drop_column('text_normalized')
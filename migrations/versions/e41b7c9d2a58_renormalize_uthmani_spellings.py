@@ -0,0 +1,186 @@
+"""Recompute normalized search text for the Uthmani alef spellings
+
+Revision ID: e41b7c9d2a58
+Revises: 8f3a6c1d2e47
+Create Date: 2026-10-18 02:30:00.000000
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41b7c9d2a58'
+down_revision = '8f3a6c1d2e47'
+branch_labels = None
+depends_on = None
+
+
+# Frozen copy of app.utils.arabic.normalize_arabic as of this revision, so
+# later changes to the normalizer do not change what this migration writes
+_DAGGER_ALEF = "ٰ"
+_MARKS_TABLE = str.maketrans({
+    mark: None
+    for mark in (
+        [chr(c) for c in range(0x064B, 0x0660)]
+        + ["ـ"]
+        + [chr(c) for c in range(0x06D6, 0x06EE) if c not in (0x06E7, 0x06E8)]
+        + [chr(c) for c in range(0x08F0, 0x08F4)]
+    )
+})
+_ALEF_UNWRITTEN = ("ذٰلك", "هٰذ", "هٰؤل", "أولٰئك", "لٰكن", "إلٰه", "رحمٰن")
+_UTHMANI_SPELLINGS = [
+    (re.compile("([ا" + _DAGGER_ALEF + "])ءي"), "\\1ئي"),
+    (re.compile("|".join(_ALEF_UNWRITTEN)), lambda match: match.group().replace(_DAGGER_ALEF, "")),
+    (re.compile("و" + _DAGGER_ALEF + "(?=ة)"), "ا"),
+    (re.compile("و" + _DAGGER_ALEF + "ا"), "ا"),
+    (re.compile("ى" + _DAGGER_ALEF + r"(?=\S)"), "ا"),
+    (re.compile("ى" + _DAGGER_ALEF), "ى"),
+    (re.compile("(?<!\\S)([وف]?)ي" + _DAGGER_ALEF + r"(?=\S)"), r"\1يا "),
+]
+_LETTERS_TABLE = str.maketrans({
+    "ء": None,
+    _DAGGER_ALEF: "ا",
+    "ۧ": "ي",
+    "ۨ": "ن",
+    "آ": "ا",
+    "أ": "ا",
+    "إ": "ا",
+    "ٱ": "ا",
+    "ٲ": "ا",
+    "ٳ": "ا",
+    "ؤ": "و",
+    "ئ": "ي",
+    "ى": "ي",
+    "ی": "ي",
+    "ة": "ه",
+    "ک": "ك",
+})
+
+# The normalizer of revision d130adda62d4, restored on downgrade
+_PREVIOUS_TABLE = str.maketrans({
+    **{
+        mark: None
+        for mark in (
+            [chr(c) for c in range(0x064B, 0x0660)]
+            + ["ٰ", "ـ"]
+            + [chr(c) for c in range(0x06D6, 0x06EE)]
+            + [chr(c) for c in range(0x08F0, 0x08F4)]
+            + ["ء"]
+        )
+    },
+    "آ": "ا",
+    "أ": "ا",
+    "إ": "ا",
+    "ٱ": "ا",
+    "ٲ": "ا",
+    "ٳ": "ا",
+    "ؤ": "و",
+    "ئ": "ي",
+    "ى": "ي",
+    "ی": "ي",
+    "ة": "ه",
+    "ک": "ك",
+})
+
+# Translation languages normalized like the Quran text (app.content.datasets)
+_ARABIC_SCRIPT_LANGUAGES = ("ar", "fa", "ur")
+_WORD = re.compile(r"\w+")
+
+
+def _normalize_arabic(text):
+    text = text.translate(_MARKS_TABLE)
+    for pattern, replacement in _UTHMANI_SPELLINGS:
+        text = pattern.sub(replacement, text)
+    return " ".join(text.translate(_LETTERS_TABLE).split())
+
+
+def _previous_normalize_arabic(text):
+    return " ".join(text.translate(_PREVIOUS_TABLE).split())
+
+
+def _renormalize(normalize):
+    bind = op.get_bind()
+
+    ayah_index = sa.table(
+        'ayah_index',
+        sa.column('surah_id', sa.Integer()),
+        sa.column('ayah_no', sa.Integer()),
+        sa.column('text_plain', sa.Text()),
+        sa.column('text_normalized', sa.Text()),
+    )
+    rows = bind.execute(
+        sa.select(ayah_index.c.surah_id, ayah_index.c.ayah_no, ayah_index.c.text_plain)
+    ).all()
+    if rows:
+        bind.execute(
+            ayah_index.update()
+            .where(ayah_index.c.surah_id == sa.bindparam('b_surah_id'))
+            .where(ayah_index.c.ayah_no == sa.bindparam('b_ayah_no'))
+            .values(text_normalized=sa.bindparam('b_text_normalized')),
+            [
+                {
+                    'b_surah_id': surah_id,
+                    'b_ayah_no': ayah_no,
+                    'b_text_normalized': normalize(text_plain),
+                }
+                for surah_id, ayah_no, text_plain in rows
+            ],
+        )
+
+    translations = sa.table(
+        'translations',
+        sa.column('id', sa.Integer()),
+        sa.column('language', sa.String()),
+    )
+    translation_ayahs = sa.table(
+        'translation_ayahs',
+        sa.column('translation_id', sa.Integer()),
+        sa.column('surah_id', sa.Integer()),
+        sa.column('ayah_no', sa.Integer()),
+        sa.column('text', sa.Text()),
+        sa.column('text_normalized', sa.Text()),
+    )
+    rows = bind.execute(
+        sa.select(
+            translation_ayahs.c.translation_id,
+            translation_ayahs.c.surah_id,
+            translation_ayahs.c.ayah_no,
+            translation_ayahs.c.text,
+        )
+        .join(translations, translations.c.id == translation_ayahs.c.translation_id)
+        .where(translations.c.language.in_(_ARABIC_SCRIPT_LANGUAGES))
+    ).all()
+    if rows:
+        bind.execute(
+            translation_ayahs.update()
+            .where(translation_ayahs.c.translation_id == sa.bindparam('b_translation_id'))
+            .where(translation_ayahs.c.surah_id == sa.bindparam('b_surah_id'))
+            .where(translation_ayahs.c.ayah_no == sa.bindparam('b_ayah_no'))
+            .values(text_normalized=sa.bindparam('b_text_normalized')),
+            [
+                {
+                    'b_translation_id': translation_id,
+                    'b_surah_id': surah_id,
+                    'b_ayah_no': ayah_no,
+                    'b_text_normalized': " ".join(_WORD.findall(normalize(text))),
+                }
+                for translation_id, surah_id, ayah_no, text in rows
+            ],
+        )
+
+    # The SQLite full-text table copies text_normalized; it is rebuilt from
+    # ayah_index on the next search. The PostgreSQL index is an expression
+    # index and follows the updated rows
+    if bind.dialect.name == 'sqlite':
+        op.execute('DROP TABLE IF EXISTS ayah_fts')
+
+
+def upgrade():
+    _renormalize(_normalize_arabic)
+
+
+def downgrade():
+    _renormalize(_previous_normalize_arabic)
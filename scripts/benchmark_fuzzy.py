@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Search Benchmark
+قياس زمن البحث التقريبي (mode=fuzzy) على نص القرآن الكامل من ملف quran.json
+"""
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# إضافة مسار المشروع إلى Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.content.search_index import SearchIndex
+from app.utils.arabic import normalize_arabic
+
+
+ARABIC_LETTERS = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+
+
+def load_index() -> SearchIndex:
+    """بناء فهرس البحث مباشرة من ملف quran.json دون قاعدة بيانات"""
+    with open(project_root / "quran.json", "r", encoding="utf-8") as f:
+        quran_data = json.load(f)
+
+    rows = [
+        (verse["chapter"], verse["verse"], verse["text"], 0, normalize_arabic(verse["text"]))
+        for verses in quran_data.values()
+        for verse in verses
+    ]
+    return SearchIndex(rows)
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    """إدخال خطأ إملائي واحد: حذف أو استبدال أو تبديل أو إضافة حرف"""
+    i = rng.randrange(len(word))
+    edit = rng.choice(("delete", "substitute", "transpose", "insert"))
+
+    if edit == "delete":
+        return word[:i] + word[i + 1:]
+    if edit == "substitute":
+        return word[:i] + rng.choice(ARABIC_LETTERS) + word[i + 1:]
+    if edit == "transpose" and i < len(word) - 1:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + rng.choice(ARABIC_LETTERS) + word[i:]
+
+
+def build_queries(index: SearchIndex, count: int, seed: int) -> List[str]:
+    """توليد استعلامات من كلمات القرآن بتوزيع تكرارها الفعلي مع أخطاء إملائية"""
+    rng = random.Random(seed)
+    words = [term for term, posting in index.postings.items() if len(term) >= 4 for _ in posting]
+
+    queries = []
+    for _ in range(count):
+        size = rng.choice((1, 1, 1, 2, 2, 3))
+        queries.append(" ".join(misspell(rng.choice(words), rng) for _ in range(size)))
+    return queries
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    """الدالة الرئيسية"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="قياس زمن البحث التقريبي على نص القرآن الكامل")
+    parser.add_argument("--queries", type=int, default=2000, help="عدد الاستعلامات")
+    parser.add_argument("--threshold", type=float, default=0.4, help="أدنى تشابه للكلمات")
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="الحد الأقصى المسموح لزمن p99")
+    parser.add_argument("--seed", type=int, default=42, help="بذرة توليد الاستعلامات")
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = load_index()
+    print(f"📖 تم بناء الفهرس في {(time.perf_counter() - start) * 1000:.0f}ms "
+          f"({len(index)} آية، {len(index.postings)} كلمة)")
+
+    queries = build_queries(index, args.queries, args.seed)
+
+    # إحماء
+    for query in queries[:100]:
+        index.fuzzy_search(normalize_arabic(query), args.threshold)
+
+    samples = []
+    total_results = 0
+    for query in queries:
+        start = time.perf_counter()
+        results = index.fuzzy_search(normalize_arabic(query), args.threshold)
+        samples.append((time.perf_counter() - start) * 1000)
+        total_results += len(results)
+
+    p50, p95, p99 = (percentile(samples, pct) for pct in (50, 95, 99))
+    print(f"🔎 {len(samples)} استعلام، متوسط النتائج {total_results / len(samples):.1f}")
+    print(f"⏱️ p50={p50:.3f}ms p95={p95:.3f}ms p99={p99:.3f}ms max={max(samples):.3f}ms")
+
+    if p99 > args.budget_ms:
+        print(f"❌ تجاوز زمن p99 الحد المسموح ({args.budget_ms}ms)")
+        sys.exit(1)
+
+    print(f"✅ زمن p99 ضمن الحد المسموح ({args.budget_ms}ms)")
+
+
+if __name__ == "__main__":
+    main()
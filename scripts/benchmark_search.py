@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Search Benchmark
+قياس أداء /api/v1/content/search لكل محرك بحث على نص القرآن الكامل من ملف quran.json
+"""
+
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# إضافة مسار المشروع إلى Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert
+
+from app import create_app
+from app.config import TestingConfig, config
+from app.extensions import db
+from app.models.quran import AyahIndex
+from app.utils.arabic import normalize_arabic
+
+
+BACKENDS = ("memory", "fulltext")
+
+# نسبة كل نوع من الاستعلامات في المزيج
+QUERY_MIX = {
+    "common": 30,
+    "rare": 20,
+    "multi_word": 15,
+    "phrase": 15,
+    "proximity": 5,
+    "boolean": 5,
+    "filtered": 5,
+    "deep_page": 5,
+}
+
+
+def create_benchmark_app(database_path: str):
+    """إنشاء تطبيق يستخدم قاعدة بيانات مؤقتة ومجلد instance مؤقتاً بجانبها"""
+
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database_path}"
+        LOG_LEVEL = "WARNING"
+        LOG_FORMAT = "text"
+
+    config["benchmark"] = BenchmarkConfig
+    os.environ["FLASK_ENV"] = "benchmark"
+    app = create_app()
+    # ملفات الإصدار والنسخ المؤقتة تُكتب في المجلد المؤقت لا في instance/ الحقيقي
+    app.instance_path = os.path.dirname(os.path.abspath(database_path))
+    return app
+
+
+def load_corpus(app) -> int:
+    """تحميل quran.json إلى قاعدة البيانات المؤقتة وبناء فهرس FTS5"""
+    from scripts.create_surahs import create_surahs
+    from app.content.search_backends import sync_fulltext_index
+
+    with open(project_root / "quran.json", "r", encoding="utf-8") as f:
+        quran_data = json.load(f)
+
+    rows = [
+        {
+            "surah_id": verse["chapter"],
+            "ayah_no": verse["verse"],
+            "text_plain": verse["text"],
+            "text_normalized": normalize_arabic(verse["text"]),
+            # رقم الصفحة لا يؤثر على البحث
+            "page": 0,
+        }
+        for verses in quran_data.values()
+        for verse in verses
+    ]
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(AyahIndex), rows)
+        db.session.commit()
+        sync_fulltext_index()
+
+    create_surahs(app)
+    return len(rows)
+
+
+def measure_index(app) -> Dict:
+    """قياس زمن وذاكرة بناء فهرس البحث في الذاكرة"""
+    from app.content.search_index import build_search_index
+
+    with app.app_context():
+        start = time.perf_counter()
+        index = build_search_index()
+        elapsed = (time.perf_counter() - start) * 1000
+
+        # tracemalloc يبطئ البناء، لذلك تُقاس الذاكرة في بناء ثانٍ
+        tracemalloc.start()
+        build_search_index()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {"build_ms": round(elapsed, 1), "peak_memory_bytes": peak, "terms": len(index.postings)}
+
+
+def build_queries(app, count: int, seed: int) -> List[Tuple[str, str, Dict[str, str]]]:
+    """توليد مزيج واقعي من الاستعلامات من كلمات القرآن نفسه"""
+    from app.content.search_index import get_search_index
+
+    rng = random.Random(seed)
+    with app.app_context():
+        index = get_search_index()
+        by_frequency = sorted(index.postings, key=lambda term: -len(index.postings[term]))
+        common = by_frequency[:300]
+        rare = [term for term in by_frequency if len(index.postings[term]) <= 3 and len(term) >= 3]
+        ayahs = [text.split() for text in (normalize_arabic(t) for t in index.texts)]
+
+    def random_span(size: int) -> List[str]:
+        words = rng.choice([words for words in ayahs if len(words) >= size] or ayahs)
+        start = rng.randrange(len(words) - size + 1)
+        return words[start:start + size]
+
+    generators = {
+        "common": lambda: (rng.choice(common), {}),
+        "rare": lambda: (rng.choice(rare), {}),
+        "multi_word": lambda: (" ".join(rng.sample(random_span(6), 2)), {}),
+        "phrase": lambda: ('"{}"'.format(" ".join(random_span(rng.choice((2, 3))))), {}),
+        "proximity": lambda: ('"{} {}"~5'.format(*rng.sample(random_span(5), 2)), {}),
+        "boolean": lambda: (f"({rng.choice(common)} OR {rng.choice(common)}) -{rng.choice(common)}", {}),
+        "filtered": lambda: (f"{rng.choice(common)} juz:{rng.randint(1, 30)}", {}),
+        "deep_page": lambda: (rng.choice(common[:20]), {"page": str(rng.randint(5, 40))}),
+    }
+
+    kinds = rng.choices(list(QUERY_MIX), weights=list(QUERY_MIX.values()), k=count)
+    return [(kind, *generators[kind]()) for kind in kinds]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "mean_ms": round(sum(samples) / len(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def run_backend(app, backend: str, queries, warmup: int, use_cache: bool) -> Dict:
+    """تشغيل مزيج الاستعلامات على محرك واحد"""
+    app.config["SEARCH_BACKEND"] = backend
+
+    from app.content.search_backends import get_search_cache
+
+    with app.app_context():
+        cache = get_search_cache()
+        cache.maxsize = 1024 if use_cache else 0
+        cache.clear()
+
+    client = app.test_client()
+
+    def request(query: str, params: Dict[str, str]) -> int:
+        response = client.get("/api/v1/content/search", query_string={"q": query, **params})
+        return response.status_code
+
+    for _, query, params in queries[:warmup]:
+        request(query, params)
+
+    # القياس الزمني
+    samples = []
+    by_kind = defaultdict(list)
+    errors = 0
+    started = time.perf_counter()
+    for kind, query, params in queries:
+        start = time.perf_counter()
+        status = request(query, params)
+        elapsed = (time.perf_counter() - start) * 1000
+        samples.append(elapsed)
+        by_kind[kind].append(elapsed)
+        if status != 200:
+            errors += 1
+    duration = time.perf_counter() - started
+
+    # قياس الذاكرة في تمريرة منفصلة حتى لا يؤثر tracemalloc على الزمن
+    tracemalloc.start()
+    for _, query, params in queries:
+        request(query, params)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        **summarize(samples),
+        "throughput_qps": round(len(samples) / duration, 1),
+        "peak_memory_bytes": peak,
+        "errors": errors,
+        "by_kind": {kind: summarize(values) for kind, values in sorted(by_kind.items())},
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict, baseline_path: str) -> None:
+    """طباعة الفرق مع نتائج سابقة"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print(f"\n📊 مقارنة مع {baseline_path} ({baseline.get('commit')})")
+    for backend, current in results["backends"].items():
+        previous = baseline.get("backends", {}).get(backend)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_qps"):
+            before, after = previous[metric], current[metric]
+            change = (after - before) / before * 100 if before else 0.0
+            print(f"   {backend:<9} {metric:<15} {before:>10} → {after:>10} ({change:+.1f}%)")
+
+
+def main():
+    """الدالة الرئيسية"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="قياس أداء البحث لكل محرك على نص القرآن الكامل")
+    parser.add_argument("--queries", type=int, default=2000, help="عدد الاستعلامات")
+    parser.add_argument("--warmup", type=int, default=200, help="عدد استعلامات الإحماء")
+    parser.add_argument("--seed", type=int, default=42, help="بذرة توليد الاستعلامات")
+    parser.add_argument("--backend", choices=BACKENDS, action="append", help="المحرك (افتراضياً الكل)")
+    parser.add_argument("--cache", action="store_true", help="تفعيل ذاكرة نتائج البحث المؤقتة")
+    parser.add_argument("--output", default="search_benchmark.json", help="ملف النتائج بصيغة JSON")
+    parser.add_argument("--compare", help="ملف نتائج سابق للمقارنة")
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_benchmark_app(os.path.join(tmp, "benchmark.db"))
+
+        start = time.perf_counter()
+        total_ayahs = load_corpus(app)
+        print(f"📖 تم تحميل {total_ayahs} آية في {(time.perf_counter() - start):.1f}s")
+
+        index_stats = measure_index(app)
+        print(f"🗂️ فهرس الذاكرة: {index_stats['build_ms']}ms، "
+              f"{index_stats['peak_memory_bytes'] / 1024 / 1024:.1f}MB")
+
+        queries = build_queries(app, args.queries, args.seed)
+
+        results = {
+            "commit": git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "ayahs": total_ayahs,
+            "queries": len(queries),
+            "seed": args.seed,
+            "cache": args.cache,
+            "memory_index": index_stats,
+            "backends": {},
+        }
+
+        for backend in args.backend or BACKENDS:
+            stats = run_backend(app, backend, queries, args.warmup, args.cache)
+            results["backends"][backend] = stats
+            print(f"🔎 {backend}: p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms "
+                  f"p99={stats['p99_ms']}ms {stats['throughput_qps']} req/s "
+                  f"ذاكرة={stats['peak_memory_bytes'] / 1024 / 1024:.1f}MB أخطاء={stats['errors']}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"💾 تم حفظ النتائج في {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
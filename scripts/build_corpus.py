@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Build Corpus Script
+يحوّل نص القرآن المستورد في قاعدة البيانات إلى ملف ثنائي مضغوط يُقرأ عبر mmap
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# إضافة مسار المشروع إلى Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.content.corpus import CORPUS_VERSION, corpus_file_path, write_corpus
+from app.content.corpus_file import CorpusFile
+from app.utils.versioning import bump_version, get_version
+from app import create_app
+
+
+def main():
+    """الدالة الرئيسية"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="بناء ملف القرآن الثنائي من الآيات المستوردة في قاعدة البيانات")
+    parser.add_argument("--output", help="مسار الملف الناتج (افتراضياً instance/quran.corpus)")
+
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        output = args.output or corpus_file_path()
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+
+        # الملف يحمل إصدار النص الذي بُني له، ورفع الإصدار يجعل العمليات تنتقل إليه.
+        # بعد ذلك يعيد import_quran.py و load_snapshot.py بناءه تلقائياً عند تغيّر النص
+        version = bump_version(CORPUS_VERSION) if not args.output else get_version(CORPUS_VERSION)
+
+        start = time.perf_counter()
+        total = write_corpus(version, output)
+        if not total:
+            print("❌ لا توجد آيات في قاعدة البيانات، شغّل scripts/import_quran.py أولاً")
+            sys.exit(1)
+        print(f"✅ تم كتابة {total} آية إلى {output} "
+              f"({Path(output).stat().st_size / 1024:.0f}KB) في {(time.perf_counter() - start) * 1000:.0f}ms")
+
+        start = time.perf_counter()
+        CorpusFile(output).close()
+        print(f"📖 زمن فتح الملف: {(time.perf_counter() - start) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Build Snapshot Script
+يبني نسخة SQLite جاهزة من جداول المحتوى (السور والقراء والآيات وفهرس البحث)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# إضافة مسار المشروع إلى Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.content.snapshot import build_snapshot, snapshot_path
+from app import create_app
+
+
+def main():
+    """الدالة الرئيسية"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="بناء نسخة جاهزة من جداول المحتوى")
+    parser.add_argument("--output", help="مسار الملف الناتج (افتراضياً instance/content_snapshot.db)")
+
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        output = args.output or snapshot_path()
+
+        start = time.perf_counter()
+        try:
+            meta = build_snapshot(output)
+        except ValueError as e:
+            print(f"❌ {str(e)}")
+            sys.exit(1)
+
+        counts = ", ".join(f"{table}: {count}" for table, count in meta["counts"].items())
+        print(f"✅ تم بناء النسخة {output} ({Path(output).stat().st_size / 1024:.0f}KB) "
+              f"في {(time.perf_counter() - start) * 1000:.0f}ms")
+        print(f"📦 المراجعة: {meta['revision']} | البصمة: {meta['content_hash'][:12]} | {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,42 +4,52 @@ Quran Import Script
 يستورد القرآن الكريم من ملف quran.json المحلي إلى قاعدة البيانات
 """
 
-import json
-import sqlite3
-import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import time
 
 # إضافة مسار المشروع إلى Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from sqlalchemy import func, select
+
 from app.extensions import db
-from app.models.quran import Reciter, AyahIndex
+from app.models.quran import Reciter, AyahIndex, Translation, TranslationAyah
+from app.content.datasets import TRANSLATIONS_VERSION, load_dataset_specs, normalize_datasets
+from app.content.corpus import CORPUS_VERSION, refresh_corpus_file
+from app.content.reciters import RECITERS_VERSION
+from app.content.search_backends import sync_fulltext_index
+from app.utils.arabic import normalize_arabic
+from app.utils.bulk_load import DEFAULT_BATCH_SIZE, bulk_connection, bulk_load, load_rows, upsert
+from app.utils.import_manifest import ImportManifest, content_hash, stored_hashes
+from app.utils.json_stream import iter_records
+from app.utils.mushaf import page_of
+from app.utils.surahs import SURAHS
+from app.utils.versioning import bump_version
 from app import create_app
 
 
 class QuranImporter:
     """فئة لاستيراد القرآن الكريم"""
     
-    def __init__(self):
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, input_path: Optional[str] = None, force: bool = False):
         self.app = create_app()
-        self.quran_data = {}
+        self.batch_size = batch_size
+        self.force = force
+        self.input_path = Path(input_path) if input_path else project_root / "quran.json"
         self.reciters_data = []
         
-    def load_quran_json(self) -> Dict:
-        """تحميل بيانات القرآن من ملف quran.json المحلي"""
-        quran_file = project_root / "quran.json"
-        
-        if not quran_file.exists():
-            raise FileNotFoundError(f"ملف القرآن غير موجود: {quran_file}")
+    def load_quran_json(self) -> Iterator[Dict]:
+        """قراءة آيات القرآن تدريجياً من ملف JSON أو NDJSON دون تحميله كاملاً في الذاكرة"""
+        if not self.input_path.exists():
+            raise FileNotFoundError(f"ملف القرآن غير موجود: {self.input_path}")
         
-        print(f"جاري قراءة ملف القرآن: {quran_file}")
+        print(f"جاري قراءة ملف القرآن: {self.input_path}")
         
-        with open(quran_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return iter_records(str(self.input_path))
     
     def download_reciters_data(self) -> List[Dict]:
         """تحميل بيانات القراء المعروفين"""
@@ -79,107 +89,268 @@ class QuranImporter:
     
     def create_surah_info(self) -> Dict[int, Dict]:
         """إنشاء معلومات السور"""
-        surahs = {
-            1: {"name_arabic": "الفاتحة", "name_english": "Al-Fatiha", "total_ayahs": 7, "revelation_type": "Meccan", "juz": 1},
-            2: {"name_arabic": "البقرة", "name_english": "Al-Baqarah", "total_ayahs": 286, "revelation_type": "Medinan", "juz": 1},
-            3: {"name_arabic": "آل عمران", "name_english": "Aal-Imran", "total_ayahs": 200, "revelation_type": "Medinan", "juz": 3},
-            4: {"name_arabic": "النساء", "name_english": "An-Nisa", "total_ayahs": 176, "revelation_type": "Medinan", "juz": 4},
-            5: {"name_arabic": "المائدة", "name_english": "Al-Ma'idah", "total_ayahs": 120, "revelation_type": "Medinan", "juz": 6},
-            6: {"name_arabic": "الأنعام", "name_english": "Al-An'am", "total_ayahs": 165, "revelation_type": "Meccan", "juz": 7},
-            7: {"name_arabic": "الأعراف", "name_english": "Al-A'raf", "total_ayahs": 206, "revelation_type": "Meccan", "juz": 8},
-            8: {"name_arabic": "الأنفال", "name_english": "Al-Anfal", "total_ayahs": 75, "revelation_type": "Medinan", "juz": 9},
-            9: {"name_arabic": "التوبة", "name_english": "At-Tawbah", "total_ayahs": 129, "revelation_type": "Medinan", "juz": 10},
-            10: {"name_arabic": "يونس", "name_english": "Yunus", "total_ayahs": 109, "revelation_type": "Meccan", "juz": 11},
-            # يمكن إضافة باقي السور هنا...
-        }
-        return surahs
+        return {surah.id: surah.to_dict() for surah in SURAHS}
     
     def calculate_page_number(self, surah_id: int, ayah_no: int) -> int:
-        """حساب رقم الصفحة (تقريبي)"""
-        # هذا حساب تقريبي - يمكن استخدام جدول دقيق من مصادر موثوقة
-        base_pages = {
-            1: 1, 2: 2, 3: 50, 4: 77, 5: 106, 6: 128, 7: 151, 8: 177, 9: 187, 10: 208
-        }
-        
-        if surah_id in base_pages:
-            base_page = base_pages[surah_id]
-            # حساب تقريبي للصفحة بناءً على رقم الآية
-            estimated_page = base_page + (ayah_no // 10)
-            return max(1, estimated_page)
-        
-        # حساب عام
-        return 1 + ((surah_id - 1) * 2) + (ayah_no // 15)
+        """حساب رقم الصفحة في مصحف المدينة"""
+        # جدول حدود الصفحات في app/utils/mushaf.py
+        return page_of(surah_id, ayah_no)
     
     def import_reciters(self) -> None:
-        """استيراد القراء"""
+        """استيراد القراء (إدراج أو تحديث حسب الرمز، دون حذف الجدول)"""
         with self.app.app_context():
             print("جاري استيراد القراء...")
             
-            # حذف القراء الموجودين
-            Reciter.query.delete()
+            table = Reciter.__table__
+            
+            with db.engine.begin() as conn:
+                manifest = ImportManifest.load(conn)
+                # بصمات الصفوف المخزنة فعلاً، فلا يُتخطى قارئ عُدّل في قاعدة البيانات
+                stored = stored_hashes(conn, table, "code", exclude=("id",))
+                
+                changed = [
+                    reciter for reciter in self.reciters_data
+                    if self.force or stored.get(reciter["code"]) != content_hash([reciter])
+                ]
+                upsert(conn, table, changed, ("code",))
+                
+                # حذف القراء الذين استوردهم السكريبت سابقاً ولم يعودوا في القائمة فقط
+                # (القراء المضافون عبر لوحة الإدارة لا يُمسّون)
+                codes = {reciter["code"] for reciter in self.reciters_data}
+                removed = [code for code in manifest.keys("reciters") if code not in codes]
+                if removed:
+                    conn.execute(table.delete().where(table.c.code.in_(removed)))
+                
+                for reciter in self.reciters_data:
+                    manifest.set("reciters", reciter["code"], content_hash([reciter]))
+                for code in removed:
+                    manifest.discard("reciters", code)
+                manifest.save(conn)
             
-            for reciter_data in self.reciters_data:
-                reciter = Reciter(**reciter_data)
-                db.session.add(reciter)
+            if not changed and not removed:
+                print("✅ القراء محدّثون، لا تغييرات")
+                return
             
-            db.session.commit()
-            print(f"✅ تم استيراد {len(self.reciters_data)} قارئ")
+            bump_version(RECITERS_VERSION)
+            print(f"✅ تم تحديث {len(changed)} قارئ وحذف {len(removed)}")
     
-    def import_quran_text(self, quran_data: Dict) -> None:
-        """استيراد نص القرآن من ملف quran.json"""
+    def iter_ayah_rows(self, verses: Iterable[Dict]) -> Iterator[Dict]:
+        """توليد صفوف جدول ayah_index من سجلات الآيات"""
+        for verse in verses:
+            chapter = verse.get('chapter')
+            verse_number = verse.get('verse')
+            text_arabic = verse.get('text', '')
+            
+            if chapter and verse_number and text_arabic:
+                yield {
+                    "surah_id": chapter,
+                    "ayah_no": verse_number,
+                    "text_plain": text_arabic,
+                    "text_normalized": normalize_arabic(text_arabic),
+                    "page": self.calculate_page_number(chapter, verse_number),
+                }
+    
+    def iter_surah_rows(self, verses: Iterable[Dict]) -> Iterator[Tuple[int, List[Dict]]]:
+        """تجميع صفوف الآيات سورةً سورة (لا يبقى في الذاكرة إلا سورة واحدة)"""
+        seen = set()
+        for surah_id, rows in groupby(self.iter_ayah_rows(verses), key=lambda row: row["surah_id"]):
+            if surah_id in seen:
+                raise ValueError(f"آيات السورة {surah_id} غير متتالية في ملف الإدخال")
+            seen.add(surah_id)
+            yield surah_id, list(rows)
+    
+    def import_quran_text(self, verses: Iterable[Dict]) -> None:
+        """استيراد نص القرآن تدريجياً: تُكتب فقط السور التي تغيّر محتواها"""
         with self.app.app_context():
             print("جاري استيراد نص القرآن...")
             
-            # حذف البيانات الموجودة
-            AyahIndex.query.delete()
+            manifest = ImportManifest.load()
+            table = AyahIndex.__table__
+            start = time.perf_counter()
+            total = 0
+            changed = {}
+            seen = set()
+            removed = []
             
-            total_verses = 0
+            # بصمات الآيات المخزنة فعلاً لكل سورة، لاكتشاف قاعدة بيانات لا تطابق السجل
+            with db.engine.connect() as conn:
+                stored = {
+                    int(surah_id): digest
+                    for surah_id, digest in stored_hashes(conn, table, "surah_id").items()
+                }
             
-            # استخراج الآيات من البيانات
-            for surah_id_str, verses in quran_data.items():
-                surah_id = int(surah_id_str)
-                print(f"جاري معالجة السورة {surah_id}...")
+            if not stored:
+                # جدول فارغ: تحميل جماعي سريع (COPY على PostgreSQL) مع تسجيل البصمات
+                def all_rows() -> Iterator[Dict]:
+                    for surah_id, rows in self.iter_surah_rows(verses):
+                        seen.add(surah_id)
+                        changed[surah_id] = content_hash(rows)
+                        yield from rows
                 
-                for verse in verses:
-                    chapter = verse.get('chapter')
-                    verse_number = verse.get('verse')
-                    text_arabic = verse.get('text', '')
+                stats = bulk_load(table, all_rows(), batch_size=self.batch_size)
+                total = stats.rows
+            else:
+                # نفس إعدادات التحميل الجماعي: COPY عبر جدول مؤقت على PostgreSQL وpragmas على SQLite
+                with bulk_connection() as conn:
+                    def changed_rows() -> Iterator[Dict]:
+                        nonlocal total
+                        for surah_id, rows in self.iter_surah_rows(verses):
+                            seen.add(surah_id)
+                            total += len(rows)
+                            digest = content_hash(rows)
+                            if (
+                                not self.force
+                                and manifest.get("ayah_index", surah_id) == digest
+                                and stored.get(surah_id) == digest
+                            ):
+                                continue
+                            changed[surah_id] = digest
+                            # حذف آيات زائدة لم تعد في الملف
+                            conn.execute(table.delete().where(
+                                table.c.surah_id == surah_id,
+                                table.c.ayah_no.not_in([row["ayah_no"] for row in rows]),
+                            ))
+                            yield from rows
+                    
+                    # السجلات تُقرأ وتُكتب دفعة بعد دفعة، والصفوف الموجودة تُحدَّث في مكانها
+                    stats = load_rows(conn, table, changed_rows(), self.batch_size, keys=("surah_id", "ayah_no"))
                     
-                    if chapter and verse_number and text_arabic:
-                        page = self.calculate_page_number(chapter, verse_number)
-                        
-                        ayah_index = AyahIndex(
-                            surah_id=chapter,
-                            ayah_no=verse_number,
-                            text_plain=text_arabic,
-                            page=page
-                        )
-                        db.session.add(ayah_index)
-                        total_verses += 1
+                    # حذف السور الموجودة في قاعدة البيانات والغائبة عن الملف
+                    # (ملف بلا آيات يُعدّ خطأ في الإدخال فلا يحذف شيئاً)
+                    removed = sorted(set(stored) - seen) if seen else []
+                    if removed:
+                        conn.execute(table.delete().where(table.c.surah_id.in_(removed)))
+                        print(f"🗑️ تم حذف {len(removed)} سورة لم تعد في الملف")
+            
+            # بصمات السور الغائبة عن الملف لا تصف أي صفوف بعد الآن
+            stale = [key for key in manifest.keys("ayah_index") if int(key) not in seen] if seen else []
+            for key in stale:
+                manifest.discard("ayah_index", key)
+            
+            seconds = time.perf_counter() - start
+            if not changed and not removed:
+                if stale:
+                    manifest.save()
+                print(f"✅ لم يتغير أي من {total} آية، لا حاجة للتحديث ({seconds:.3f}s)")
+                return
+            
+            print(f"⚡ تم تحديث {stats.rows} آية في {len(changed)} سورة من أصل {total} آية "
+                  f"في {seconds:.3f}s ({stats.rows_per_second:,.0f} صف/ثانية)")
+            
+            # مزامنة فهرس البحث النصي الكامل (FTS5 أو tsvector) للسور المتغيرة والمحذوفة فقط
+            start = time.perf_counter()
+            sync_fulltext_index([*changed, *removed])
+            print(f"🗂️ تمت مزامنة فهرس البحث في {time.perf_counter() - start:.3f}s")
+            
+            for surah_id, digest in changed.items():
+                manifest.set("ayah_index", surah_id, digest)
+            manifest.save()
+            
+            # إعلام العمليات الأخرى بتغيّر النص لإعادة بناء فهرس البحث
+            version = bump_version(CORPUS_VERSION)
+            
+            # إعادة بناء ملف القرآن الثنائي (إن وُجد) من الصفوف المستوردة، لتبقى العمليات على mmap
+            if refresh_corpus_file(version):
+                print("📖 تم تحديث ملف القرآن الثنائي")
+            print(f"✅ تم استيراد القرآن ({len(changed)} سورة متغيرة، {len(removed)} سورة محذوفة)")
+    
+    def import_datasets(self, datasets_file: str, workers: Optional[int] = None) -> None:
+        """استيراد ملفات الترجمات والتفاسير بالتوازي: التطبيع في مجموعة عمليات والكتابة من عملية واحدة"""
+        specs = load_dataset_specs(datasets_file)
+        
+        with self.app.app_context():
+            print(f"جاري استيراد {len(specs)} ملف ترجمة/تفسير...")
+            
+            manifest = ImportManifest.load()
+            translations = Translation.__table__
+            ayahs = TranslationAyah.__table__
+            
+            with db.engine.connect() as conn:
+                stored = dict(conn.execute(
+                    select(translations.c.code, func.count(ayahs.c.ayah_no))
+                    .select_from(translations.outerjoin(ayahs))
+                    .group_by(translations.c.code)
+                ).all())
+            
+            # تخطي الملفات التي لم يتغير محتواها منذ آخر استيراد
+            digests = {}
+            for spec in specs:
+                digest = spec.digest()
+                # ملف بلا سجلات صالحة يبقى بلا آيات، فيكفي وجود صفّه في جدول translations
+                if not self.force and manifest.get("translations", spec.code) == digest and spec.code in stored:
+                    print(f"⏭️ {spec.code}: لا تغييرات")
+                    continue
+                digests[spec.code] = digest
+            pending = [spec for spec in specs if spec.code in digests]
+            if not pending:
+                print("✅ كل الملفات محدّثة، لا حاجة للاستيراد")
+                return
+            
+            with db.engine.begin() as conn:
+                upsert(conn, translations, [spec.to_row() for spec in pending], ("code",))
+                ids = dict(conn.execute(
+                    select(translations.c.code, translations.c.id)
+                    .where(translations.c.code.in_(list(digests)))
+                ).all())
+            
+            # العمليات الفرعية تطبّع النصوص بالتوازي، وهذه العملية وحدها تكتب في قاعدة البيانات
+            start = time.perf_counter()
+            skipped = 0
+            results = normalize_datasets(pending, workers=workers)
+            current = next(results, None)
+            for spec in pending:
+                code = spec.code
                 
-                # حفظ كل 100 آية لتجنب استهلاك الذاكرة
-                if total_verses % 100 == 0:
-                    db.session.commit()
-                    print(f"تم حفظ {total_verses} آية...")
-            
-            # حفظ باقي الآيات
-            db.session.commit()
-            print(f"✅ تم استيراد {total_verses} آية بنجاح!")
+                def rows() -> Iterator[Dict]:
+                    nonlocal current, skipped
+                    # التكرار قد يقع في دفعتين مختلفتين، فيُتحقق منه هنا أيضاً
+                    seen = set()
+                    while current is not None and current[0] is spec:
+                        _, chunk_rows, chunk_skipped = current
+                        skipped += chunk_skipped
+                        for row in chunk_rows:
+                            key = (row["surah_id"], row["ayah_no"])
+                            if key in seen:
+                                skipped += 1
+                                continue
+                            seen.add(key)
+                            row["translation_id"] = ids[code]
+                            yield row
+                        current = next(results, None)
+                
+                # الحذف يتم دائماً، حتى لو لم يبقَ في الملف أي سجل صالح
+                stats = bulk_load(
+                    ayahs,
+                    rows(),
+                    batch_size=self.batch_size,
+                    replace=True,
+                    where=ayahs.c.translation_id == ids[code],
+                )
+                print(f"⚡ {code}: {stats.rows} آية في {stats.seconds:.3f}s "
+                      f"({stats.rows_per_second:,.0f} صف/ثانية)")
+                
+                manifest.set("translations", code, digests[code])
+                manifest.save()
+            
+            total = time.perf_counter() - start
+            print(f"✅ تم استيراد {len(pending)} ملف في {total:.3f}s"
+                  + (f" (تم تخطي {skipped} سجل غير صالح)" if skipped else ""))
+            bump_version(TRANSLATIONS_VERSION)
     
     def run_import(self) -> None:
         """تشغيل عملية الاستيراد"""
         try:
             print("🚀 بدء استيراد القرآن الكريم...")
             
-            # تحميل بيانات القرآن
-            self.quran_data = self.load_quran_json()
+            # قارئ تدريجي لبيانات القرآن (لا يُقرأ الملف إلا أثناء الاستيراد)
+            verses = self.load_quran_json()
             
             # استيراد القراء
             self.reciters_data = self.download_reciters_data()
             self.import_reciters()
             
             # استيراد القرآن
-            self.import_quran_text(self.quran_data)
+            self.import_quran_text(verses)
             
             print("✅ تم استيراد القرآن بنجاح!")
             
@@ -194,10 +365,15 @@ def main():
     
     parser = argparse.ArgumentParser(description="استيراد القرآن الكريم من ملف quran.json")
     parser.add_argument("--test", action="store_true", help="تشغيل في وضع الاختبار")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="عدد الصفوف في كل دفعة إدراج")
+    parser.add_argument("--input", help="ملف الآيات بصيغة JSON أو NDJSON (.ndjson / .jsonl)، افتراضياً quran.json")
+    parser.add_argument("--force", action="store_true", help="إعادة كتابة كل السور والقراء متجاهلاً سجل البصمات")
+    parser.add_argument("--datasets", help="ملف JSON يسرد ملفات الترجمات والتفاسير لاستيرادها بالتوازي بدلاً من نص القرآن")
+    parser.add_argument("--workers", type=int, help="عدد عمليات التطبيع (افتراضياً عدد الأنوية)")
     
     args = parser.parse_args()
     
-    importer = QuranImporter()
+    importer = QuranImporter(batch_size=args.batch_size, input_path=args.input, force=args.force)
     
     if args.test:
         print("🧪 تشغيل في وضع الاختبار...")
@@ -205,7 +381,10 @@ def main():
         return
     
     try:
-        importer.run_import()
+        if args.datasets:
+            importer.import_datasets(args.datasets, workers=args.workers)
+        else:
+            importer.run_import()
     except KeyboardInterrupt:
         print("\n⏹️ تم إيقاف العملية بواسطة المستخدم")
     except Exception as e:
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Load Snapshot Script
+يهيّئ قاعدة البيانات من نسخة المحتوى الجاهزة بدلاً من إعادة الاستيراد
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# إضافة مسار المشروع إلى Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.content.snapshot import load_snapshot, read_snapshot_meta, snapshot_path
+from app import create_app
+
+
+def main():
+    """الدالة الرئيسية"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="تهيئة قاعدة البيانات من نسخة المحتوى الجاهزة")
+    parser.add_argument("--snapshot", help="مسار النسخة (افتراضياً instance/content_snapshot.db)")
+
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        path = args.snapshot or snapshot_path()
+
+        start = time.perf_counter()
+        try:
+            meta = read_snapshot_meta(path)
+            method = load_snapshot(path)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"❌ {str(e)}")
+            sys.exit(1)
+
+        print(f"✅ تم تحميل النسخة {meta['content_hash'][:12]} (المراجعة {meta['revision']}) "
+              f"بطريقة {method} في {(time.perf_counter() - start) * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
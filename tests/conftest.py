@@ -0,0 +1,89 @@
+"""
+Shared fixtures: applications backed by temporary SQLite databases
+"""
+import os
+from pathlib import Path
+
+import pytest
+from flask_migrate import upgrade
+
+from app import create_app
+from app.config import TestingConfig, config
+from app.extensions import db
+from scripts.import_quran import QuranImporter
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture(scope="session", autouse=True)
+def testing_env():
+    """Make every ``create_app()`` (scripts included) use the testing configuration."""
+    previous = os.environ.get("FLASK_ENV")
+    os.environ["FLASK_ENV"] = "pytest"
+    yield
+    if previous is None:
+        os.environ.pop("FLASK_ENV", None)
+    else:
+        os.environ["FLASK_ENV"] = previous
+
+
+@pytest.fixture(scope="session")
+def make_app(tmp_path_factory):
+    """Return a factory of migrated applications, each with its own database and instance folder."""
+    def factory(name: str = "app", migrate: bool = True):
+        instance_path = tmp_path_factory.mktemp(name)
+
+        class PytestConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{instance_path / 'test.db'}"
+            RATELIMIT_ENABLED = False
+            LOG_LEVEL = "WARNING"
+            LOG_FORMAT = "text"
+
+        config["pytest"] = PytestConfig
+        app = create_app()
+        # Version stamps, the import manifest and the snapshot live here
+        app.instance_path = str(instance_path)
+
+        if migrate:
+            with app.app_context():
+                upgrade(directory=str(PROJECT_ROOT / "migrations"))
+                # The surahs table predates the migrations and is not created by them
+                db.create_all()
+        return app
+
+    return factory
+
+
+@pytest.fixture(scope="session")
+def run_import():
+    """Return a function importing the reciters and an ayahs file into an application."""
+    def run(app, input_path=None, force: bool = False) -> QuranImporter:
+        importer = QuranImporter(input_path=input_path, force=force)
+        importer.app = app
+        importer.reciters_data = importer.download_reciters_data()
+        importer.import_reciters()
+        importer.import_quran_text(importer.load_quran_json())
+        return importer
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def quran_app(make_app, run_import):
+    """An application holding the full quran.json corpus (read-only for tests)."""
+    app = make_app("quran")
+    run_import(app)
+    return app
+
+
+@pytest.fixture
+def client(quran_app):
+    return quran_app.test_client()
+
+
+@pytest.fixture
+def quran_context(quran_app):
+    with quran_app.app_context():
+        yield quran_app
+        db.session.remove()
@@ -0,0 +1,77 @@
+import pytest
+
+from app.content.search_backends import MemoryBackend, get_fulltext_backend
+from app.content.search_query import parse_query
+from app.utils.arabic import normalize_arabic, word_spans
+
+
+@pytest.mark.parametrize("uthmani, plain", [
+    # Dagger alef
+    ("ٱلۡكِتَٰبَ", "الكتاب"),
+    ("إِبۡرَٰهِـۧمَ", "إبراهيم"),
+    ("إِبۡرَٰهِيمَ", "إبراهيم"),
+    ("ٱلۡعَٰلَمِينَ", "العالمين"),
+    # Alef written as waw
+    ("ٱلسَّمَٰوَٰتِ", "السماوات"),
+    ("ٱلصَّلَوٰةَ", "الصلاة"),
+    ("ٱلزَّكَوٰةَ", "الزكاة"),
+    ("ٱلۡحَيَوٰةِ", "الحياة"),
+    ("ٱلرِّبَوٰاْ", "الربا"),
+    # Alef written as ya
+    ("عَلَىٰ", "على"),
+    ("مُوسَىٰ", "موسى"),
+    ("ٱلتَّوۡرَىٰةَ", "التوراة"),
+    ("هُدَىٰهُمۡ", "هداهم"),
+    # Stems without a written long alef in plain spelling
+    ("هَٰذَا", "هذا"),
+    ("ذَٰلِكَ", "ذلك"),
+    ("هَٰٓؤُلَآءِ", "هؤلاء"),
+    ("أُوْلَٰٓئِكَ", "أولئك"),
+    ("وَلَٰكِنَّ", "ولكن"),
+    ("إِلَٰهٌ", "إله"),
+    ("ٱلرَّحۡمَٰنِ", "الرحمن"),
+    ("ٱلۡمَلَٰٓئِكَةُ", "الملائكة"),
+    # Hamza and the small letters
+    ("إِسۡرَـٰٓءِيلَ", "إسرائيل"),
+    ("ٱلنَّبِيِّـۧنَ", "النبيين"),
+    ("نُـۨجِي", "ننجي"),
+    # The joined vocative
+    ("يَٰٓأَيُّهَا", "يا أيها"),
+    ("وَيَٰقَوۡمِ", "ويا قوم"),
+])
+def test_uthmani_spelling_matches_plain_spelling(uthmani, plain):
+    assert normalize_arabic(uthmani) == normalize_arabic(plain)
+
+
+def test_marks_and_letter_variants():
+    assert normalize_arabic("بِسۡمِ ٱللَّهِ ۞ ") == "بسم الله"
+    assert normalize_arabic("أإآٱ ؤ ئ ى ة ک") == "اااا و ي ي ه ك"
+    assert normalize_arabic("ءَامَنُواْ") == "امنوا"
+    assert normalize_arabic("  ") == ""
+
+
+def test_word_spans_follow_tokens():
+    text = "۞ يَٰٓأَيُّهَا ٱلَّذِينَ ءَامَنُواْ"
+    tokens = normalize_arabic(text).split()
+    spans = word_spans(text)
+    assert tokens == ["يا", "ايها", "الذين", "امنوا"]
+    assert len(spans) == len(tokens)
+    # The vocative and its noun share the span of the written word
+    assert spans[0] == spans[1] == (2, 2 + len("يَٰٓأَيُّهَا"))
+    assert text[slice(*spans[3])] == "ءَامَنُواْ"
+
+
+@pytest.mark.parametrize("query, minimum", [
+    ("الكتاب", 150),
+    ("الصلاة", 50),
+    ("إبراهيم", 55),
+    ("السماوات", 150),
+    ("الزكاة", 25),
+    ('"يا أيها"', 140),
+    ("هذا", 150),
+    ("موسى", 120),
+])
+def test_plain_spelling_finds_the_uthmani_text(quran_context, query, minimum):
+    for backend in (MemoryBackend(), get_fulltext_backend()):
+        _, total, _ = backend.search(parse_query(query), offset=0, limit=1)
+        assert total >= minimum, (backend.name, query)
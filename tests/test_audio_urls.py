@@ -0,0 +1,67 @@
+import uuid
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app.content.routes import MAX_AUDIO_BATCH
+
+
+URL = "/api/v1/content/audio-urls"
+
+
+@pytest.fixture
+def headers(quran_app):
+    with quran_app.app_context():
+        token = create_access_token(identity=str(uuid.uuid4()))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_ranges_expand_in_mushaf_order(client, headers):
+    response = client.post(URL, json={"ayahs": ["1:6..2:2", "2:255"], "reciter_id": 1, "variants": [2, 2, 1]}, headers=headers)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["reciter"]["id"] == 1
+    assert [variant["id"] for variant in data["variants"]] == [2]
+    assert [(item["surah_id"], item["ayah_no"]) for item in data["items"]] == [
+        (1, 6), (1, 7), (2, 1), (2, 2), (2, 255),
+    ]
+    assert data["total"] == 5
+    assert all(set(item["variants"]) == {"2"} for item in data["items"])
+
+
+def test_requires_authentication(client):
+    assert client.post(URL, json={"ayahs": ["1:1"]}).status_code == 401
+
+
+@pytest.mark.parametrize("body", [
+    [1],
+    "1:1",
+    {"ayahs": []},
+    {"ayahs": "1:1"},
+    {"ayahs": ["1:8"]},
+    {"ayahs": ["2:5..2:1"]},
+    {"ayahs": ["x"]},
+    {"ayahs": ["1:1"], "reciter_id": "1"},
+    {"ayahs": ["1:1"], "reciter_id": True},
+    {"ayahs": ["1:1"], "variants": [True]},
+    {"ayahs": ["1:1"], "variants": 2},
+    {"ayahs": ["1:1..114:6"]},
+])
+def test_invalid_requests(client, headers, body):
+    assert client.post(URL, json=body, headers=headers).status_code == 400
+
+
+def test_invalid_json(client, headers):
+    response = client.post(URL, data="{", content_type="application/json", headers=headers)
+    assert response.status_code == 400
+
+
+def test_batch_limit(client, headers):
+    # 2:1..3:200 is 486 ayahs, so three of them go over the limit
+    assert client.post(URL, json={"ayahs": ["2:1..3:200"] * 2, "reciter_id": 1}, headers=headers).status_code == 200
+    assert 3 * 486 > MAX_AUDIO_BATCH
+    assert client.post(URL, json={"ayahs": ["2:1..3:200"] * 3}, headers=headers).status_code == 400
+
+
+def test_unknown_reciter(client, headers):
+    assert client.post(URL, json={"ayahs": ["1:1"], "reciter_id": 999}, headers=headers).status_code == 404
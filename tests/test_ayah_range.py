@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from app.content.routes import MAX_BUFFERED_RANGE
+
+
+URL = "/api/v1/content/ayahs"
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_ndjson_range_across_surahs(client):
+    response = client.get(URL, query_string={"range": "1:6..2:2"})
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    ayahs = ndjson(response)
+    assert [(ayah["surah_id"], ayah["ayah_no"]) for ayah in ayahs] == [(1, 6), (1, 7), (2, 1), (2, 2)]
+
+
+def test_json_range(client):
+    response = client.get(URL, query_string={"range": "2:255", "format": "json"})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["total"] == 1
+    assert [(ayah["surah_id"], ayah["ayah_no"]) for ayah in data["ayahs"]] == [(2, 255)]
+
+
+@pytest.mark.parametrize("output_format", ["ndjson", "json"])
+def test_long_range_is_streamed_whole(client, output_format):
+    # Longer than MAX_BUFFERED_RANGE, so generated batch by batch
+    response = client.get(URL, query_string={"range": "1:1..114:6", "format": output_format})
+    assert response.status_code == 200
+    ayahs = ndjson(response) if output_format == "ndjson" else response.get_json()["ayahs"]
+    assert len(ayahs) == 6236 > MAX_BUFFERED_RANGE
+    assert (ayahs[0]["surah_id"], ayahs[-1]["surah_id"]) == (1, 114)
+
+    # Same ayahs as a buffered response
+    buffered = client.get(URL, query_string={"range": "2:1..2:286", "format": output_format})
+    expected = ndjson(buffered) if output_format == "ndjson" else buffered.get_json()["ayahs"]
+    assert ayahs[7:7 + 286] == expected
+
+
+@pytest.mark.parametrize("query", [
+    {},
+    {"range": "2:1-2:5"},
+    {"range": "2:5..2:1"},
+    {"range": "1:8"},
+    {"range": "115:1"},
+    {"range": "1:1", "format": "csv"},
+])
+def test_invalid_ranges(client, query):
+    assert client.get(URL, query_string=query).status_code == 400
+
+
+@pytest.mark.parametrize("url", [
+    "/api/v1/content/search?q=الله&page=0",
+    "/api/v1/content/search?q=الله&page=-1",
+    "/api/v1/content/search?q=الله&per_page=0",
+    "/api/v1/content/reciters?page=0",
+    "/api/v1/content/reciters?per_page=-5",
+])
+def test_pages_start_at_one(client, url):
+    assert client.get(url).status_code == 400
+
+
+def test_page_is_echoed(client):
+    data = client.get("/api/v1/content/search", query_string={"q": "الله", "page": 2, "per_page": 5}).get_json()
+    assert data["pagination"]["page"] == 2
+    assert len(data["results"]) == 5
@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.quran import ImportDigest
+from app.utils.bulk_load import LoadStats, batched, bulk_connection, bulk_load, load_rows, upsert
+
+
+TABLE = ImportDigest.__table__
+
+
+def rows(count, section="a", digest="x"):
+    return ({"section": section, "key": str(i), "digest": digest} for i in range(count))
+
+
+def stored():
+    return {
+        (row.section, row.key): row.digest
+        for row in db.session.execute(select(TABLE)).all()
+    }
+
+
+@pytest.fixture
+def bulk_app(make_app):
+    app = make_app("bulk")
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+def test_batched():
+    assert [len(batch) for batch in batched(rows(5), 2)] == [2, 2, 1]
+    assert list(batched([], 2)) == []
+
+
+def test_load_stats():
+    stats = LoadStats(1000, 0.5)
+    assert stats.rows_per_second == 2000
+    assert str(stats) == "1000 rows in 0.500s (2,000 rows/s)"
+    assert LoadStats(0, 0).rows_per_second == 0
+
+
+def test_bulk_load(bulk_app):
+    stats = bulk_load(TABLE, rows(5, "a"), batch_size=2)
+    assert stats.rows == 5
+    bulk_load(TABLE, rows(3, "b"), batch_size=2)
+    assert len(stored()) == 8
+
+    # Only the rows matching ``where`` are replaced
+    bulk_load(TABLE, rows(2, "a", "y"), replace=True, where=TABLE.c.section == "a")
+    assert stored() == {
+        ("a", "0"): "y", ("a", "1"): "y",
+        ("b", "0"): "x", ("b", "1"): "x", ("b", "2"): "x",
+    }
+
+
+def test_failed_load_writes_nothing(bulk_app):
+    bulk_load(TABLE, rows(2))
+    with pytest.raises(IntegrityError):
+        # The second batch collides with the existing rows
+        bulk_load(TABLE, [*rows(3, "b"), *rows(2)], batch_size=3)
+    assert len(stored()) == 2
+
+
+def test_pragmas_are_restored(bulk_app):
+    def pragmas():
+        with db.engine.connect() as conn:
+            return (
+                conn.exec_driver_sql("PRAGMA journal_mode").scalar(),
+                conn.exec_driver_sql("PRAGMA synchronous").scalar(),
+            )
+
+    before = pragmas()
+    with bulk_connection() as conn:
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 0
+        load_rows(conn, TABLE, rows(3))
+    assert pragmas() == before
+
+
+def test_load_rows_with_keys_updates_in_place(bulk_app):
+    bulk_load(TABLE, rows(3))
+    with bulk_connection() as conn:
+        stats = load_rows(conn, TABLE, rows(4, digest="y"), batch_size=3, keys=("section", "key"))
+    assert stats.rows == 4
+    assert stored() == {("a", str(i)): "y" for i in range(4)}
+
+
+def test_upsert(bulk_app):
+    with db.engine.begin() as conn:
+        assert upsert(conn, TABLE, list(rows(2)), ("section", "key")) == 2
+        assert upsert(conn, TABLE, [{"section": "a", "key": "1", "digest": "z"}], ("section", "key")) == 1
+        assert upsert(conn, TABLE, [], ("section", "key")) == 0
+    assert stored() == {("a", "0"): "x", ("a", "1"): "z"}
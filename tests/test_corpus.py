@@ -0,0 +1,61 @@
+import pytest
+
+from app.content.corpus import QuranCorpus, get_corpus
+from app.utils.mushaf import juz_range, page_of, page_range
+
+
+ROWS = [
+    (2, 2, "ذلك الكتاب", 2),
+    (1, 1, "بسم الله", 1),
+    (2, 1, "الم", 2),
+    (1, 2, "الحمد لله", 1),
+]
+
+
+def test_rows_are_sorted_into_mushaf_order():
+    corpus = QuranCorpus(ROWS, version=7)
+    assert len(corpus) == 4
+    assert corpus.version == 7
+    assert corpus.ordinal(2, 1) == 2
+    assert corpus.location(2) == (2, 1)
+    assert [ayah["text_arabic"] for ayah in corpus.iter_ayahs(0, 3)] == [
+        "بسم الله", "الحمد لله", "الم", "ذلك الكتاب",
+    ]
+
+
+def test_rows_after_a_gap_are_dropped():
+    # Ayah 4 cannot be placed without ayah 3, and surah 115 does not exist
+    corpus = QuranCorpus(ROWS + [(2, 4, "x", 2), (115, 1, "x", 604)])
+    assert len(corpus) == 4
+    assert corpus.ayah(2, 4) is None
+
+
+@pytest.mark.parametrize("surah_id, ayah_no", [(0, 1), (115, 1), (1, 0), (1, 3), (3, 1)])
+def test_missing_ayahs(surah_id, ayah_no):
+    corpus = QuranCorpus(ROWS)
+    assert corpus.ordinal(surah_id, ayah_no) is None
+    assert corpus.ayah(surah_id, ayah_no) is None
+
+
+def test_partial_corpus_divisions():
+    corpus = QuranCorpus(ROWS)
+    assert [(a["surah_id"], a["ayah_no"]) for a in corpus.division_ayahs(page_range(1))] == [(1, 1), (1, 2)]
+    assert [(a["surah_id"], a["ayah_no"]) for a in corpus.division_ayahs(page_range(2))] == [(2, 1), (2, 2)]
+
+
+def test_full_corpus(quran_context):
+    corpus = get_corpus()
+    assert corpus is get_corpus()
+    assert len(corpus) == 6236
+    ayah = corpus.ayah(2, 255)
+    assert (ayah["page"], ayah["juz"], ayah["hizb"]) == (page_of(2, 255), 3, 5)
+    assert [a["juz"] for a in corpus.division_ayahs(juz_range(30))] == [30] * len(juz_range(30))
+    for ordinal in (0, 7, 293, 6235):
+        assert corpus.ordinal(*corpus.location(ordinal)) == ordinal
+
+
+def test_ayah_route(client, quran_context):
+    response = client.get("/api/v1/content/surah/1/ayah/1")
+    assert response.status_code == 200
+    assert response.get_json()["ayah"] == get_corpus().ayah(1, 1)
+    assert client.get("/api/v1/content/surah/1/ayah/8").status_code == 400
@@ -0,0 +1,94 @@
+import pytest
+
+from app.content.corpus import QuranCorpus, build_corpus, corpus_file_path, write_corpus
+from app.content.corpus_file import (
+    FORMAT_VERSION,
+    CorpusFile,
+    CorpusFormatError,
+    TextView,
+    write_corpus_file,
+)
+
+
+ROWS = [
+    (1, 1, "بِسۡمِ ٱللَّهِ", 1),
+    (1, 2, "ٱلۡحَمۡدُ لِلَّهِ", 1),
+    (2, 1, "الٓمٓ", 2),
+    (114, 1, "قُلۡ أَعُوذُ", 604),
+]
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    path = str(tmp_path / "quran.corpus")
+    assert write_corpus_file(path, reversed(ROWS), corpus_version=42) == len(ROWS)
+    return path
+
+
+def test_round_trip(corpus_path):
+    corpus_file = CorpusFile(corpus_path)
+    try:
+        assert len(corpus_file) == len(ROWS)
+        assert corpus_file.corpus_version == 42
+        assert list(corpus_file.iter_ayahs()) == ROWS
+        assert corpus_file.ordinal(114, 1) == 3
+        assert corpus_file.ordinal(2, 2) is None
+        assert corpus_file.location(2) == (2, 1)
+        assert bytes(corpus_file.raw_text(2)) == "الٓمٓ".encode("utf-8")
+    finally:
+        corpus_file.close()
+
+
+def test_mapped_corpus_matches_the_in_memory_one(corpus_path):
+    corpus_file = CorpusFile(corpus_path)
+    try:
+        mapped = QuranCorpus.from_file(corpus_file, version=42)
+        assert isinstance(mapped.texts, TextView)
+        expected = QuranCorpus(ROWS, version=42)
+        assert list(mapped.iter_ayahs(0, 3)) == list(expected.iter_ayahs(0, 3))
+        assert mapped.ayah(114, 1) == expected.ayah(114, 1)
+    finally:
+        corpus_file.close()
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data[:10],
+    lambda data: data[:-1],
+    lambda data: b"XXXX" + data[4:],
+    lambda data: data[:4] + bytes([FORMAT_VERSION + 1, 0]) + data[6:],
+])
+def test_invalid_files(corpus_path, damage):
+    with open(corpus_path, "rb") as f:
+        data = f.read()
+    with open(corpus_path, "wb") as f:
+        f.write(damage(data))
+    with pytest.raises(CorpusFormatError):
+        CorpusFile(corpus_path)
+
+
+@pytest.fixture
+def app_corpus_file(quran_context, monkeypatch, tmp_path):
+    # Outside the shared application's instance folder (an absolute name wins the join)
+    monkeypatch.setitem(quran_context.config, "CORPUS_FILE", str(tmp_path / "app.corpus"))
+    return corpus_file_path()
+
+
+def test_build_prefers_a_current_file(app_corpus_file):
+    loaded = build_corpus(5)
+    assert not isinstance(loaded.texts, TextView)
+
+    write_corpus(5)
+    mapped = build_corpus(5)
+    assert isinstance(mapped.texts, TextView)
+    assert list(mapped.iter_ayahs(0, len(mapped) - 1)) == list(loaded.iter_ayahs(0, len(loaded) - 1))
+
+    # A file built for another corpus version is ignored
+    assert not isinstance(build_corpus(6).texts, TextView)
+
+
+def test_build_ignores_a_broken_file(app_corpus_file):
+    with open(app_corpus_file, "wb") as f:
+        f.write(b"broken")
+    corpus = build_corpus(0)
+    assert len(corpus) == 6236
+    assert not isinstance(corpus.texts, TextView)
@@ -0,0 +1,129 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.content.datasets import (
+    DatasetSpec,
+    load_dataset_specs,
+    normalize_chunk,
+    normalize_datasets,
+    normalize_text,
+)
+from app.extensions import db
+from app.models.quran import Translation, TranslationAyah
+from scripts.import_quran import QuranImporter
+
+
+def write_dataset(path, records):
+    path.write_text("\n".join(json.dumps(record, ensure_ascii=False) for record in records), encoding="utf-8")
+    return path
+
+
+def write_specs(tmp_path, entries):
+    path = tmp_path / "datasets.json"
+    path.write_text(json.dumps({"datasets": entries}), encoding="utf-8")
+    return str(path)
+
+
+def test_load_specs(tmp_path):
+    specs = load_dataset_specs(write_specs(tmp_path, [
+        {"code": "en", "name": "English", "language": "en", "path": "en.jsonl"},
+        {"code": "tafsir", "name": "Tafsir", "language": "ar", "kind": "tafsir", "path": "sub/t.jsonl"},
+    ]))
+    assert [(spec.code, spec.kind) for spec in specs] == [("en", "translation"), ("tafsir", "tafsir")]
+    # Paths are relative to the datasets file
+    assert specs[1].path == str(tmp_path / "sub" / "t.jsonl")
+
+
+@pytest.mark.parametrize("entries, message", [
+    ([{"code": "en", "name": "English", "path": "en.jsonl"}], "missing language"),
+    ([{"code": "en", "name": "English", "language": "en", "kind": "notes", "path": "en.jsonl"}], "Invalid dataset kind"),
+    ([{"code": "en", "name": "A", "language": "en", "path": "a.jsonl"},
+      {"code": "en", "name": "B", "language": "en", "path": "b.jsonl"}], "Duplicate dataset codes: en"),
+])
+def test_invalid_specs(tmp_path, entries, message):
+    with pytest.raises(ValueError, match=message):
+        load_dataset_specs(write_specs(tmp_path, entries))
+
+
+def test_normalize_text():
+    assert normalize_text("Héllo, WORLD!", "en") == "hello world"
+    assert normalize_text("بِسْمِ ٱللَّهِ، الرَّحْمَٰنِ", "ar") == "بسم الله الرحمن"
+
+
+def test_normalize_chunk():
+    rows, skipped = normalize_chunk("en", [
+        {"chapter": 1, "verse": 1, "text": " In the name "},
+        {"chapter": 1, "verse": 1, "text": "Repeated"},
+        {"chapter": 1, "verse": 8, "text": "No such ayah"},
+        {"chapter": "1", "verse": 2, "text": "Not a number"},
+        {"chapter": 1, "verse": 2, "text": "  "},
+        {"chapter": 1, "verse": 2, "text": "Praise"},
+    ])
+    assert rows == [
+        {"surah_id": 1, "ayah_no": 1, "text": "In the name", "text_normalized": "in the name"},
+        {"surah_id": 1, "ayah_no": 2, "text": "Praise", "text_normalized": "praise"},
+    ]
+    assert skipped == 4
+
+
+def test_results_keep_file_order(tmp_path):
+    specs = [
+        DatasetSpec(code, code, "en", "translation", str(write_dataset(tmp_path / f"{code}.jsonl", [
+            {"chapter": 2, "verse": verse, "text": f"{code} {verse}"} for verse in range(1, 12)
+        ])))
+        for code in ("a", "b")
+    ]
+    specs.insert(1, DatasetSpec("empty", "Empty", "en", "translation", str(write_dataset(tmp_path / "empty.jsonl", []))))
+
+    results = list(normalize_datasets(specs, workers=2, chunk_size=3))
+    assert [spec.code for spec, _, _ in results] == ["a"] * 4 + ["b"] * 4
+    texts = [row["text"] for _, rows, _ in results for row in rows]
+    assert texts == [f"{code} {verse}" for code in ("a", "b") for verse in range(1, 12)]
+
+
+@pytest.fixture
+def importer(make_app):
+    importer = QuranImporter()
+    importer.app = make_app("datasets")
+    return importer
+
+
+def dataset_rows(app):
+    with app.app_context():
+        rows = db.session.execute(
+            select(Translation.code, TranslationAyah.surah_id, TranslationAyah.ayah_no, TranslationAyah.text)
+            .join(TranslationAyah, TranslationAyah.translation_id == Translation.id)
+            .order_by(Translation.code, TranslationAyah.surah_id, TranslationAyah.ayah_no)
+        ).all()
+        db.session.remove()
+    return [tuple(row) for row in rows]
+
+
+def test_import_datasets(importer, tmp_path, capsys):
+    english = write_dataset(tmp_path / "en.jsonl", [
+        {"chapter": 1, "verse": 1, "text": "In the name"},
+        {"chapter": 1, "verse": 2, "text": "Praise"},
+    ])
+    write_dataset(tmp_path / "fa.jsonl", [{"chapter": 1, "verse": 1, "text": "به نام"}])
+    specs = write_specs(tmp_path, [
+        {"code": "en", "name": "English", "language": "en", "path": "en.jsonl"},
+        {"code": "fa", "name": "Persian", "language": "fa", "path": "fa.jsonl"},
+    ])
+
+    importer.import_datasets(specs, workers=1)
+    assert dataset_rows(importer.app) == [
+        ("en", 1, 1, "In the name"), ("en", 1, 2, "Praise"), ("fa", 1, 1, "به نام"),
+    ]
+
+    # Unchanged files are skipped
+    capsys.readouterr()
+    importer.import_datasets(specs, workers=1)
+    assert "كل الملفات محدّثة" in capsys.readouterr().out
+
+    # A changed file replaces its rows; an emptied one keeps none
+    write_dataset(english, [{"chapter": 1, "verse": 3, "text": "Lord"}])
+    write_dataset(tmp_path / "fa.jsonl", [])
+    importer.import_datasets(specs, workers=1)
+    assert dataset_rows(importer.app) == [("en", 1, 3, "Lord")]
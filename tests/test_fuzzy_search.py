@@ -0,0 +1,72 @@
+import pytest
+
+from app.content.search_backends import FuzzyBackend, MemoryBackend
+from app.content.search_index import get_search_index
+from app.content.search_query import parse_query
+
+
+ALL = 10_000
+
+
+def run(backend, query: str):
+    results, total, facets = backend.search(parse_query(query), offset=0, limit=ALL)
+    return results, total, facets
+
+
+def keys(results):
+    return [(result["surah_id"], result["ayah_no"]) for result in results]
+
+
+def test_misspelled_word_finds_the_ayahs(quran_context):
+    # الرحمان is the modern spelling with an extra alef; الرحمن is in the corpus
+    results, total, _ = run(FuzzyBackend(), "الرحمان")
+    assert total == len(results) > 0
+    assert (1, 1) in keys(results)
+    assert run(MemoryBackend(), "الرحمان")[1] == 0
+
+
+def test_results_are_ranked_by_score(quran_context):
+    results, _, _ = run(FuzzyBackend(), "الرحمن الرحيم")
+    scores = [result["score"] for result in results]
+    assert scores == sorted(scores, reverse=True)
+    # Both words matched exactly
+    assert scores[0] == pytest.approx(2.0)
+
+
+def test_expansions_include_the_word_itself(quran_context):
+    index = get_search_index()
+    (expansion,) = index.fuzzy_terms("الكتاب", 0.4)
+    similarities = dict(expansion)
+    assert similarities["الكتاب"] == pytest.approx(1.0)
+    assert all(0.4 <= similarity <= 1.0 for similarity in similarities.values())
+
+
+def test_threshold_limits_the_expansions(quran_context, monkeypatch):
+    loose = run(FuzzyBackend(), "الكتاب")[1]
+    monkeypatch.setitem(quran_context.config, "SEARCH_FUZZY_THRESHOLD", 0.9)
+    strict = run(FuzzyBackend(), "الكتاب")[1]
+    assert run(MemoryBackend(), "الكتاب")[1] <= strict < loose
+
+
+def test_filters_are_applied_exactly(quran_context):
+    results, total, facets = run(FuzzyBackend(), "الرحمان surah:1")
+    assert total == len(results) > 0
+    assert {surah_id for surah_id, _ in keys(results)} == {1}
+    assert facets["surah"] == {1: total}
+
+
+@pytest.mark.parametrize("query", ["surah:2", "juz:30 type:meccan", "page:1-3"])
+def test_filter_only_query_returns_the_filtered_ayahs(quran_context, query):
+    fuzzy_results, fuzzy_total, fuzzy_facets = run(FuzzyBackend(), query)
+    exact_results, exact_total, exact_facets = run(MemoryBackend(), query)
+    assert fuzzy_total == exact_total > 0
+    assert keys(fuzzy_results) == keys(exact_results)
+    assert fuzzy_facets == exact_facets
+
+
+def test_pagination(quran_context):
+    backend = FuzzyBackend()
+    everything, total, _ = run(backend, "الكتاب")
+    page, page_total, _ = backend.search(parse_query("الكتاب"), offset=10, limit=5)
+    assert page_total == total
+    assert keys(page) == keys(everything)[10:15]
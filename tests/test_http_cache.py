@@ -0,0 +1,162 @@
+import gzip
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.content.reciters import RECITERS_VERSION
+from app.utils import http, versioning
+from app.utils.http import get_response_cache
+from app.utils.versioning import bump_version
+
+
+SURAH_URL = "/api/v1/content/surah/1"
+# Served precompressed
+PAGE_URL = "/api/v1/content/page/1"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Control the time the Last-Modified dates are compared with."""
+    now = SimpleNamespace(time=time.time)
+    monkeypatch.setattr(http, "time", now)
+    return now
+
+
+def test_content_response_is_cacheable(client, clock):
+    clock.time = lambda: time.time() + 2
+    response = client.get(SURAH_URL)
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert response.headers["Last-Modified"]
+    assert response.cache_control.public
+    assert response.cache_control.max_age == 3600
+
+
+def test_if_none_match_round_trip(client):
+    first = client.get(PAGE_URL)
+    assert "Accept-Encoding" in first.vary
+    second = client.get(PAGE_URL, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 304
+    assert second.data == b""
+    assert second.headers["ETag"] == first.headers["ETag"]
+    # A 304 carries the headers a 200 would have
+    assert second.headers["Cache-Control"] == first.headers["Cache-Control"]
+    assert second.headers["Vary"] == first.headers["Vary"]
+
+
+def test_if_modified_since_round_trip(client, clock):
+    clock.time = lambda: time.time() + 2
+    first = client.get(SURAH_URL)
+    second = client.get(SURAH_URL, headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert second.status_code == 304
+
+
+def test_last_modified_is_rounded_up(client, quran_app, clock, monkeypatch):
+    url = "/api/v1/content/reciters"
+    with quran_app.app_context():
+        version = bump_version(RECITERS_VERSION)
+
+    # Not sent until the second the stamp falls in has passed
+    clock.time = lambda: version / 10**9
+    assert "Last-Modified" not in client.get(url).headers
+
+    clock.time = lambda: version // 10**9 + 1
+    first = client.get(url)
+    assert first.headers["Last-Modified"] == http.datetime.fromtimestamp(
+        version // 10**9 + 1, tz=http.timezone.utc
+    ).strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+    # A change after the date was sent is never reported as unmodified
+    monkeypatch.setattr(versioning, "time", SimpleNamespace(time_ns=lambda: (version // 10**9 + 1) * 10**9))
+    with quran_app.app_context():
+        assert bump_version(RECITERS_VERSION) > version
+    clock.time = lambda: time.time() + 2
+    second = client.get(url, headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert second.status_code == 200
+
+
+def test_if_none_match_takes_precedence(client, clock):
+    clock.time = lambda: time.time() + 2
+    first = client.get(SURAH_URL)
+    response = client.get(SURAH_URL, headers={
+        "If-None-Match": 'W/"stale"',
+        "If-Modified-Since": first.headers["Last-Modified"],
+    })
+    assert response.status_code == 200
+
+
+def test_stale_etag_gets_full_response(client):
+    response = client.get(SURAH_URL, headers={"If-None-Match": 'W/"stale"'})
+    assert response.status_code == 200
+    assert json.loads(response.data)["surah"]["id"] == 1
+
+
+def test_etag_changes_with_version(client, quran_app):
+    url = "/api/v1/content/reciters"
+    first = client.get(url)
+    assert client.get(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    with quran_app.app_context():
+        bump_version(RECITERS_VERSION)
+
+    second = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": second.headers["ETag"]}).status_code == 304
+
+
+def test_search_round_trip(client):
+    url = "/api/v1/content/search?q=الرحمن"
+    first = client.get(url)
+    assert first.status_code == 200
+    assert json.loads(first.data)["pagination"]["total"] > 0
+    assert client.get(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+
+def test_errors_are_not_cached(client):
+    response = client.get("/api/v1/content/surah/115")
+    assert response.status_code == 400
+    assert "ETag" not in response.headers
+
+
+def test_gzip_variant(client):
+    identity = client.get(PAGE_URL, headers={"Accept-Encoding": "identity"})
+    compressed = client.get(PAGE_URL, headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in identity.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.data) == identity.data
+    assert compressed.headers["ETag"] == identity.headers["ETag"]
+
+
+def test_unread_query_arguments_share_the_cache_entry(client, quran_context):
+    cache = get_response_cache()
+    client.get(PAGE_URL)
+    size = len(cache)
+    misses = cache.misses
+
+    for junk in range(5):
+        assert client.get(f"{PAGE_URL}?junk={junk}").status_code == 200
+    assert len(cache) == size
+    assert cache.misses == misses
+
+    # Arguments the view reads are part of the key
+    client.get("/api/v1/content/reciters?per_page=2")
+    client.get("/api/v1/content/reciters?per_page=3")
+    assert len(cache) == size + 2
+
+
+def test_surah_range_is_cached_precompressed(client, quran_context):
+    url = "/api/v1/content/ayahs?range=2:1..2:286"
+    cache = get_response_cache()
+    first = client.get(url, headers={"Accept-Encoding": "gzip"})
+    hits = cache.hits
+    second = client.get(url, headers={"Accept-Encoding": "gzip"})
+
+    assert second.headers["Content-Encoding"] == "gzip"
+    assert second.data == first.data
+    assert cache.hits == hits + 1
+    assert len(gzip.decompress(second.data).splitlines()) == 286
@@ -0,0 +1,172 @@
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select, text
+
+from app.content.corpus import CORPUS_VERSION, corpus_file_path, get_corpus, write_corpus
+from app.content.corpus_file import CorpusFile, TextView
+from app.content.reciters import RECITERS_VERSION
+from app.extensions import db
+from app.models.quran import AyahIndex, Reciter
+from app.utils.import_manifest import ImportManifest
+from app.utils.json_stream import iter_records
+from app.utils.versioning import get_version
+
+
+QURAN_JSON = Path(__file__).parent.parent / "quran.json"
+
+SURAHS = (112, 113, 114)
+
+
+def write_verses(path, verses):
+    with open(path, "w", encoding="utf-8") as f:
+        for verse in verses:
+            f.write(json.dumps(verse, ensure_ascii=False) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def verses():
+    return [
+        verse for verse in iter_records(str(QURAN_JSON))
+        if verse["chapter"] in SURAHS
+    ]
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app("import")
+
+
+def snapshot_state(app):
+    """Rows, manifest and versions the importer may touch."""
+    with app.app_context():
+        ayahs = AyahIndex.__table__
+        state = {
+            "ayahs": db.session.execute(select(ayahs).order_by(ayahs.c.surah_id, ayahs.c.ayah_no)).all(),
+            "fts": db.session.execute(text("SELECT count(*) FROM ayah_fts")).scalar(),
+            "reciters": db.session.execute(select(Reciter.__table__).order_by(Reciter.id)).all(),
+            "manifest": ImportManifest.load().sections,
+            "corpus": get_version(CORPUS_VERSION),
+            "reciters_version": get_version(RECITERS_VERSION),
+        }
+        db.session.remove()
+    return state
+
+
+def test_first_import(app, run_import, verses, tmp_path):
+    run_import(app, write_verses(tmp_path / "verses.ndjson", verses))
+    state = snapshot_state(app)
+
+    assert len(state["ayahs"]) == len(verses) == 15
+    assert state["fts"] == len(verses)
+    assert len(state["reciters"]) == 5
+    assert sorted(state["manifest"]["ayah_index"]) == [str(surah_id) for surah_id in SURAHS]
+    assert state["corpus"] and state["reciters_version"]
+
+
+def test_rerun_is_a_no_op(app, run_import, verses, tmp_path):
+    path = write_verses(tmp_path / "verses.ndjson", verses)
+    run_import(app, path)
+    before = snapshot_state(app)
+
+    run_import(app, path)
+    assert snapshot_state(app) == before
+
+
+def test_only_changed_surahs_are_written(app, run_import, verses, tmp_path):
+    run_import(app, write_verses(tmp_path / "verses.ndjson", verses))
+    before = snapshot_state(app)
+
+    changed = [dict(verse) for verse in verses]
+    changed[-1]["text"] = "مِنَ ٱلۡجِنَّةِ وَٱلنَّاسِ وَٱلۡمَلَائِكَةِ"
+    run_import(app, write_verses(tmp_path / "changed.ndjson", changed))
+    after = snapshot_state(app)
+
+    assert after["corpus"] > before["corpus"]
+    assert after["reciters_version"] == before["reciters_version"]
+    assert after["ayahs"][:-1] == before["ayahs"][:-1]
+    assert after["ayahs"][-1].text_normalized.endswith("والملايكه")
+    digests = after["manifest"]["ayah_index"]
+    assert digests["112"] == before["manifest"]["ayah_index"]["112"]
+    assert digests["114"] != before["manifest"]["ayah_index"]["114"]
+
+
+def test_removed_surahs_are_deleted(app, run_import, verses, tmp_path):
+    run_import(app, write_verses(tmp_path / "verses.ndjson", verses))
+    run_import(app, write_verses(tmp_path / "fewer.ndjson", [v for v in verses if v["chapter"] != 114]))
+    state = snapshot_state(app)
+
+    assert {row.surah_id for row in state["ayahs"]} == {112, 113}
+    assert state["fts"] == len(state["ayahs"])
+    assert sorted(state["manifest"]["ayah_index"]) == ["112", "113"]
+
+
+def test_force_rewrites_everything(app, run_import, verses, tmp_path):
+    path = write_verses(tmp_path / "verses.ndjson", verses)
+    run_import(app, path)
+    before = snapshot_state(app)
+
+    run_import(app, path, force=True)
+    after = snapshot_state(app)
+    assert after["corpus"] > before["corpus"]
+    assert after["ayahs"] == before["ayahs"]
+
+
+def test_corpus_file_follows_imports(app, run_import, verses, tmp_path):
+    run_import(app, write_verses(tmp_path / "verses.ndjson", verses))
+    with app.app_context():
+        write_corpus(get_version(CORPUS_VERSION))
+
+    changed = [dict(verse) for verse in verses]
+    changed[-1]["text"] = "مِنَ ٱلۡجِنَّةِ وَٱلنَّاسِ وَٱلۡمَلَائِكَةِ"
+    run_import(app, write_verses(tmp_path / "changed.ndjson", changed))
+
+    with app.app_context():
+        corpus_file = CorpusFile(corpus_file_path())
+        try:
+            assert corpus_file.corpus_version == get_version(CORPUS_VERSION)
+            assert corpus_file.text(len(corpus_file) - 1) == changed[-1]["text"]
+        finally:
+            corpus_file.close()
+        # Mapped rather than loaded from the database
+        assert isinstance(get_corpus().texts, TextView)
+
+
+def test_full_corpus(quran_app):
+    with quran_app.app_context():
+        assert db.session.execute(select(func.count()).select_from(AyahIndex)).scalar() == 6236
+        db.session.remove()
+
+
+def test_edited_rows_are_rewritten(app, run_import, verses, tmp_path):
+    path = write_verses(tmp_path / "verses.ndjson", verses)
+    run_import(app, path)
+    before = snapshot_state(app)
+
+    # Same row count, different content: only the stored row hashes tell
+    with app.app_context():
+        db.session.execute(text("UPDATE ayah_index SET text_plain = 'x' WHERE surah_id = 113 AND ayah_no = 1"))
+        db.session.commit()
+        db.session.remove()
+
+    run_import(app, path)
+    after = snapshot_state(app)
+    assert after["ayahs"] == before["ayahs"]
+    assert after["corpus"] > before["corpus"]
+
+
+def test_manifest_belongs_to_its_database(make_app, run_import, verses, tmp_path):
+    path = write_verses(tmp_path / "verses.ndjson", verses)
+    first = make_app("first")
+    run_import(first, path)
+
+    # A second database (even with the same instance folder) starts empty
+    second = make_app("second")
+    second.instance_path = first.instance_path
+    with second.app_context():
+        assert ImportManifest.load().sections == {}
+
+    run_import(second, path)
+    assert len(snapshot_state(second)["ayahs"]) == len(verses)
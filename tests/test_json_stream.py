@@ -0,0 +1,59 @@
+import io
+import json
+
+import pytest
+
+from app.utils.json_stream import iter_json_records, iter_ndjson_records, iter_records
+from tests.conftest import PROJECT_ROOT
+
+
+DOCUMENTS = [
+    ("[]", []),
+    ('[{"a": 1}, {"b": [1, 2, {"c": "}]"}]}]', [{"a": 1}, {"b": [1, 2, {"c": "}]"}]}]),
+    # quran.json's layout: arrays of records under object keys
+    ('{"1": [{"v": 1}, {"v": 2}], "2": [{"v": 3}]}', [{"v": 1}, {"v": 2}, {"v": 3}]),
+    # Scalars, keys and nested objects outside arrays are skipped
+    ('{"meta": {"x": "[{"}, "n": 123456789, "items": ["{", 1.5e3, null, {"t": "نص"}]}', [{"t": "نص"}]),
+    ('[[{"deep": true}], {"a": -0.25}]', [{"deep": True}, {"a": -0.25}]),
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 65536])
+@pytest.mark.parametrize("document, records", DOCUMENTS)
+def test_json_records(document, records, chunk_size):
+    assert list(iter_json_records(io.StringIO(document), chunk_size=chunk_size)) == records
+
+
+@pytest.mark.parametrize("document", ['[{"a": 1}', '[{"a": 1}]]', '[{"a": }]'])
+def test_invalid_json(document):
+    with pytest.raises(ValueError):
+        list(iter_json_records(io.StringIO(document), chunk_size=3))
+
+
+def test_ndjson_records():
+    stream = io.StringIO('{"a": 1}\n\n  {"b": "نص"}  \n')
+    assert list(iter_ndjson_records(stream)) == [{"a": 1}, {"b": "نص"}]
+
+    with pytest.raises(ValueError, match="line 2"):
+        list(iter_ndjson_records(io.StringIO('{"a": 1}\n{"b"\n')))
+
+
+def test_format_follows_the_suffix(tmp_path):
+    records = [{"chapter": 1, "verse": 1}, {"chapter": 1, "verse": 2}]
+    ndjson = tmp_path / "verses.jsonl"
+    ndjson.write_text("\n".join(json.dumps(record) for record in records), encoding="utf-8")
+    document = tmp_path / "verses.json"
+    document.write_text(json.dumps({"1": records}), encoding="utf-8")
+
+    assert list(iter_records(str(ndjson))) == records
+    assert list(iter_records(str(document))) == records
+    assert list(iter_records(str(document), format="json")) == records
+    with pytest.raises(ValueError, match="Unknown input format"):
+        list(iter_records(str(document), format="xml"))
+
+
+def test_quran_json():
+    path = PROJECT_ROOT / "quran.json"
+    with open(path, encoding="utf-8") as f:
+        expected = [verse for verses in json.load(f).values() for verse in verses]
+    assert list(iter_records(str(path))) == expected
@@ -0,0 +1,103 @@
+import pytest
+
+from app.utils.mushaf import (
+    JUZ_STARTS,
+    PAGE_STARTS,
+    SURAH_AYAH_COUNTS,
+    TOTAL_AYAHS,
+    TOTAL_JUZ,
+    TOTAL_PAGES,
+    juz_of,
+    juz_range,
+    location_of,
+    ordinal_of,
+    page_of,
+    page_range,
+)
+
+
+def _previous(surah_id, ayah_no):
+    """The ayah before ``(surah_id, ayah_no)`` in mushaf order."""
+    return location_of(ordinal_of(surah_id, ayah_no) - 1)
+
+
+def test_table_sizes():
+    assert TOTAL_AYAHS == 6236
+    assert TOTAL_PAGES == 604
+    assert TOTAL_JUZ == 30
+
+
+def test_starts_are_sorted_and_valid():
+    for starts in (PAGE_STARTS, JUZ_STARTS):
+        assert starts == sorted(starts)
+        assert all(ordinal_of(*start) is not None for start in starts)
+
+
+@pytest.mark.parametrize("surah_id, ayah_no, page", [
+    (1, 1, 1),
+    (1, 7, 1),
+    (2, 1, 2),
+    (2, 5, 2),
+    (2, 6, 3),
+    (2, 286, 49),
+    (3, 1, 50),
+    (114, 1, 604),
+    (114, 6, 604),
+])
+def test_page_of(surah_id, ayah_no, page):
+    assert page_of(surah_id, ayah_no) == page
+
+
+def test_page_boundaries():
+    for page, start in enumerate(PAGE_STARTS, start=1):
+        assert page_of(*start) == page
+        if page > 1:
+            assert page_of(*_previous(*start)) == page - 1
+
+
+@pytest.mark.parametrize("surah_id, ayah_no, juz", [
+    (1, 1, 1),
+    (2, 141, 1),
+    (2, 142, 2),
+    (2, 252, 2),
+    (2, 253, 3),
+    (77, 50, 29),
+    (78, 1, 30),
+    (114, 6, 30),
+])
+def test_juz_of(surah_id, ayah_no, juz):
+    assert juz_of(surah_id, ayah_no) == juz
+
+
+def test_juz_boundaries():
+    for juz, start in enumerate(JUZ_STARTS, start=1):
+        assert juz_of(*start) == juz
+        if juz > 1:
+            assert juz_of(*_previous(*start)) == juz - 1
+
+
+def test_ranges_cover_every_ayah_once():
+    for division_range, total in ((page_range, TOTAL_PAGES), (juz_range, TOTAL_JUZ)):
+        ordinals = [ordinal for number in range(1, total + 1) for ordinal in division_range(number)]
+        assert ordinals == list(range(TOTAL_AYAHS))
+
+
+def test_ordinal_round_trip():
+    assert ordinal_of(1, 1) == 0
+    assert ordinal_of(114, 6) == TOTAL_AYAHS - 1
+    for surah_id, count in ((1, 7), (2, 286), (114, 6)):
+        assert location_of(ordinal_of(surah_id, count)) == (surah_id, count)
+    assert SURAH_AYAH_COUNTS[1] == 286
+
+
+@pytest.mark.parametrize("surah_id, ayah_no", [(0, 1), (115, 1), (1, 0), (1, 8)])
+def test_ordinal_of_invalid(surah_id, ayah_no):
+    assert ordinal_of(surah_id, ayah_no) is None
+
+
+def test_ayah_past_the_end_of_a_surah():
+    # Placed after the last ayah of its surah
+    assert page_of(1, 8) == page_of(1, 7)
+    assert page_of(114, 7) == 604
+    assert juz_of(2, 287) == juz_of(2, 286)
+    assert juz_of(114, 7) == 30
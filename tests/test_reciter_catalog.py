@@ -0,0 +1,55 @@
+import pytest
+
+from app.content import reciters
+from app.content.reciters import RECITERS_VERSION, get_reciter_catalog
+from app.extensions import db
+from app.models import Reciter
+from app.utils.versioning import bump_version
+
+
+@pytest.fixture
+def reciters_app(make_app, monkeypatch):
+    app = make_app("reciters")
+    # A fresh worker catalog for each test
+    monkeypatch.setattr(reciters, "_catalog", None)
+    with app.app_context():
+        for code in ("b", "a", "c"):
+            db.session.add(Reciter(code=code, name=code.upper(), bitrate_kbps=64, base_url=f"https://{code}.example"))
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+
+def test_catalog_mirrors_the_table(reciters_app):
+    catalog = get_reciter_catalog()
+    rows = Reciter.query.order_by(Reciter.id).all()
+    assert [reciter.to_dict() for reciter in catalog.reciters] == [row.to_dict() for row in rows]
+    assert catalog.get(rows[1].id).code == rows[1].code
+    assert catalog.get(999) is None
+    assert [reciter.id for reciter in catalog.page(1, 5)] == [row.id for row in rows[1:]]
+    assert catalog.page(5, 5) == ()
+
+
+def test_catalog_is_reloaded_when_the_version_moves(reciters_app):
+    catalog = get_reciter_catalog()
+    reciter = Reciter.query.filter_by(code="a").first()
+    reciter.name = "Renamed"
+    db.session.commit()
+
+    # Without a bump the snapshot is kept
+    assert get_reciter_catalog() is catalog
+    assert catalog.get(reciter.id).name == "A"
+
+    bump_version(RECITERS_VERSION)
+    assert get_reciter_catalog().get(reciter.id).name == "Renamed"
+
+
+def test_reciter_routes(client, quran_context):
+    catalog = get_reciter_catalog()
+    listing = client.get("/api/v1/content/reciters", query_string={"per_page": 2}).get_json()
+    assert [reciter["id"] for reciter in listing["reciters"]] == [r.id for r in catalog.reciters[:2]]
+    assert listing["pagination"]["total"] == len(catalog)
+
+    first = catalog.reciters[0]
+    assert client.get(f"/api/v1/content/reciters/{first.id}").get_json()["reciter"] == first.to_dict()
+    assert client.get("/api/v1/content/reciters/999").status_code == 404
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from app.content.search_backends import FuzzyBackend, MemoryBackend, get_fulltext_backend
+from app.content.search_index import get_search_index
+from app.content.search_query import parse_query
+from app.utils.arabic import normalize_arabic
+
+
+# Large enough to fetch every match in one page
+ALL = 10_000
+
+
+def matches(backend, query: str):
+    """Return the total, the matched ``(surah_id, ayah_no)`` keys and the facets of a query."""
+    results, total, facets = backend.search(parse_query(query), offset=0, limit=ALL)
+    return total, {(result["surah_id"], result["ayah_no"]) for result in results}, facets
+
+
+@pytest.fixture(scope="module")
+def vocabulary(quran_app):
+    """Corpus words by frequency, and the normalized words of every ayah."""
+    with quran_app.app_context():
+        index = get_search_index()
+        words = sorted(index.postings, key=lambda term: (-len(index.postings[term]), term))
+        ayahs = [index.to_dict(ordinal)["text_plain"] for ordinal in range(len(index))]
+    return words, [normalize_arabic(text).split() for text in ayahs]
+
+
+@pytest.fixture(scope="module")
+def queries(vocabulary):
+    """A seeded query mix drawn from the corpus, like scripts/benchmark_search.py."""
+    words, ayahs = vocabulary
+    rng = random.Random(7)
+    common = words[:200]
+    rare = [word for word in words[-2000:] if len(word) >= 3]
+    long_ayahs = [ayah for ayah in ayahs if len(ayah) >= 6]
+
+    def span(size):
+        ayah = rng.choice(long_ayahs)
+        start = rng.randrange(len(ayah) - size + 1)
+        return ayah[start:start + size]
+
+    mix = []
+    for _ in range(10):
+        mix += [
+            rng.choice(common),
+            rng.choice(rare),
+            " ".join(rng.sample(span(6), 2)),
+            '"{}"'.format(" ".join(span(rng.choice((2, 3))))),
+            '"{} {}"~5'.format(*rng.sample(span(5), 2)),
+            f"({rng.choice(common)} OR {rng.choice(common)}) -{rng.choice(common)}",
+            f"{rng.choice(common)} juz:{rng.randint(1, 30)}",
+            f"{rng.choice(common)} surah:{rng.randint(1, 114)}-114 type:medinan",
+            f"{rng.choice(common)} page:{rng.randint(1, 500)}-604",
+        ]
+    return mix + ["surah:2", "juz:30 type:meccan", "page:1-3"]
+
+
+def test_memory_and_fulltext_agree(quran_context, queries):
+    memory = MemoryBackend()
+    fulltext = get_fulltext_backend()
+    for query in queries:
+        expected = matches(memory, query)
+        assert expected == matches(fulltext, query), query
+
+
+def test_fuzzy_contains_exact_matches(quran_context, queries):
+    memory = MemoryBackend()
+    fuzzy = FuzzyBackend()
+    # Phrases and operators are loosened, so only plain words and filters compare
+    plain = [query for query in queries if not any(c in query for c in '"()-')]
+    assert any(not parse_query(query).terms() for query in plain)
+    assert plain
+    for query in plain:
+        total, keys, _ = matches(fuzzy, query)
+        assert keys >= matches(memory, query)[1], query
+        assert total == len(keys)
+
+
+def test_fuzzy_at_full_similarity_matches_expanded_terms(quran_context, queries, monkeypatch):
+    # At threshold 1.0 each word only expands to terms with the same
+    # trigrams, so fuzzy search is an exact search for those terms
+    monkeypatch.setitem(quran_context.config, "SEARCH_FUZZY_THRESHOLD", 1.0)
+    index = get_search_index()
+    memory = MemoryBackend()
+    fuzzy = FuzzyBackend()
+    plain = [query for query in queries if not any(c in query for c in '"()-:')]
+    for query in plain:
+        expansions = index.fuzzy_terms(query, 1.0)
+        expanded = " ".join(
+            "({})".format(" OR ".join(term for term, _ in expansion)) for expansion in expansions
+        )
+        assert matches(fuzzy, query)[1] == matches(memory, expanded)[1], query
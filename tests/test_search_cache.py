@@ -0,0 +1,79 @@
+import pytest
+
+from app.content import search_backends
+from app.content.corpus import CORPUS_VERSION
+from app.content.search_backends import get_search_cache, search
+from app.content.search_query import parse_query
+from app.utils.cache import LRUCache
+from app.utils.versioning import bump_version
+
+
+def test_lru_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    # "b" was the least recently used
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.utils.cache.time.monotonic", lambda: now[0])
+    cache = LRUCache(ttl=10)
+    cache.set("a", 1)
+    now[0] += 9
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_version():
+    cache = LRUCache()
+    cache.set("a", 1, version=1)
+    cache.set("b", 2, version=1)
+    assert cache.get("a", version=1) == 1
+    assert cache.get("a", version=2) is None
+    assert len(cache) == 0
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_disabled_cache():
+    cache = LRUCache(maxsize=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+@pytest.fixture
+def search_cache(quran_context, monkeypatch):
+    # A fresh worker cache for each test
+    monkeypatch.setattr(search_backends, "_search_cache", None)
+    return get_search_cache()
+
+
+def test_equivalent_queries_share_an_entry(search_cache):
+    first = search(parse_query("الرَّحْمَٰنِ -الرحيم"), "exact", offset=0, limit=10)
+    assert search_cache.stats()["misses"] == 1
+
+    second = search(parse_query("الرحمن  NOT الرحيم"), "exact", offset=0, limit=10)
+    assert second is first
+    assert search_cache.stats()["hits"] == 1
+
+    # Other pages and modes are cached separately
+    search(parse_query("الرحمن -الرحيم"), "exact", offset=10, limit=10)
+    search(parse_query("الرحمن -الرحيم"), "fuzzy", offset=0, limit=10)
+    assert len(search_cache) == 3
+
+
+def test_corpus_change_drops_the_cache(search_cache, quran_context):
+    query = parse_query("الله")
+    first = search(query, "exact", offset=0, limit=5)
+    bump_version(CORPUS_VERSION)
+    second = search(query, "exact", offset=0, limit=5)
+    assert second is not first
+    assert second == first
+    assert search_cache.stats()["invalidations"] == 1
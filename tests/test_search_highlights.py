@@ -0,0 +1,52 @@
+import pytest
+
+from app.content.search_backends import FuzzyBackend, MemoryBackend, get_fulltext_backend
+from app.content.search_query import parse_query
+
+
+def first_result(backend, query: str) -> dict:
+    results, _, _ = backend.search(parse_query(query), offset=0, limit=1)
+    return results[0]
+
+
+def result_for(backend, query: str, surah_id: int, ayah_no: int) -> dict:
+    results, _, _ = backend.search(parse_query(query), offset=0, limit=100)
+    return next(r for r in results if (r["surah_id"], r["ayah_no"]) == (surah_id, ayah_no))
+
+
+def highlighted(result: dict):
+    """The highlighted words, as indexes into the words of the ayah text."""
+    text = result["text_plain"]
+    words = text.split()
+    return [words.index(text[start:end]) for start, end in result["highlights"]]
+
+
+@pytest.mark.parametrize("make_backend", [MemoryBackend, get_fulltext_backend])
+def test_highlights_cover_the_written_words(quran_context, make_backend):
+    # بِسۡمِ ٱللَّهِ ٱلرَّحۡمَٰنِ ٱلرَّحِيمِ
+    result = result_for(make_backend(), "الرحمن surah:1", 1, 1)
+    assert highlighted(result) == [2]
+
+
+def test_phrase_highlights_every_word(quran_context):
+    result = result_for(MemoryBackend(), '"الرحمن الرحيم" surah:1', 1, 1)
+    assert highlighted(result) == [2, 3]
+
+
+def test_joined_vocative_highlights_the_whole_word(quran_context):
+    # يَٰٓأَيُّهَا ٱلنَّاسُ ٱعۡبُدُواْ رَبَّكُمُ (2:21)
+    result = first_result(MemoryBackend(), '"يا أيها الناس" surah:2')
+    assert (result["surah_id"], result["ayah_no"]) == (2, 21)
+    assert highlighted(result) == [0, 0, 1]
+
+
+def test_negated_words_are_not_highlighted(quran_context):
+    result = first_result(MemoryBackend(), "الرحمن -الرحيم")
+    words = result["text_plain"].split()
+    assert highlighted(result)
+    assert all("رَّحِيم" not in words[i] for i in highlighted(result))
+
+
+def test_fuzzy_highlights_the_expanded_words(quran_context):
+    result = result_for(FuzzyBackend(), "الرحمان surah:1", 1, 1)
+    assert 2 in highlighted(result)
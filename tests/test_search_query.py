@@ -0,0 +1,126 @@
+import pytest
+
+from app.content.search_query import (
+    MAX_NESTING,
+    MAX_QUERY_LENGTH,
+    And,
+    Filter,
+    Not,
+    Or,
+    Phrase,
+    QueryError,
+    Term,
+    canonical,
+    parse_query,
+    split_filters,
+)
+
+
+def test_words_are_normalized_and_required():
+    node = parse_query("الرَّحْمَٰنِ إِلَيْهِ")
+    assert isinstance(node, And)
+    assert [clause.word for clause in node.clauses] == ["الرحمن", "اليه"]
+
+
+def test_single_word():
+    node = parse_query("الله")
+    assert isinstance(node, Term)
+    assert node.word == "الله"
+
+
+def test_or_binds_looser_than_and():
+    node = parse_query("a b OR c")
+    assert isinstance(node, Or)
+    assert canonical(node) == "((a AND b) OR c)"
+
+
+def test_not_and_minus_are_equivalent():
+    assert canonical(parse_query("a NOT b")) == canonical(parse_query("a -b")) == "(a AND NOT b)"
+
+
+def test_parentheses_group():
+    assert canonical(parse_query("(a OR b) c")) == "((a OR b) AND c)"
+
+
+def test_phrase_and_proximity():
+    phrase = parse_query('"بسم الله"')
+    assert isinstance(phrase, Phrase)
+    assert phrase.words == ["بسم", "الله"] and phrase.slop is None
+
+    near = parse_query('"بسم الرحيم"~4')
+    assert near.slop == 4
+
+    single = parse_query('"الله"')
+    assert isinstance(single, Term)
+
+
+def test_negated_phrase():
+    node = parse_query('a -"b c"')
+    assert isinstance(node.clauses[1], Not)
+    assert isinstance(node.clauses[1].clause, Phrase)
+
+
+def test_filters():
+    node = parse_query("الله surah:2 juz:1-3 page:10 type:مكية")
+    text_node, filters = split_filters(node)
+    assert canonical(text_node) == "الله"
+    assert [(f.field, f.value) for f in filters] == [
+        ("surah", (2, 2)),
+        ("juz", (1, 3)),
+        ("page", (10, 10)),
+        ("type", "meccan"),
+    ]
+
+
+def test_filter_only_query():
+    text_node, filters = split_filters(parse_query("surah:114"))
+    assert text_node is None
+    assert isinstance(filters[0], Filter)
+
+
+def test_filters_inside_or_stay_in_text():
+    text_node, filters = split_filters(parse_query("a OR surah:2"))
+    assert filters == []
+    assert isinstance(text_node, Or)
+
+
+def test_canonical_ignores_diacritics_and_spacing():
+    assert canonical(parse_query("  الرَّحْمَٰنِ   AND  الرحيم ")) == canonical(parse_query("الرحمن الرحيم"))
+
+
+@pytest.mark.parametrize("query", ["", "   ", "ّ َ", "()", "NOT", '""'])
+def test_nothing_searchable(query):
+    assert parse_query(query) is None
+
+
+def test_stray_closing_parenthesis_is_ignored():
+    assert canonical(parse_query("a ) b")) == "(a AND b)"
+
+
+@pytest.mark.parametrize("query", [
+    "surah:0",
+    "surah:115",
+    "juz:31",
+    "page:605",
+    "page:10-5",
+    "surah:x",
+    "juz:",
+    "type:other",
+])
+def test_invalid_filters(query):
+    with pytest.raises(QueryError):
+        parse_query(query)
+
+
+def test_query_too_long():
+    parse_query("a" * MAX_QUERY_LENGTH)
+    with pytest.raises(QueryError, match="too long"):
+        parse_query("a" * (MAX_QUERY_LENGTH + 1))
+
+
+def test_nesting_limit():
+    assert canonical(parse_query("(" * MAX_NESTING + "a")) == "a"
+    with pytest.raises(QueryError, match="nested too deeply"):
+        parse_query("(" * (MAX_NESTING + 1) + "a")
+    with pytest.raises(QueryError, match="nested too deeply"):
+        parse_query("NOT " * (MAX_NESTING + 1) + "a")
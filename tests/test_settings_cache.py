@@ -0,0 +1,70 @@
+import os
+import uuid
+
+import pytest
+
+from app.extensions import db
+from app.models import User, UserSettings
+from app.settings import cache as settings_cache
+from app.settings.cache import USER_SETTINGS_STAMPS, get_cached_settings, store_settings
+from app.utils.versioning import bump_version
+
+
+@pytest.fixture
+def settings_app(make_app, monkeypatch):
+    app = make_app("settings")
+    # A fresh worker cache for each test
+    monkeypatch.setattr(settings_cache, "_settings_cache", None)
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+def add_user(with_settings: bool = True) -> User:
+    user = User(email_or_phone=f"{uuid.uuid4().hex}@example.com", password_hash="x", display_name="User")
+    db.session.add(user)
+    db.session.flush()
+    if with_settings:
+        db.session.add(UserSettings(user_id=user.id, default_speed=1.0, font_scale=1.0))
+    db.session.commit()
+    return user
+
+
+def test_settings_are_cached(settings_app):
+    user = add_user()
+    settings = get_cached_settings(user.id)
+    assert settings["default_speed"] == 1.0
+
+    # Changed behind the cache's back: still served from the cache
+    db.session.query(UserSettings).filter_by(user_id=user.id).update({"default_speed": 2.0})
+    db.session.commit()
+    assert get_cached_settings(user.id)["default_speed"] == 1.0
+
+    # Another worker bumped the user's stamp
+    bump_version(settings_cache._stamp_name(user.id))
+    assert get_cached_settings(user.id)["default_speed"] == 2.0
+
+
+def test_missing_settings_are_cached(settings_app):
+    user = add_user(with_settings=False)
+    assert get_cached_settings(user.id) is None
+    assert settings_cache.get_settings_cache().get(user.id) is not None
+
+
+def test_store_writes_through(settings_app):
+    user = add_user()
+    row = UserSettings.query.filter_by(user_id=user.id).first()
+    row.font_scale = 1.5
+    db.session.commit()
+    store_settings(user.id, row)
+    assert get_cached_settings(user.id)["font_scale"] == 1.5
+
+
+def test_stamps_are_bounded(settings_app, monkeypatch):
+    monkeypatch.setitem(settings_app.config, "USER_SETTINGS_STAMP_BUCKETS", 4)
+    for _ in range(50):
+        user = add_user()
+        store_settings(user.id, UserSettings.query.filter_by(user_id=user.id).first())
+
+    stamps = os.listdir(os.path.join(settings_app.instance_path, USER_SETTINGS_STAMPS))
+    assert 0 < len(stamps) <= 4
@@ -0,0 +1,129 @@
+import pytest
+from sqlalchemy import select, text
+
+from app.content.corpus import CORPUS_VERSION
+from app.content.search_backends import sync_fulltext_index
+from app.content.snapshot import SNAPSHOT_FORMAT, _load_rows, build_snapshot, load_snapshot, read_snapshot_meta
+from app.extensions import db
+from app.models.quran import AyahIndex, Reciter
+from app.utils.import_manifest import ImportManifest
+from app.utils.versioning import get_version
+
+
+@pytest.fixture(scope="module")
+def snapshot(quran_app, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("snapshot") / "content_snapshot.db")
+    with quran_app.app_context():
+        meta = build_snapshot(path)
+    return path, meta
+
+
+def content_state(app):
+    with app.app_context():
+        ayahs = AyahIndex.__table__
+        state = {
+            "ayahs": db.session.execute(select(ayahs).order_by(ayahs.c.surah_id, ayahs.c.ayah_no)).all(),
+            "fts": db.session.execute(text("SELECT count(*) FROM ayah_fts")).scalar(),
+            "reciters": {
+                reciter.code: (reciter.id, reciter.name)
+                for reciter in db.session.execute(select(Reciter)).scalars()
+            },
+        }
+        db.session.remove()
+    return state
+
+
+def test_build(snapshot):
+    path, meta = snapshot
+    assert meta["format"] == SNAPSHOT_FORMAT
+    assert meta["revision"]
+    assert meta["counts"]["ayah_index"] == 6236
+    assert meta["counts"]["reciters"] == 5
+    assert len(meta["manifest"]["ayah_index"]) == 114
+    assert read_snapshot_meta(path) == meta
+
+
+def test_build_requires_ayahs(make_app, tmp_path):
+    app = make_app("empty")
+    with app.app_context():
+        with pytest.raises(ValueError, match="No ayahs"):
+            build_snapshot(str(tmp_path / "snapshot.db"))
+
+
+def test_invalid_snapshot(tmp_path):
+    path = tmp_path / "broken.db"
+    path.write_bytes(b"not a database" * 100)
+    with pytest.raises(ValueError):
+        read_snapshot_meta(str(path))
+
+
+def test_load_into_new_database(make_app, quran_app, snapshot):
+    path, meta = snapshot
+    app = make_app("copy", migrate=False)
+    with app.app_context():
+        assert load_snapshot(path) == "copy"
+        assert get_version(CORPUS_VERSION)
+        assert ImportManifest.load().sections["ayah_index"] == meta["manifest"]["ayah_index"]
+
+    assert content_state(app) == content_state(quran_app)
+
+
+def test_load_into_existing_database(make_app, run_import, quran_app, snapshot, tmp_path):
+    path, meta = snapshot
+    app = make_app("attach")
+
+    # Leftover content, plus a reciter added through the admin API
+    partial = tmp_path / "partial.ndjson"
+    partial.write_text('{"chapter": 1, "verse": 1, "text": "بسم"}\n', encoding="utf-8")
+    run_import(app, str(partial))
+    with app.app_context():
+        db.session.add(Reciter(code="admin", name="Admin", bitrate_kbps=64, base_url="https://example.com"))
+        db.session.commit()
+        before = content_state(app)["reciters"]
+
+        assert load_snapshot(path) == "attach"
+
+    state = content_state(app)
+    expected = content_state(quran_app)
+    assert state["ayahs"] == expected["ayahs"]
+    assert state["fts"] == expected["fts"]
+    # Reciters keep their ids, including the one the snapshot does not know
+    assert state["reciters"] == before
+
+
+def test_import_after_load_is_a_no_op(make_app, run_import, snapshot):
+    path, _ = snapshot
+    app = make_app("bootstrap")
+    with app.app_context():
+        load_snapshot(path)
+        version = get_version(CORPUS_VERSION)
+
+    run_import(app)
+    with app.app_context():
+        assert get_version(CORPUS_VERSION) == version
+
+
+def test_load_rows(make_app, quran_app, snapshot):
+    path, _ = snapshot
+    app = make_app("rows")
+    with app.app_context():
+        # The path taken on PostgreSQL, run here against SQLite
+        _load_rows(path)
+        sync_fulltext_index()
+        db.session.remove()
+
+    state = content_state(app)
+    expected = content_state(quran_app)
+    assert state["ayahs"] == expected["ayahs"]
+    assert state["fts"] == expected["fts"]
+    assert state["reciters"].keys() == expected["reciters"].keys()
+
+
+def test_revision_mismatch(make_app, snapshot):
+    path, _ = snapshot
+    app = make_app("mismatch")
+    with app.app_context():
+        db.session.execute(text("UPDATE alembic_version SET version_num = 'other'"))
+        db.session.commit()
+        with pytest.raises(ValueError, match="does not match"):
+            load_snapshot(path)
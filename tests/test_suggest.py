@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from app.content import suggest_index
+from app.content.search_index import get_search_index
+from app.content.suggest_index import MAX_SUGGESTIONS, PrefixIndex
+
+
+URL = "/api/v1/content/search/suggest"
+
+
+def brute_force(terms, counts, prefix, limit):
+    """Completions ranked by frequency, then alphabetically, by a full scan."""
+    matching = [(term, count) for term, count in zip(terms, counts) if term.startswith(prefix)]
+    return sorted(matching, key=lambda item: (-item[1], item[0]))[:min(limit, MAX_SUGGESTIONS)]
+
+
+@pytest.mark.parametrize("precompute_min_terms", [2, 128])
+def test_matches_a_full_scan(monkeypatch, precompute_min_terms):
+    monkeypatch.setattr(suggest_index, "PRECOMPUTE_MIN_TERMS", precompute_min_terms)
+    rng = random.Random(3)
+    terms = sorted({"".join(rng.choice("ابتث") for _ in range(rng.randint(1, 6))) for _ in range(2000)})
+    counts = [rng.randint(1, 50) for _ in terms]
+    index = PrefixIndex(terms, counts)
+
+    assert index.top
+    prefixes = {term[:length] for term in terms for length in (1, 2, 3)} | {"", "ج"}
+    for prefix in sorted(prefixes):
+        for limit in (1, 5, MAX_SUGGESTIONS, MAX_SUGGESTIONS + 5):
+            assert index.complete(prefix, limit) == brute_force(terms, counts, prefix, limit), prefix
+
+
+def test_corpus_vocabulary(quran_context):
+    index = get_search_index()
+    suggestions = index.suggestions
+    terms = suggestions.terms
+    counts = list(suggestions.counts)
+    assert terms == sorted(terms)
+    for prefix in ("ا", "ال", "الل", "رحم", "قل"):
+        assert suggestions.complete(prefix, 10) == brute_force(terms, counts, prefix, 10)
+
+
+def test_suggest_route(client):
+    response = client.get(URL, query_string={"q": "بسم الرَّحْ", "limit": 5})
+    assert response.status_code == 200
+    suggestions = response.get_json()["suggestions"]
+    assert 0 < len(suggestions) <= 5
+    assert all(item["word"].startswith("الرح") for item in suggestions)
+    frequencies = [item["frequency"] for item in suggestions]
+    assert frequencies == sorted(frequencies, reverse=True)
+
+
+@pytest.mark.parametrize("query", [
+    {"q": ""},
+    {"q": "ّ"},
+    {"q": "ال", "limit": 0},
+    {"q": "ال", "limit": MAX_SUGGESTIONS + 1},
+])
+def test_invalid_suggest_requests(client, query):
+    assert client.get(URL, query_string=query).status_code == 400
@@ -2,12 +2,31 @@
 """
 WSGI entry point for the Quran Learning API
 """
+import gc
 import os
 from app import create_app
+from app.extensions import db
+from app.content.corpus import warm_corpus
+from app.content.search_index import warm_search_index
 
 # Create the Flask application
 app = create_app()
 
+# Load the corpus and build the search index once at startup. With
+# gunicorn --preload this runs in the master, so the workers share the
+# pages through copy-on-write
+warm_corpus(app)
+warm_search_index(app)
+
+# Drop the pooled connections the warm-up opened; a connection inherited
+# across fork would be shared by every worker
+with app.app_context():
+    db.engine.dispose()
+
+# Keep the garbage collector from touching (and so copying) the preloaded
+# objects in every worker
+gc.freeze()
+
 if __name__ == "__main__":
     # Get port from environment or default to 5000
     port = int(os.environ.get("PORT", 5000))